@@ -0,0 +1,34 @@
+import asyncio
+import json
+from pathlib import Path
+
+from ttrecon.config import load_config
+from ttrecon.connectors.civic.snapshot import write_snapshot
+from ttrecon.engine.orchestrator import run_pipeline, run_pipeline_async
+
+CASE = Path("examples/cases/egfr_example.json").resolve()
+
+def test_run_pipeline_async_matches_sync_run(tmp_path: Path):
+    nodes = [{"id": i, "gene": {"name": "EGFR"}, "variant": {"name": v}, "evidenceRating": 4, "evidenceLevel": "B"}
+             for i, v in ((1, "T790M"), (2, "L858R"))]
+    snap = tmp_path / "snap.json"
+    write_snapshot({"schema": "civic_snapshot_v1", "endpoint": "x", "created_utc": "2024-01-01T00:00:00Z",
+                    "genes": ["EGFR"], "items_by_gene": {"EGFR": {"nodes": nodes}}}, snap)
+    cfg = load_config()
+    opts = dict(civic=True, civic_source="snapshot", civic_snapshot=snap, civic_mode="loose", civic_claims=True)
+    run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "sync", **opts)
+
+    async def main():
+        return await asyncio.gather(*(
+            run_pipeline_async(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / f"async{i}", **opts)
+            for i in range(2)
+        ))
+
+    manifests = asyncio.run(main())
+    assert all("civic_enrich" in m.timings and "rules" in m.timings for m in manifests)
+    for i, m in enumerate(manifests):
+        assert set(m.outputs) == {"case_normalized", "evidence_jsonl", "features", "claims", "report_md", "run_manifest"}
+        for name in ("case_normalized.json", "evidence.jsonl", "features.json", "claims.json"):
+            assert (tmp_path / f"async{i}" / name).read_bytes() == (tmp_path / "sync" / name).read_bytes()
+    claims = json.loads((tmp_path / "async0" / "claims.json").read_text(encoding="utf-8"))
+    assert [c["type"] for c in claims].count("EVIDENCE") == 2
@@ -0,0 +1,54 @@
+from pathlib import Path
+
+from ttrecon.connectors.civic import batch, snapshot
+from ttrecon.connectors.civic.graphql import build_batched_evidence_query, split_batched_response
+
+TOTALS = {"EGFR": 120, "ALK": 7, "KRAS": 0, "MET": 51}
+
+def _page(v):
+    gene, start = v["geneName"], int(v["after"] or 0)
+    n = max(0, min(v["first"], TOTALS.get(gene, 0) - start))
+    end = start + n
+    return {
+        "totalCount": TOTALS.get(gene, 0),
+        "pageInfo": {"endCursor": str(end), "hasNextPage": end < TOTALS.get(gene, 0)},
+        "nodes": [{"id": f"{gene}-{start + i}", "gene": {"name": gene}} for i in range(n)],
+    }
+
+def _fake_post(calls):
+    def post(query, variables, timeout_s=30, transport=None):
+        calls.append(query)
+        if "geneName" in variables:
+            return {"data": {"evidenceItems": _page(variables)}}
+        out, i = {}, 0
+        while f"g{i}" in variables:
+            v = {k: variables[f"{p}{i}"] for k, p in
+                 (("geneName", "g"), ("variantName", "v"), ("status", "s"), ("after", "a"), ("first", "f"))}
+            out[f"q{i}"] = _page(v)
+            i += 1
+        return {"data": out}
+    return post
+
+def test_split_routes_errors_by_alias():
+    q, v = build_batched_evidence_query([{"geneName": "EGFR"}, {"geneName": "ALK"}])
+    assert "q1: evidenceItems(" in q and v["g1"] == "ALK"
+    res = split_batched_response(
+        {"data": {"q0": {"nodes": []}, "q1": None}, "errors": [{"message": "boom", "path": ["q1"]}]}, 2)
+    assert "errors" not in res[0] and res[1]["errors"][0]["message"] == "boom"
+
+def test_batched_snapshot_matches_unbatched_with_fewer_round_trips(tmp_path: Path, monkeypatch):
+    calls = []
+    fake = _fake_post(calls)
+    monkeypatch.setattr(snapshot, "post_graphql", fake)
+    monkeypatch.setattr(batch, "post_graphql", fake)
+    genes = list(TOTALS)
+
+    plain = snapshot.build_snapshot_for_genes(genes, tmp_path / "a.json", tmp_path / "c1", min_delay_s=0)
+    plain_calls = len(calls)
+    calls.clear()
+    batched = snapshot.build_snapshot_for_genes(genes, tmp_path / "b.json", tmp_path / "c2", min_delay_s=0, batch_size=20)
+
+    assert plain["items_by_gene"] == batched["items_by_gene"]
+    assert len(batched["items_by_gene"]["EGFR"]["nodes"]) == 120
+    # Waves: first pages of all 4 genes, then EGFR+MET page 2, then EGFR page 3.
+    assert len(calls) == 3 < plain_calls
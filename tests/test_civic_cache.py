@@ -0,0 +1,54 @@
+import time
+from pathlib import Path
+
+from ttrecon.connectors.civic.cache import JsonFileCache, SqliteCache, migrate_json_cache
+
+def _payload(n: int):
+    return {"data": {"evidenceItems": {"nodes": [{"id": i, "description": "x" * 200} for i in range(n)]}}}
+
+def test_sqlite_cache_roundtrip_ttl_and_lru(tmp_path: Path):
+    c = SqliteCache(tmp_path / "requests.sqlite")
+    c.put("a", _payload(3), {"variables": {}})
+    assert c.get("a") == _payload(3)
+    assert c.get("missing") is None
+
+    c.put("short", _payload(1), {}, ttl_s=0.01)
+    time.sleep(0.02)
+    assert c.get("short") is None
+    c.close()
+
+    size = len(SqliteCache._encode(_payload(5)))
+    c = SqliteCache(tmp_path / "lru.sqlite", max_bytes=size * 3)
+    for k in ("k1", "k2", "k3"):
+        c.put(k, _payload(5), {})
+    c.get("k1")  # k2 is now least recently used
+    c.put("k4", _payload(5), {})
+    assert c.get("k2") is None
+    assert c.get("k1") is not None and c.get("k4") is not None
+    assert c.stats()["bytes"] <= size * 3
+
+def test_migrate_json_cache_keeps_keys(tmp_path: Path):
+    src = JsonFileCache(tmp_path / "civic")
+    src.put("abc", _payload(2), {"cached_at_utc": "2024-01-01T00:00:00Z"})
+    src.put("def", _payload(1), {})
+    dest = SqliteCache(tmp_path / "civic" / "requests.sqlite")
+
+    assert migrate_json_cache(tmp_path / "civic", dest, remove_source=True) == 2
+    assert dest.get("abc") == _payload(2)
+    assert src.stats()["entries"] == 0
+
+def test_json_cache_encodings_read_each_other(tmp_path: Path):
+    legacy = JsonFileCache(tmp_path / "civic")
+    legacy.put("old", _payload(20), {})
+    gz = JsonFileCache(tmp_path / "civic", encoding="gzip")
+    gz.put("new", _payload(20), {})
+
+    assert gz.get("old") == _payload(20)
+    assert legacy.get("new") == _payload(20)
+    assert gz.describe("new").endswith("new.json.gz")
+    req = tmp_path / "civic" / "requests"
+    assert (req / "new.json.gz").stat().st_size < (req / "old.json").stat().st_size / 5
+
+    gz.put("old", _payload(1), {})  # rewriting in the new encoding drops the stale file
+    assert not (req / "old.json").exists()
+    assert sorted(k for k, _, _ in gz.items()) == ["new", "old"]
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from ttrecon.core.evidence_store import EvidenceStore
+from ttrecon.core.models import Case, Evidence, Feature
+from ttrecon.engine import civic_claims
+from ttrecon.engine.civic_claims import civic_columns, claims_from_civic_evidence, promote_civic_claims
+
+def _rows(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    rows = [Evidence(evid_id="L0", source="local_case", kind="alteration", payload={"gene": "EGFR"})]
+    for i in range(n):
+        eid = rnd.randint(1, n // 2)  # plenty of nodes matched by several alterations
+        node = {
+            "id": eid,
+            "gene": {"name": rnd.choice(["EGFR", "egfr", "MET"])},
+            "variant": {"name": rnd.choice(["T790M", "L858R", ""])},
+            "evidenceRating": rnd.choice([1, 2, "3", 4.5, 5, None, "n/a", "nan"]),
+            "evidenceLevel": rnd.choice(["A", "b", "C", "", None]),
+            "evidenceType": rnd.choice(["PREDICTIVE", None]),
+            "drugs": [{"name": f"drug{j}"} for j in range(rnd.randint(0, 6))],
+            "description": "x" * rnd.randint(0, 300),
+        }
+        rows.append(Evidence(evid_id=f"C{i}", source="civic", kind="annotation", payload={"civic": node}))
+    rows.append(Evidence(evid_id="E0", source="civic", kind="annotation", payload={"error": "CACHE_MISS"}))
+    return rows
+
+@pytest.mark.parametrize("numpy_off", [False, True])
+def test_columnar_promotion_matches_reference(monkeypatch, numpy_off: bool):
+    if numpy_off:
+        monkeypatch.setattr(civic_claims, "_numpy", lambda: None)
+    else:
+        pytest.importorskip("numpy")  # pip install -e '.[test]'
+        assert civic_claims._numpy() is not None
+    case = Case(case_id="C1", alterations=[])
+    features = [Feature(feat_id="F1", name="f", value=True)]
+    rows = _rows(400)
+    cols = civic_columns(EvidenceStore(rows))
+    assert len(cols) < 400
+
+    for min_rating, levels in [(0.0, ""), (3.0, ""), (0.0, "A,B"), (4.0, "b"), (9.0, "")]:
+        want = claims_from_civic_evidence(case, rows, features, min_rating, levels)
+        got = promote_civic_claims(case, cols, features, min_rating, levels)
+        assert [c.model_dump() for c in got] == [c.model_dump() for c in want]
+    assert promote_civic_claims(case, civic_columns([]), features) == []
@@ -0,0 +1,72 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+from ttrecon.connectors.civic import client
+from ttrecon.connectors.civic.ratelimit import TokenBucket
+from ttrecon.core.models import Alteration, Case
+
+def _fake_post_graphql(calls):
+    lock = threading.Lock()
+
+    def post(query, variables, timeout_s=30, transport=None):
+        with lock:
+            calls.append(dict(variables))
+        time.sleep(0.01)
+        gene = variables["geneName"]
+        start = int(variables["after"] or 0)
+        total = 30
+        n = min(variables["first"], total - start)
+        nodes = [
+            {"id": hash((gene, variables["variantName"], start + i)) % 100000 + 1,
+             "gene": {"name": gene}, "variant": {"name": variables["variantName"] or "X"}}
+            for i in range(n)
+        ]
+        end = start + n
+        return {"data": {"evidenceItems": {
+            "totalCount": total,
+            "pageInfo": {"endCursor": str(end), "hasNextPage": end < total},
+            "nodes": nodes,
+        }}}
+    return post
+
+def _case() -> Case:
+    alts = [
+        Alteration(gene="EGFR", type="SNV", protein_change="T790M"),
+        Alteration(gene="EGFR", type="SNV", protein_change="L858R"),
+        Alteration(gene="KRAS", type="SNV", protein_change="G12C"),
+        Alteration(gene="EGFR", type="SNV", protein_change="T790M"),
+        Alteration(gene="MET", type="CNV", cnv_call="AMP"),
+    ]
+    return Case(case_id="CASE_CONC", alterations=alts)
+
+def _dump(evidence):
+    return "\n".join(json.dumps(e.model_dump(), sort_keys=True) for e in evidence)
+
+def test_concurrent_enrich_matches_sequential(tmp_path: Path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(client, "post_graphql", _fake_post_graphql(calls))
+
+    seq = client.civic_enrich(_case(), cache_dir=tmp_path / "seq", max_items=50, min_delay_s=0, jobs=1)
+    seq_calls = len(calls)
+    calls.clear()
+    par = client.civic_enrich(_case(), cache_dir=tmp_path / "par", max_items=50, min_delay_s=0, jobs=4)
+
+    assert _dump(seq) == _dump(par)
+    assert len(calls) == seq_calls
+
+def test_token_bucket_spacing():
+    now = [0.0]
+    slept = []
+
+    def sleep(s):
+        slept.append(s)
+        now[0] += s
+
+    bucket = TokenBucket(rate_per_s=2.0, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        bucket.acquire()
+
+    # Two tokens of burst are free, then one token every 0.5s.
+    assert slept == [0.5, 0.5]
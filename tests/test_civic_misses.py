@@ -0,0 +1,95 @@
+import time
+from pathlib import Path
+
+from ttrecon.connectors.civic import batch, client
+from ttrecon.connectors.civic.cache import CountingCache, JsonFileCache
+from ttrecon.connectors.civic.misses import MissLedger, prefetch_misses
+from ttrecon.connectors.civic.ratelimit import TokenBucket
+from ttrecon.connectors.civic.transport import CivicTransport
+from ttrecon.core.models import Alteration, Case
+
+def _page(v):
+    total = 0 if v["geneName"] == "KRAS" else 3
+    return {"totalCount": total, "pageInfo": {"endCursor": str(total), "hasNextPage": False},
+            "nodes": [{"id": i + 1, "variant": {"name": v["variantName"] or "X"}} for i in range(total)]}
+
+def _fake_batched_post(calls):
+    def post(query, variables, timeout_s=30, transport=None):
+        calls.append(variables)
+        out, i = {}, 0
+        while f"g{i}" in variables:
+            out[f"q{i}"] = _page({"geneName": variables[f"g{i}"], "variantName": variables[f"v{i}"]})
+            i += 1
+        return {"data": out}
+    return post
+
+def _case() -> Case:
+    return Case(case_id="CASE_MISS", alterations=[
+        Alteration(gene="EGFR", type="SNV", protein_change="T790M"),
+        Alteration(gene="KRAS", type="SNV", protein_change="G12C"),
+        Alteration(gene="EGFR", type="SNV", protein_change="T790M"),
+    ])
+
+def test_cache_only_misses_are_recorded_and_prefetched(tmp_path: Path, monkeypatch):
+    cache = JsonFileCache(tmp_path)
+    ledger = MissLedger.for_cache_dir(tmp_path)
+    ev = client.civic_enrich(_case(), tmp_path, source="cache", cache=cache, ledger=ledger)
+    assert [e.payload.get("error") for e in ev].count("CACHE_MISS (no network allowed)") == 3
+
+    summary = ledger.summary()
+    assert [(m["gene"], m["variantName"], m["count"]) for m in summary] == [("EGFR", "T790M", 2), ("KRAS", "G12C", 1)]
+    assert summary[0]["cases"] == ["CASE_MISS"]
+
+    calls = []
+    monkeypatch.setattr(batch, "post_graphql", _fake_batched_post(calls))
+    stats = prefetch_misses(ledger, cache, transport=CivicTransport(), limiter=TokenBucket(0))
+    assert len(calls) == 1 and stats["lookups"] == 2 and stats["resolved"] == 2
+    assert not ledger.path.exists()
+
+    ev = client.civic_enrich(_case(), tmp_path, source="cache", cache=cache, ledger=ledger)
+    assert len(ev) == 6 and all(e.payload["from_cache"] for e in ev)
+    assert not ledger.path.exists()
+
+def test_negative_entries_use_their_own_ttl(tmp_path: Path):
+    cache = JsonFileCache(tmp_path, negative_ttl_s=0.01)
+    cache.put("empty", {"data": {"evidenceItems": _page({"geneName": "KRAS", "variantName": None})}}, {})
+    cache.put("full", {"data": {"evidenceItems": _page({"geneName": "EGFR", "variantName": None})}}, {})
+    time.sleep(0.02)
+    assert cache.get("empty") is None
+    assert cache.get("full") is not None
+
+def _append_misses(path: str, worker: int, n: int) -> None:
+    ledger = MissLedger(Path(path))
+    for i in range(n):
+        ledger.record(f"new-{worker}-{i}", {"geneName": "EGFR"}, "full", 25, 50, case_id=f"W{worker}")
+
+def test_resolve_keeps_lines_appended_by_other_processes(tmp_path: Path):
+    from concurrent.futures import ProcessPoolExecutor
+
+    cache = JsonFileCache(tmp_path)
+    cache.put("done", {"data": {"evidenceItems": _page({"geneName": "EGFR", "variantName": None})}}, {})
+    ledger = MissLedger.for_cache_dir(tmp_path)
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        futs = [pool.submit(_append_misses, str(ledger.path), w, 150) for w in range(4)]
+        while not all(f.done() for f in futs):
+            ledger.record("done", {"geneName": "EGFR"}, "full", 25, 50)
+            ledger.resolve(cache)
+        for f in futs:
+            f.result()
+    ledger.resolve(cache)
+
+    keys = [m["key"] for m in ledger.summary()]
+    assert "done" not in keys
+    assert sorted(keys) == sorted(f"new-{w}-{i}" for w in range(4) for i in range(150))
+
+def test_counting_cache_reports_prefetch_lookups_separately(tmp_path: Path, monkeypatch):
+    cache = CountingCache(JsonFileCache(tmp_path))
+    monkeypatch.setattr(batch, "post_graphql", _fake_batched_post([]))
+    ev = client.civic_enrich(_case(), tmp_path, min_delay_s=0, batch_size=20, cache=cache)
+    assert len(ev) == 6
+
+    # Each alteration reads its one page once; the prefetch's probes and writes are kept apart.
+    assert cache.counts() == {
+        "cache_hits": 3, "cache_misses": 0, "cache_puts": 0,
+        "prefetch_hits": 2, "prefetch_misses": 2, "prefetch_puts": 2,
+    }
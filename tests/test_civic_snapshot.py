@@ -0,0 +1,284 @@
+import json
+from pathlib import Path
+
+from ttrecon.connectors.civic.client import civic_enrich_from_snapshot
+from ttrecon.connectors.civic.snapshot import (
+    SnapshotV2,
+    load_snapshot,
+    open_snapshot,
+    write_snapshot,
+    write_snapshot_v2,
+)
+from ttrecon.core.models import Alteration, Case
+
+def _node(i: int, gene: str, variant: str):
+    return {"id": i, "gene": {"name": gene}, "variant": {"name": variant}, "evidenceRating": 3}
+
+SNAP = {
+    "schema": "civic_snapshot_v1",
+    "endpoint": "https://civicdb.org/api/graphql",
+    "created_utc": "2024-01-01T00:00:00Z",
+    "genes": ["EGFR", "MET"],
+    "items_by_gene": {
+        "EGFR": {"nodes": [_node(1, "EGFR", "T790M"), _node(2, "EGFR", "L858R"), _node(3, "EGFR", "T790M AND C797S")]},
+        "MET": {"nodes": [_node(4, "MET", "Amplification")]},
+    },
+}
+
+def _dump(evidence):
+    return [json.dumps({**e.model_dump(), "payload": {**e.payload, "snapshot": None}}, sort_keys=True) for e in evidence]
+
+def test_v2_roundtrip_and_lazy_buckets(tmp_path: Path):
+    p = tmp_path / "snap.v2"
+    write_snapshot_v2(SNAP, p, compression="zlib")
+
+    snap = open_snapshot(p)
+    assert isinstance(snap, SnapshotV2)
+    assert snap.genes == ["EGFR", "MET"]
+    assert snap.bucket("MET") == SNAP["items_by_gene"]["MET"]
+    assert snap.bucket("KRAS") == {}
+    snap.close()
+
+    loaded = load_snapshot(p)
+    assert loaded["schema"] == "civic_snapshot_v2"
+    assert loaded["items_by_gene"] == SNAP["items_by_gene"]
+
+def test_enrich_from_v1_and_v2_agree(tmp_path: Path):
+    v1, v2 = tmp_path / "snap.json", tmp_path / "snap.v2"
+    write_snapshot(SNAP, v1)
+    write_snapshot(SNAP, v2, fmt="v2")
+    case = Case(case_id="C1", alterations=[
+        Alteration(gene="EGFR", type="SNV", protein_change="T790M"),
+        Alteration(gene="MET", type="CNV", cnv_call="AMP"),
+    ])
+
+    a = civic_enrich_from_snapshot(case, v1)
+    b = civic_enrich_from_snapshot(case, v2)
+    assert [e.payload["civic"]["id"] for e in a] == [1, 3, 4]
+    assert _dump(a) == _dump(b)
+
+def test_variant_index_matches_substring_scan():
+    import random
+
+    from ttrecon.connectors.civic.client import _variant_match_strict
+    from ttrecon.connectors.civic.snapshot import SnapshotV1
+
+    rng = random.Random(7)
+    names = ["T790M", "L858R", "T790M AND C797S", "Exon 19 Deletion", "E746_A750del", "Amplification",
+             "L858R and T790M", "g719s", "", "G12C", "G12", "V600E"]
+    nodes = [{"id": i, "variant": {"name": rng.choice(names)}} for i in range(300)]
+    nodes.append({"id": 999})
+    snap = SnapshotV1({"items_by_gene": {"EGFR": {"nodes": nodes}}})
+    idx = snap.variant_index()
+
+    for pc in ["T790M", "t790m", "L858", "19", "G", "", None, "DEL", "C797S", "ZZZ", " V600E ", "M A"]:
+        want = [n for n in nodes if _variant_match_strict({"protein_change": pc}, n)]
+        assert idx.match("EGFR", pc) == want
+        assert idx.match("EGFR", pc) == want  # memoized path
+    assert idx.match("KRAS", "G12C") == []
+
+def _paged_fake(totals, calls, fail_after=None):
+    def page(v):
+        gene, start = v["geneName"], int(v["after"] or 0)
+        n = max(0, min(v["first"], totals.get(gene, 0) - start))
+        return {
+            "totalCount": totals.get(gene, 0),
+            "pageInfo": {"endCursor": str(start + n), "hasNextPage": start + n < totals.get(gene, 0)},
+            "nodes": [{"id": f"{gene}-{start + i}-{totals[gene]}", "variant": {"name": "X"}} for i in range(n)],
+        }
+
+    def post(query, variables, timeout_s=30, transport=None):
+        if fail_after is not None and len(calls) >= fail_after:
+            raise RuntimeError("network down")
+        calls.append(variables)
+        if "geneName" in variables:
+            return {"data": {"evidenceItems": page(variables)}}
+        out, i = {}, 0
+        while f"g{i}" in variables:
+            out[f"q{i}"] = page({"geneName": variables[f"g{i}"], "after": variables[f"a{i}"], "first": variables[f"f{i}"]})
+            i += 1
+        return {"data": out}
+    return post
+
+def test_incremental_sync_refetches_only_changed_genes(tmp_path: Path, monkeypatch):
+    from ttrecon.connectors.civic import batch, snapshot
+
+    totals = {"EGFR": 120, "ALK": 7, "MET": 3}
+    calls = []
+    monkeypatch.setattr(snapshot, "post_graphql", _paged_fake(totals, calls))
+    monkeypatch.setattr(batch, "post_graphql", _paged_fake(totals, calls))
+    out = tmp_path / "snap.v2"
+    snapshot.build_snapshot_for_genes(["EGFR", "ALK", "MET"], out, tmp_path / "c", min_delay_s=0, fmt="v2")
+
+    totals["ALK"] = 9
+    totals["KRAS"] = 2
+    calls.clear()
+    snap = snapshot.build_snapshot_for_genes(
+        ["ALK", "EGFR", "KRAS"], out, tmp_path / "c", min_delay_s=0, incremental=True, fmt="v2")
+
+    fetched = [v["geneName"] for v in calls if "geneName" in v]
+    assert fetched == ["ALK", "KRAS"]
+    assert snap["genes"] == ["ALK", "EGFR", "KRAS", "MET"]
+    assert load_snapshot(out)["items_by_gene"]["ALK"]["total_count"] == 9
+    assert len(load_snapshot(out)["items_by_gene"]["EGFR"]["nodes"]) == 120
+
+def test_resume_continues_from_checkpoint(tmp_path: Path, monkeypatch):
+    import pytest
+    from ttrecon.connectors.civic import snapshot
+
+    totals = {"ALK": 7, "EGFR": 120}
+    calls = []
+    out = tmp_path / "snap.json"
+    # ALK (1 page) and the first EGFR page succeed, then the network fails.
+    # Without `resume` nothing is checkpointed.
+    monkeypatch.setattr(snapshot, "post_graphql", _paged_fake(totals, calls, fail_after=2))
+    with pytest.raises(RuntimeError):
+        snapshot.build_snapshot_for_genes(["ALK", "EGFR"], out, tmp_path / "c0", min_delay_s=0, fmt="v1")
+    assert not out.with_name("snap.json.checkpoint.json").exists()
+    assert not out.with_name("snap.json.parts").exists()
+
+    calls.clear()
+    monkeypatch.setattr(snapshot, "post_graphql", _paged_fake(totals, calls, fail_after=2))
+    with pytest.raises(RuntimeError):
+        snapshot.build_snapshot_for_genes(["ALK", "EGFR"], out, tmp_path / "c1", min_delay_s=0, resume=True,
+                                          fmt="v1")
+    assert out.with_name("snap.json.checkpoint.json").exists()
+    # Pages are appended one node per line; a torn append past the committed count is dropped.
+    partial = out.with_name("snap.json.parts") / "EGFR.partial.jsonl"
+    assert len(partial.read_text(encoding="utf-8").splitlines()) == 50
+    with partial.open("a", encoding="utf-8") as f:
+        f.write('{"id": "torn')
+
+    calls.clear()
+    monkeypatch.setattr(snapshot, "post_graphql", _paged_fake(totals, calls))
+    snap = snapshot.build_snapshot_for_genes(
+        ["ALK", "EGFR"], out, tmp_path / "c2", min_delay_s=0, resume=True, fmt="v1")
+
+    assert [v["after"] for v in calls] == ["50", "100"]
+    assert [n["id"] for n in snap["items_by_gene"]["EGFR"]["nodes"]] == [f"EGFR-{i}-120" for i in range(120)]
+    assert not out.with_name("snap.json.checkpoint.json").exists()
+    assert not out.with_name("snap.json.parts").exists()
+
+def test_parallel_sync_is_deterministic_and_reports_progress(tmp_path: Path, monkeypatch, caplog):
+    from ttrecon.connectors.civic import batch, snapshot
+
+    totals = {"EGFR": 120, "ALK": 7, "MET": 51, "KRAS": 0, "BRAF": 60}
+    monkeypatch.setattr(snapshot, "post_graphql", _paged_fake(totals, []))
+    monkeypatch.setattr(batch, "post_graphql", _paged_fake(totals, []))
+    seq = snapshot.build_snapshot_for_genes(list(totals), tmp_path / "a.json", tmp_path / "c1", min_delay_s=0)
+    for batch_size in (1, 20):
+        caplog.clear()
+        with caplog.at_level("INFO", logger="ttrecon"):
+            par = snapshot.build_snapshot_for_genes(list(totals), tmp_path / f"b{batch_size}.json",
+                                                    tmp_path / f"p{batch_size}", min_delay_s=0, jobs=4,
+                                                    batch_size=batch_size)
+
+        assert list(par["items_by_gene"]) == list(seq["items_by_gene"])
+        assert par["items_by_gene"] == seq["items_by_gene"]
+        events = [json.loads(r.message) for r in caplog.records]
+        done = [e for e in events if e.get("event") == "civic.sync.done"]
+        assert done and done[-1]["genes_done"] == 5 and done[-1]["items"] == 238 and done[-1]["pages"] == 9
+        assert done[-1]["network_pages"] == 9  # batched: every page was fetched by the prefetch
+        prefetch = [e for e in events if e.get("event") == "civic.sync.progress" and e.get("phase") == "prefetch"]
+        assert bool(prefetch) == (batch_size > 1)
+
+def test_snapshot_registry_reuses_and_reloads(tmp_path: Path):
+    import os
+
+    from ttrecon.connectors.civic.registry import SnapshotRegistry
+
+    p = tmp_path / "snap.v2"
+    write_snapshot_v2(SNAP, p)
+    reg = SnapshotRegistry(max_entries=2)
+    case = Case(case_id="C1", alterations=[Alteration(gene="EGFR", type="SNV", protein_change="T790M")])
+
+    first = civic_enrich_from_snapshot(case, p, registry=reg)
+    snap = reg.get(p)
+    assert snap.variant_index() is reg.get(p).variant_index()
+    assert reg.stats()["hits"] == 2 and reg.stats()["misses"] == 1
+
+    changed = {**SNAP, "items_by_gene": {"EGFR": {"nodes": [_node(7, "EGFR", "T790M")]}}}
+    write_snapshot_v2(changed, p)
+    os.utime(p, ns=(1, 1))
+    again = civic_enrich_from_snapshot(case, p, registry=reg)
+    assert [e.payload["civic"]["id"] for e in first] == [1, 3]
+    assert [e.payload["civic"]["id"] for e in again] == [7]
+    assert reg.stats()["entries"] == 1
+
+    reg.clear()
+    assert reg.stats() == {"entries": 0, "max_entries": 2, "hits": 0, "misses": 0, "evictions": 0, "paths": []}
+
+def test_streamed_snapshot_matches_in_memory_write(tmp_path: Path, monkeypatch):
+    from ttrecon.connectors.civic import snapshot
+
+    write_snapshot(SNAP, tmp_path / "ref.json", fmt="v1")
+    assert (tmp_path / "ref.json").read_text(encoding="utf-8") == json.dumps(SNAP, indent=2, ensure_ascii=False)
+    empty = {**SNAP, "genes": [], "items_by_gene": {}}
+    write_snapshot(empty, tmp_path / "empty.json", fmt="v1")
+    assert (tmp_path / "empty.json").read_text(encoding="utf-8") == json.dumps(empty, indent=2, ensure_ascii=False)
+
+    totals = {"EGFR": 120, "ALK": 7, "MET": 51, "KRAS": 0}
+    monkeypatch.setattr(snapshot, "post_graphql", _paged_fake(totals, []))
+    for fmt in ("v1", "v2"):
+        built = snapshot.build_snapshot_for_genes(list(totals), tmp_path / f"a.{fmt}", tmp_path / "c", min_delay_s=0)
+        header = snapshot.sync_snapshot(list(totals), tmp_path / f"b.{fmt}", tmp_path / "c", fmt=fmt,
+                                        min_delay_s=0, jobs=3)
+        assert "items_by_gene" not in header
+        streamed = load_snapshot(tmp_path / f"b.{fmt}")
+        assert streamed["items_by_gene"] == built["items_by_gene"]
+        assert list(streamed["items_by_gene"]) == sorted(totals)
+        assert not (tmp_path / f"b.{fmt}.tmp").exists()
+
+def test_query_profiles_and_compact_snapshot_encodings(tmp_path: Path, monkeypatch):
+    import gzip
+    from ttrecon.connectors.civic import snapshot
+    from ttrecon.connectors.civic.graphql import EVIDENCE_ITEMS_QUERY, evidence_items_query
+
+    assert evidence_items_query("full") == EVIDENCE_ITEMS_QUERY
+    assert "description" not in evidence_items_query("minimal")
+    assert "citation" in evidence_items_query("claims") and "ncitId" not in evidence_items_query("claims")
+
+    queries = []
+    fake = _paged_fake({"EGFR": 3}, [])
+    monkeypatch.setattr(snapshot, "post_graphql", lambda q, v, **kw: queries.append(q) or fake(q, v, **kw))
+    snap = snapshot.build_snapshot_for_genes(["EGFR"], tmp_path / "a.json", tmp_path / "c", min_delay_s=0,
+                                             profile="minimal")
+    snapshot.build_snapshot_for_genes(["EGFR"], tmp_path / "a.json", tmp_path / "c", min_delay_s=0, profile="full")
+    assert queries == [evidence_items_query("minimal"), EVIDENCE_ITEMS_QUERY]  # separate cache keys
+    assert snap["profile"] == "minimal"
+
+    write_snapshot(SNAP, tmp_path / "s.json", fmt="v1", encoding="compact")
+    assert (tmp_path / "s.json").read_text(encoding="utf-8") == json.dumps(SNAP, ensure_ascii=False, separators=(",", ":"))
+    write_snapshot(SNAP, tmp_path / "s.json.gz", fmt="v1", encoding="gzip")
+    assert json.loads(gzip.decompress((tmp_path / "s.json.gz").read_bytes())) == SNAP
+    assert load_snapshot(tmp_path / "s.json.gz") == SNAP
+    write_snapshot(SNAP, tmp_path / "s.v2", fmt="v2", encoding="gzip")
+    assert open_snapshot(tmp_path / "s.v2").header["compression"] == "zlib"
+    assert load_snapshot(tmp_path / "s.v2")["items_by_gene"] == SNAP["items_by_gene"]
+
+def test_incremental_v2_sync_carries_genes_over_without_decoding(tmp_path: Path, monkeypatch):
+    from ttrecon.connectors.civic import batch, snapshot
+
+    totals = {"EGFR": 120, "ALK": 7, "MET": 3, "KRAS": 2}
+    monkeypatch.setattr(snapshot, "post_graphql", _paged_fake(totals, []))
+    monkeypatch.setattr(batch, "post_graphql", _paged_fake(totals, []))
+    out = tmp_path / "snap.v2"
+    snapshot.sync_snapshot(list(totals), out, tmp_path / "c", fmt="v2", min_delay_s=0, encoding="gzip")
+    before = load_snapshot(out)["items_by_gene"]
+
+    decoded = []
+    real_bucket = SnapshotV2.bucket
+    monkeypatch.setattr(SnapshotV2, "bucket", lambda self, gene, cache=True: decoded.append((gene, cache)) or real_bucket(self, gene, cache))
+    totals["ALK"] = 9
+    snapshot.sync_snapshot(["ALK", "EGFR"], out, tmp_path / "c", fmt="v2", min_delay_s=0, encoding="gzip", incremental=True)
+    assert decoded == []  # EGFR compared by its stored summary; EGFR, KRAS, MET copied as raw blocks
+
+    after = load_snapshot(out)["items_by_gene"]
+    assert after["ALK"]["total_count"] == 9
+    assert {g: after[g] for g in ("EGFR", "KRAS", "MET")} == {g: before[g] for g in ("EGFR", "KRAS", "MET")}
+
+    # A different block compression has to re-encode carried genes, one at a time and uncached.
+    decoded.clear()
+    snapshot.sync_snapshot(["ALK"], out, tmp_path / "c", fmt="v2", min_delay_s=0, incremental=True)
+    assert decoded and all(cache is False for _, cache in decoded)
+    assert load_snapshot(out)["items_by_gene"] == after
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from ttrecon.connectors.civic import snapshot
+from ttrecon.connectors.civic.client import civic_enrich
+from ttrecon.connectors.civic.standin import Faults, StandinData, StandinServer
+from ttrecon.connectors.civic.transport import CivicTransport
+from ttrecon.core.models import Alteration, Case
+
+def _data() -> StandinData:
+    def node(i, gene, variant):
+        return {"id": i, "status": "ACCEPTED", "gene": {"id": 1, "name": gene}, "variant": {"id": i, "name": variant},
+                "description": f"item {i}", "drugs": [{"id": 1, "name": "osimertinib", "ncitId": "C116377"}]}
+    return StandinData({
+        "EGFR": [node(i, "EGFR", "T790M" if i % 3 else "L858R") for i in range(1, 131)],
+        "ALK": [node(1000 + i, "ALK", "Fusion") for i in range(7)],
+    })
+
+def test_sync_against_standin_matches_source(tmp_path: Path):
+    data = _data()
+    with StandinServer(data) as srv:
+        t = CivicTransport(endpoint=srv.endpoint)
+        for batch_size in (1, 20):
+            snap = snapshot.build_snapshot_for_genes(
+                ["EGFR", "ALK", "KRAS"], tmp_path / "s.json", tmp_path / f"c{batch_size}",
+                min_delay_s=0, transport=t, batch_size=batch_size)
+            got = snap["items_by_gene"]["EGFR"]["nodes"]
+            assert [n["id"] for n in got] == [n["id"] for n in data.nodes_by_gene["EGFR"]]
+            assert got[0]["drugs"] == data.nodes_by_gene["EGFR"][0]["drugs"] and got[0]["disease"] is None
+            assert snap["items_by_gene"]["EGFR"]["total_count"] == 130
+            assert snap["items_by_gene"]["KRAS"] == {"nodes": [], "total_count": 0}
+        assert srv.stats()["by_status"] == {"200": srv.stats()["requests"]}
+
+def test_injected_faults_are_retried(tmp_path: Path):
+    case = Case(case_id="CASE_SI", alterations=[Alteration(gene="EGFR", type="SNV", protein_change="T790M")])
+    faults = Faults(error_rate=0.2, rate_429=0.2, retry_after_s=0.5, seed=7)
+    with StandinServer(_data(), faults=faults) as srv:
+        slept = []
+        t = CivicTransport(endpoint=srv.endpoint, max_retries=10, backoff_s=0.01, sleep=slept.append)
+        ev = civic_enrich(case, tmp_path, max_items=200, min_delay_s=0, transport=t, profile="minimal")
+        st = srv.stats()
+
+    assert len(ev) == 87  # ids 1..130 not divisible by 3
+    assert "description" not in ev[0].payload["civic"]
+    assert st["by_status"].get("429") and st["by_status"].get("503")
+    assert t.stats().retries == st["requests"] - st["by_status"]["200"]
+    assert 0.5 in slept  # Retry-After honoured
+
+def test_batched_live_run_reports_network_pages_as_not_cached(tmp_path: Path):
+    case = Case(case_id="CASE_FC", alterations=[
+        Alteration(gene="EGFR", type="SNV", protein_change="T790M"),
+        Alteration(gene="ALK", type="FUSION", name="Fusion"),
+        Alteration(gene="EGFR", type="SNV", protein_change="T790M"),
+    ])
+    with StandinServer(_data()) as srv:
+        t = CivicTransport(endpoint=srv.endpoint)
+        runs = {
+            (batch_size, jobs): civic_enrich(case, tmp_path / f"c{batch_size}_{jobs}", max_items=200, min_delay_s=0,
+                                             transport=t, batch_size=batch_size, jobs=jobs)
+            for batch_size, jobs in ((1, 1), (20, 1), (20, 4))
+        }
+        warm = civic_enrich(case, tmp_path / "c20_1", max_items=200, min_delay_s=0, transport=t, batch_size=20)
+
+    cold = runs[(20, 1)]
+    n_first = sum(1 for e in cold if e.payload["case_alteration"]["gene"] == "EGFR") // 2
+    flags = [e.payload["from_cache"] for e in cold]
+    assert not any(flags[:-n_first]) and all(flags[-n_first:])  # only the repeated alteration reads this run's pages
+    for ev in runs.values():
+        assert [e.payload["from_cache"] for e in ev] == [e.payload["from_cache"] for e in runs[(1, 1)]]
+    assert all(e.payload["from_cache"] for e in warm)
+
+def test_enrich_without_a_transport_uses_the_configured_endpoint(tmp_path: Path, monkeypatch):
+    case = Case(case_id="CASE_EP", alterations=[Alteration(gene="ALK", type="FUSION", name="Fusion")])
+    with StandinServer(_data()) as srv:
+        monkeypatch.setenv("TTRECON_CIVIC_ENDPOINT", srv.endpoint)
+        ev = civic_enrich(case, tmp_path, min_delay_s=0)
+        assert srv.stats()["requests"] == 1
+    assert len(ev) == 7
@@ -0,0 +1,84 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from ttrecon.connectors.civic.transport import CivicTransport
+
+def _serve(statuses):
+    """Answer POSTs with the given status codes in order, then 200."""
+    seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            seen.append(body["variables"])
+            status = statuses.pop(0) if statuses else 200
+            payload = json.dumps({"data": {"ok": status == 200}}).encode("utf-8")
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "7")
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}/graphql", seen
+
+def test_transport_retries_and_honours_retry_after():
+    srv, url, seen = _serve([502, 429])
+    slept = []
+    try:
+        t = CivicTransport(endpoint=url, max_retries=3, backoff_s=0.25, sleep=slept.append)
+        data, cs = t.request("query { x }", {"geneName": "EGFR"})
+    finally:
+        srv.shutdown()
+
+    assert data == {"data": {"ok": True}}
+    assert cs.retries == 2 and cs.status == 200 and cs.bytes_received > 0
+    assert slept == [0.25, 7.0]
+    assert len(seen) == 3
+    st = t.stats()
+    assert st.calls == 1 and st.retries == 2 and st.failures == 0
+
+def test_transport_gives_up_after_max_retries():
+    srv, url, _ = _serve([503, 503, 503])
+    try:
+        t = CivicTransport(endpoint=url, max_retries=1, sleep=lambda s: None)
+        with pytest.raises(requests.HTTPError):
+            t.post("query { x }", {})
+    finally:
+        srv.shutdown()
+    assert t.stats().failures == 1
+
+def test_post_graphql_uses_the_transport_timeout():
+    from ttrecon.connectors.civic.util import post_graphql
+
+    class Session(requests.Session):
+        def post(self, url, data=None, timeout=None, **kw):
+            timeouts.append(timeout)
+            resp = requests.Response()
+            resp.status_code, resp._content = 200, b'{"data": {}}'
+            return resp
+
+    timeouts = []
+    t = CivicTransport(endpoint="http://civic.invalid/graphql", timeout_s=7.5, session=Session())
+    post_graphql("query { x }", {}, transport=t)
+    post_graphql("query { x }", {}, timeout_s=2, transport=t)
+    assert timeouts == [7.5, 2]
+
+def test_default_transport_follows_the_configured_endpoint(monkeypatch):
+    from ttrecon.connectors.civic.transport import configured_transport
+
+    monkeypatch.setenv("TTRECON_CIVIC_ENDPOINT", "http://127.0.0.1:9/graphql")
+    monkeypatch.setenv("TTRECON_CIVIC_TIMEOUT_S", "3.5")
+    t = configured_transport()
+    assert (t.endpoint, t.timeout_s) == ("http://127.0.0.1:9/graphql", 3.5)
+    assert configured_transport() is t
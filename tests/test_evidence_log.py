@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+from ttrecon.core.evidence_log import EvidenceLog
+from ttrecon.core.models import Evidence
+
+def _ev(i: int) -> Evidence:
+    return Evidence(evid_id=f"EVID-{i}", source="civic", kind="annotation", payload={"civic": {"id": i, "d": "é" * i}})
+
+def test_evidence_log_streams_to_jsonl_and_reads_back(tmp_path: Path):
+    path = tmp_path / "evidence.jsonl"
+    log = EvidenceLog.create(path)
+    log.extend(_ev(i) for i in range(5))
+    assert len(log) == 5 and log[2] == _ev(2)  # readable while still being written
+    log.append(_ev(5))
+    log.seal()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines == [json.dumps(_ev(i).model_dump(), ensure_ascii=False) for i in range(6)]
+    assert list(log) == [_ev(i) for i in range(6)]
+    assert log[-1] == _ev(5) and log[1:3] == [_ev(1), _ev(2)]
+    log.close()
+
+    again = EvidenceLog.open(path)
+    assert len(again) == 6 and again[4] == _ev(4)
+    assert [e.evid_id for e in again if e.payload["civic"]["id"] % 2] == ["EVID-1", "EVID-3", "EVID-5"]
+    again.close()
+
+def test_normalized_log_writes_each_civic_node_once(tmp_path: Path):
+    from ttrecon.connectors.civic.client import civic_enrich_from_snapshot
+    from ttrecon.connectors.civic.intern import NodeInterner
+    from ttrecon.connectors.civic.snapshot import write_snapshot
+    from ttrecon.core.models import Alteration, Case
+
+    nodes = [{"id": i, "gene": {"name": "EGFR"}, "variant": {"name": v}} for i, v in ((1, "T790M"), (2, "L858R"))]
+    snap = tmp_path / "snap.json"
+    write_snapshot({"schema": "civic_snapshot_v1", "endpoint": "x", "created_utc": "2024-01-01T00:00:00Z",
+                    "genes": ["EGFR"], "items_by_gene": {"EGFR": {"nodes": nodes}}}, snap)
+    case = Case(case_id="C1", alterations=[
+        Alteration(gene="EGFR", type="SNV", protein_change="T790M"),
+        Alteration(gene="EGFR", type="SNV", protein_change="L858R"),
+    ])
+    interner = NodeInterner()
+    rows = civic_enrich_from_snapshot(case, snap, mode="loose", interner=interner)
+    assert len(rows) == 4 and rows[0].payload["civic"] is rows[2].payload["civic"]
+    assert interner.stats()["nodes"] == 2
+
+    path, nodes_path = tmp_path / "evidence.jsonl", tmp_path / "civic_nodes.jsonl"
+    log = EvidenceLog.create(path, nodes_path=nodes_path)
+    log.extend(rows)
+    log.seal()
+    assert [json.loads(line)["id"] for line in nodes_path.read_text(encoding="utf-8").splitlines()] == [1, 2]
+    assert json.loads(path.read_text(encoding="utf-8").splitlines()[2])["payload"]["civic"] == {"$ref": "1"}
+    assert list(log) == rows
+    log.close()
+
+    again = EvidenceLog.open(path, nodes_path=nodes_path)
+    assert list(again) == rows and again[0].payload["civic"] is again[2].payload["civic"]
+    assert b"".join(again.iter_node_rows()) == nodes_path.read_bytes()
+    again.close()
+
+def test_concurrent_logs_spool_separately_and_abort_leaves_nothing(tmp_path: Path):
+    path, nodes = tmp_path / "evidence.jsonl", tmp_path / "civic_nodes.jsonl"
+    a = EvidenceLog.create(path, nodes_path=nodes)
+    b = EvidenceLog.create(path)
+    assert a.path != path and a.path.parent == tmp_path
+    a.extend(_ev(i) for i in range(3))
+    a.abort()
+    assert [p.name for p in tmp_path.iterdir()] == [b.path.name]
+
+    b.append(_ev(7))
+    b.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["evidence.jsonl"]
+    assert list(EvidenceLog.open(path)) == [_ev(7)]
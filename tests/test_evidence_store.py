@@ -0,0 +1,25 @@
+from ttrecon.core.evidence_store import EvidenceStore
+from ttrecon.core.models import Evidence
+
+def _local(i: int, gene: str, pc: str) -> Evidence:
+    return Evidence(evid_id=f"L{i}", source="local_case", kind="alteration", payload={"gene": gene, "protein_change": pc})
+
+def _civic(eid: int, gene: str, var: str) -> Evidence:
+    return Evidence(evid_id=f"C{eid}", source="civic", kind="annotation",
+                    payload={"civic": {"id": eid, "gene": {"name": gene}, "variant": {"name": var}}})
+
+def test_evidence_store_indexes_and_behaves_like_a_list():
+    rows = [_local(0, "EGFR", "L858R"), _civic(11, "EGFR", "L858R"), _local(1, "MET", ""), _civic(12, "egfr", "T790M")]
+    store = EvidenceStore()
+    store.extend(rows)
+
+    assert list(store) == rows and len(store) == 4 and store[1] == rows[1]
+    assert [e.evid_id for e in store if e.kind == "alteration"] == ["L0", "L1"]
+    assert store.ids(kind="alteration") == ["L0", "L1"]
+    assert store.ids(source="civic", gene="EGFR") == ["C11", "C12"]
+    assert store.ids(gene="egfr", variant="l858r") == ["L0", "C11"]
+    assert store.select(civic_id=12) == [rows[3]]
+    assert store.select(source="civic", gene="KRAS") == []
+    assert store.get("L1") == rows[2] and store.get("nope") is None
+    assert store.genes() == ["EGFR", "MET"]
+    assert EvidenceStore(list(rows)).ids(source="civic") == ["C11", "C12"]
@@ -0,0 +1,72 @@
+import json
+import os
+from pathlib import Path
+
+from ttrecon.config import load_config
+from ttrecon.engine.batch import CaseSource, run_batch
+
+def _write_cases(tmp_path: Path) -> Path:
+    base = json.loads(Path("examples/cases/egfr_example.json").read_text(encoding="utf-8"))
+    lines = []
+    for i in range(4):
+        lines.append(json.dumps({**base, "case_id": f"CASE_B{i}"}))
+    lines.insert(2, json.dumps({"case_id": "CASE_BAD", "alterations": [{"gene": "EGFR", "type": "NOPE"}]}))
+    p = tmp_path / "cohort.jsonl"
+    p.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return p
+
+def test_run_batch_keeps_going_and_writes_manifest(tmp_path: Path):
+    cfg = load_config()
+    cases = _write_cases(tmp_path)
+    for workers in (1, 2):
+        out = tmp_path / f"out{workers}"
+        m = run_batch(cfg, str(cases), target="EGFR", out_dir=out, workers=workers)
+
+        assert (m.total, m.ok, m.failed) == (5, 4, 1)
+        assert [c.name for c in m.cases] == [f"cohort_{i:06d}" for i in range(1, 6)]
+        bad = m.cases[2]
+        assert bad.status == "failed" and "ValidationError" in bad.error and bad.source.endswith(":3")
+        assert [c.case_id for c in m.cases if c.status == "ok"] == ["CASE_B0", "CASE_B1", "CASE_B2", "CASE_B3"]
+        assert (out / "cohort_000001" / "report.md").exists()
+        assert json.loads((out / "batch_manifest.json").read_text(encoding="utf-8"))["failed"] == 1
+
+def test_run_batch_streams_json_array_bundle(tmp_path: Path, monkeypatch):
+    from ttrecon.ingest import case_loader
+    monkeypatch.setattr(case_loader, "_CHUNK", 16)  # force records to straddle reads
+    base = json.loads(Path("examples/cases/egfr_example.json").read_text(encoding="utf-8"))
+    records = [{**base, "case_id": "CASE_A0"}, {"case_id": "CASE_BAD", "alterations": 1}, {**base, "case_id": "CASE_A1"}]
+    p = tmp_path / "bundle.json"
+    p.write_text("[\n" + ",\n".join(json.dumps(r, indent=2) for r in records) + "\n]\n", encoding="utf-8")
+
+    recs = list(case_loader.iter_case_records(p))
+    assert [r.index for r in recs] == [1, 2, 3]
+    assert [r.line for r in recs] == [2] + [2 + sum(json.dumps(x, indent=2).count("\n") + 1 for x in records[:i]) for i in (1, 2)]
+    assert recs[0].case.case_id == "CASE_A0" and recs[1].error.startswith("ValidationError")
+
+    m = run_batch(load_config(), str(p), target="EGFR", out_dir=tmp_path / "out")
+    assert (m.total, m.ok, m.failed) == (3, 2, 1)
+    assert [c.name for c in m.cases] == ["bundle_000001", "bundle_000002", "bundle_000003"]
+    assert m.cases[1].source == f"{p}:{recs[1].line}"
+
+    p.write_text(p.read_text(encoding="utf-8")[:-40], encoding="utf-8")  # truncated: the last record is cut short
+    recs = list(case_loader.iter_case_records(p))
+    assert [r.error is None for r in recs] == [True, False, False]
+    assert recs[2].error.startswith("JSONDecodeError")
+
+class _KillsWorker(type(Path())):
+    """A case path that exits the worker process as it is unpickled there."""
+
+    def __reduce__(self):
+        return os._exit, (3,)
+
+def test_run_batch_records_cases_lost_to_a_dead_worker(tmp_path: Path):
+    example = Path("examples/cases/egfr_example.json")
+    sources = [CaseSource("a", str(example), example), CaseSource("dies", "dies", _KillsWorker(example))]
+    sources += [CaseSource(f"z{i}", str(example), example) for i in range(3)]
+    out = tmp_path / "out"
+    m = run_batch(load_config(), sources, target="EGFR", out_dir=out, workers=2)
+
+    assert m.total == 5 and m.failed >= 1
+    assert [c.name for c in m.cases] == ["a", "dies", "z0", "z1", "z2"]
+    assert m.cases[1].status == "failed" and m.cases[1].error.startswith("BrokenProcessPool")
+    assert json.loads((out / "batch_manifest.json").read_text(encoding="utf-8"))["total"] == 5
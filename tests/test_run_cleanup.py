@@ -0,0 +1,42 @@
+import asyncio
+import sqlite3
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from ttrecon.config import load_config
+from ttrecon.connectors.civic import cache as civic_cache
+from ttrecon.engine.orchestrator import run_pipeline, run_pipeline_async, run_targets
+
+CASE = Path("examples/cases/egfr_example.json").resolve()
+
+@pytest.mark.parametrize("gzip", [False, True])
+def test_failed_enrichment_leaves_no_spool_files(tmp_path: Path, gzip: bool):
+    cfg = replace(load_config(), evidence_gzip=gzip)
+    missing = tmp_path / "no_such_snapshot.json"
+    runs = {
+        "single": lambda out: run_pipeline(cfg, CASE, "EGFR", out, civic=True, civic_source="snapshot",
+                                           civic_snapshot=missing),
+        "multi": lambda out: run_targets(cfg, CASE, "ALL", out, civic=True, civic_source="snapshot",
+                                         civic_snapshot=missing),
+        "async": lambda out: asyncio.run(run_pipeline_async(cfg, CASE, "EGFR", out, civic=True,
+                                                            civic_source="snapshot", civic_snapshot=missing)),
+    }
+    for name, run in runs.items():
+        out = tmp_path / name
+        with pytest.raises(FileNotFoundError):
+            run(out)
+        assert not [p.name for p in out.rglob("*") if ".part" in p.name or p.name.startswith("evidence")]
+
+def test_civic_runs_close_the_request_cache(tmp_path: Path, monkeypatch):
+    opened = []
+    real_open = civic_cache.SqliteCache.__init__
+    monkeypatch.setattr(civic_cache.SqliteCache, "__init__", lambda self, *a, **kw: (opened.append(self), real_open(self, *a, **kw))[1])
+    cfg = replace(load_config(), civic_cache_dir=tmp_path / "civic", civic_cache_backend="sqlite")
+    for i in range(2):
+        run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / f"out{i}", civic=True, civic_source="cache")
+    assert len(opened) == 2
+    for c in opened:
+        with pytest.raises(sqlite3.ProgrammingError):  # closed
+            c._conn.execute("SELECT 1")
@@ -1,4 +1,5 @@
 from pathlib import Path
+
 from ttrecon.config import load_config
 from ttrecon.engine.orchestrator import run_pipeline
 
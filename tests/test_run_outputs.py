@@ -0,0 +1,29 @@
+import gzip
+import json
+from dataclasses import replace
+from pathlib import Path
+
+from ttrecon.config import load_config
+from ttrecon.engine.orchestrator import run_pipeline
+
+CASE = Path("examples/cases/egfr_example.json").resolve()
+
+def test_compact_json_and_gzip_evidence_outputs(tmp_path: Path):
+    cfg = load_config()
+    run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "plain")
+    small = replace(cfg, compact_json=True, evidence_gzip=True)
+    manifest = run_pipeline(small, case_path=CASE, target="EGFR", out_dir=tmp_path / "small")
+
+    out = tmp_path / "small"
+    assert sorted(p.name for p in out.iterdir()) == [
+        "case_normalized.json", "claims.json", "evidence.jsonl.gz", "features.json", "report.md", "run_manifest.json",
+    ]
+    assert manifest.outputs["evidence_jsonl"] == str(out / "evidence.jsonl.gz")
+    plain_rows = (tmp_path / "plain" / "evidence.jsonl").read_text(encoding="utf-8").splitlines()
+    small_rows = gzip.decompress((out / "evidence.jsonl.gz").read_bytes()).decode("utf-8").splitlines()
+    assert [json.loads(r) for r in small_rows] == [json.loads(r) for r in plain_rows]
+    claims = (out / "claims.json").read_text(encoding="utf-8")
+    assert "\n" not in claims
+    assert json.loads(claims) == json.loads((tmp_path / "plain" / "claims.json").read_text(encoding="utf-8"))
+    saved = json.loads((out / "run_manifest.json").read_text(encoding="utf-8"))
+    assert saved == json.loads(manifest.model_dump_json())
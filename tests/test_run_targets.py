@@ -0,0 +1,22 @@
+import json
+from pathlib import Path
+
+from ttrecon.config import load_config
+from ttrecon.engine.orchestrator import run_pipeline, run_targets
+
+CASE = Path("examples/cases/egfr_example.json").resolve()
+
+def test_run_targets_shares_ingest_and_matches_single_run(tmp_path: Path):
+    cfg = load_config()
+    run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "single")
+    multi = run_targets(cfg, case_path=CASE, targets="ALL", out_dir=tmp_path / "multi", target_jobs=2)
+
+    assert "EGFR" in multi.targets
+    assert (tmp_path / "multi" / "evidence.jsonl").exists()
+    assert not (tmp_path / "multi" / "EGFR" / "evidence.jsonl").exists()
+    assert multi.runs["EGFR"].outputs["evidence_jsonl"] == str(tmp_path / "multi" / "evidence.jsonl")
+    for name in ("claims.json", "features.json"):
+        single = json.loads((tmp_path / "single" / name).read_text(encoding="utf-8"))
+        shared = json.loads((tmp_path / "multi" / "EGFR" / name).read_text(encoding="utf-8"))
+        assert shared == single
+    assert json.loads((tmp_path / "multi" / "run_manifest.json").read_text(encoding="utf-8"))["targets"] == multi.targets
@@ -0,0 +1,22 @@
+import json
+from pathlib import Path
+
+from ttrecon.config import load_config
+from ttrecon.core.timing import profile_to
+from ttrecon.engine.orchestrator import run_pipeline
+
+CASE = Path("examples/cases/egfr_example.json").resolve()
+
+def test_run_manifest_records_stage_timings(tmp_path: Path):
+    cfg = load_config()
+    with profile_to(tmp_path / "out"):
+        manifest = run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "out")
+
+    stages = list(manifest.timings)
+    assert stages[:3] == ["case_load", "normalize", "local_evidence"]
+    assert {"rules", "rank", "write.claims", "write.report_md"} <= set(stages)
+    assert manifest.timings["rules"].counts["claims"] >= 1
+    saved = json.loads((tmp_path / "out" / "run_manifest.json").read_text(encoding="utf-8"))
+    assert saved["timings"]["local_evidence"]["counts"]["evidence"] == 3
+    assert (tmp_path / "out" / "profile.pstats").exists()
+    assert "cumulative" in (tmp_path / "out" / "profile.txt").read_text(encoding="utf-8")
@@ -0,0 +1,62 @@
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+
+import requests
+
+from ttrecon.config import load_config
+from ttrecon.engine.server import RunServer
+
+CASE = Path("examples/cases/egfr_example.json")
+
+def _config(tmp_path: Path):
+    targets = tmp_path / "targets"
+    shutil.copytree(Path("ttrecon/targets/EGFR"), targets / "EGFR", ignore=shutil.ignore_patterns("__pycache__"))
+    return replace(load_config(), targets_dir=targets)
+
+def test_serve_runs_cases_concurrently_and_reloads_packs(tmp_path: Path):
+    case = json.loads(CASE.read_text(encoding="utf-8"))
+    with RunServer(_config(tmp_path), target="EGFR", jobs=2, roots=[Path.cwd(), tmp_path]) as server:
+        url = server.endpoint
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            resps = list(pool.map(lambda _: requests.post(f"{url}/run", json={"case": case}, timeout=30), range(4)))
+        assert all(r.status_code == 200 for r in resps)
+        body = resps[0].json()
+        assert body["manifest"]["case_id"] == case["case_id"]
+        assert body["claims"] and "TT-RECON" in body["report_md"]
+
+        r = requests.post(f"{url}/run", json={"case_path": str(CASE.resolve()), "out": str(tmp_path / "out")}, timeout=30)
+        assert r.status_code == 200 and "claims" not in r.json()
+        assert (tmp_path / "out" / "run_manifest.json").exists()
+
+        assert requests.post(f"{url}/run", json={"case": case, "bogus": 1}, timeout=30).status_code == 400
+        assert requests.post(f"{url}/run", json={"case": {"alterations": []}}, timeout=30).status_code == 400
+
+        with (tmp_path / "targets" / "EGFR" / "target.yml").open("a", encoding="utf-8") as f:
+            f.write("\n# edited\n")
+        assert requests.post(f"{url}/run", json={"case": case}, timeout=30).status_code == 200
+        health = requests.get(f"{url}/health", timeout=30).json()
+        assert health["reloads"] == 1
+        assert health["requests"] == 8 and health["failures"] == 2
+
+def test_serve_rejects_paths_outside_its_roots(tmp_path: Path):
+    root = tmp_path / "root"
+    (root / "cases").mkdir(parents=True)
+    shutil.copy(CASE, root / "cases" / "case.json")
+    (root / "escape").symlink_to(tmp_path)
+    with RunServer(_config(tmp_path), target="EGFR", roots=[root]) as server:
+        url = server.endpoint
+        ok = {"case_path": str(root / "cases" / "case.json"), "out": str(root / "out")}
+        assert requests.post(f"{url}/run", json=ok, timeout=30).status_code == 200
+
+        for bad in (
+            {**ok, "case_path": str(CASE.resolve())},
+            {**ok, "out": str(root / ".." / "out")},
+            {**ok, "out": str(root / "escape" / "out")},
+            {**ok, "civic_snapshot": "/etc/passwd"},
+        ):
+            r = requests.post(f"{url}/run", json=bad, timeout=30)
+            assert r.status_code == 400 and "outside the server's roots" in r.json()["error"]
+        assert not (tmp_path / "out").exists()
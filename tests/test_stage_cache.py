@@ -0,0 +1,47 @@
+import shutil
+from dataclasses import replace
+from pathlib import Path
+
+from ttrecon.config import load_config
+from ttrecon.engine.orchestrator import run_pipeline
+
+CASE = Path("examples/cases/egfr_example.json").resolve()
+
+def _copy_pack(tmp_path: Path, *names: str) -> Path:
+    targets = tmp_path / "targets"
+    for name in names:
+        shutil.copytree(Path("ttrecon/targets") / name, targets / name, ignore=shutil.ignore_patterns("__pycache__"))
+    return targets
+
+def test_incremental_run_reuses_stages_and_run_id(tmp_path: Path):
+    targets = _copy_pack(tmp_path, "EGFR")
+    cfg = replace(load_config(), targets_dir=targets, stage_cache_dir=tmp_path / "stages")
+
+    first = run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "a", incremental=True)
+    again = run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "b", incremental=True)
+    assert again.run_id == first.run_id
+    assert again.timings["stage_cache.prepare"].counts["hit"] is True
+    assert again.timings["stage_cache.rules"].counts["hit"] is True
+    assert "rules" not in again.timings
+    assert (tmp_path / "b" / "claims.json").read_text(encoding="utf-8") == (tmp_path / "a" / "claims.json").read_text(encoding="utf-8")
+
+    with (targets / "EGFR" / "rules.py").open("a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    edited = run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "c", incremental=True)
+    assert edited.timings["stage_cache.prepare"].counts["hit"] is True
+    assert edited.timings["stage_cache.rules"].counts["hit"] is False
+    assert "rules" in edited.timings
+    assert edited.run_id != first.run_id
+
+def test_editing_the_common_pack_invalidates_cached_rules(tmp_path: Path):
+    targets = _copy_pack(tmp_path, "EGFR", "common")
+    cfg = replace(load_config(), targets_dir=targets, stage_cache_dir=tmp_path / "stages")
+
+    first = run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "a", incremental=True)
+    with (targets / "common" / "vocab.yml").open("a", encoding="utf-8") as f:
+        f.write("\n# edited\n")
+    edited = run_pipeline(cfg, case_path=CASE, target="EGFR", out_dir=tmp_path / "b", incremental=True)
+
+    assert edited.timings["stage_cache.prepare"].counts["hit"] is True
+    assert edited.timings["stage_cache.rules"].counts["hit"] is False
+    assert edited.run_id != first.run_id
@@ -1,14 +1,27 @@
 import argparse
+import json
+from contextlib import nullcontext
+from dataclasses import replace
 from pathlib import Path
 
 from ttrecon.config import load_config
+from ttrecon.core.timing import profile_to
 from ttrecon.logging import get_logger, log_event
-from ttrecon.engine.orchestrator import run_pipeline
-from ttrecon.targets.registry import list_targets
+from ttrecon.engine.batch import run_batch
+from ttrecon.engine.orchestrator import run_pipeline, run_targets
+from ttrecon.engine.server import RunServer
+from ttrecon.targets.registry import is_multi_target, list_targets
 from ttrecon.pack.generator import generate_pack
 from ttrecon.version import __version__
 
-from ttrecon.connectors.civic.snapshot import build_snapshot_for_genes, write_snapshot
+from ttrecon.connectors.civic.cache import JsonFileCache, migrate_json_cache, open_cache
+from ttrecon.connectors.civic.codec import ENCODINGS
+from ttrecon.connectors.civic.graphql import QUERY_PROFILES
+from ttrecon.connectors.civic.misses import MissLedger, prefetch_misses
+from ttrecon.connectors.civic.ratelimit import TokenBucket
+from ttrecon.connectors.civic.standin import Faults, StandinData, StandinServer
+from ttrecon.connectors.civic.snapshot import sync_snapshot
+from ttrecon.connectors.civic.transport import configured_transport
 
 def cmd_init() -> int:
     cfg = load_config()
@@ -39,7 +52,9 @@ def cmd_pack_add(target: str, overwrite: bool) -> int:
     print("Next: edit rules.py + target.yml, then run pytest.")
     return 0
 
-def cmd_civic_sync(genes_csv: str | None, genes_file: str | None, out_path: str | None, max_items: int, min_delay_s: float) -> int:
+def cmd_civic_sync(genes_csv: str | None, genes_file: str | None, out_path: str | None, max_items: int, min_delay_s: float,
+                   batch_size: int = 1, fmt: str = "v1", incremental: bool = False, resume: bool = False,
+                   jobs: int = 1, profile: str | None = None, encoding: str = "json") -> int:
     cfg = load_config()
     genes = []
     if genes_csv:
@@ -60,23 +75,136 @@ def cmd_civic_sync(genes_csv: str | None, genes_file: str | None, out_path: str
     outp = Path(out_path) if out_path else (cfg.civic_cache_dir / "snapshots" / "civic_snapshot.json")
     cfg.civic_cache_dir.mkdir(parents=True, exist_ok=True)
 
-    snap = build_snapshot_for_genes(
-        genes=genes,
-        out_path=outp,
-        cache_dir=cfg.civic_cache_dir,
-        max_items_per_gene=max_items,
-        min_delay_s=min_delay_s,
-    )
-    write_snapshot(snap, outp)
+    transport = configured_transport(cfg)
+    cache = _open_civic_cache(cfg)
+    try:
+        snap = sync_snapshot(
+            genes=genes,
+            out_path=outp,
+            cache_dir=cfg.civic_cache_dir,
+            max_items_per_gene=max_items,
+            min_delay_s=min_delay_s,
+            transport=transport,
+            batch_size=batch_size,
+            cache=cache,
+            incremental=incremental,
+            resume=resume,
+            fmt=fmt,
+            jobs=jobs,
+            profile=profile or cfg.civic_query_profile,
+            encoding=encoding,
+        )
+    finally:
+        cache.close()
+    log_event(get_logger(), "civic.sync.transport", **transport.stats().as_dict())
     print(f"OK: wrote snapshot {outp}")
-    print(f"Genes: {', '.join(genes)}")
+    print(f"Genes: {', '.join(snap['genes'])}")
+    return 0
+
+def _open_civic_cache(cfg, backend: str | None = None):
+    return open_cache(
+        cfg.civic_cache_dir,
+        backend=backend or cfg.civic_cache_backend,
+        default_ttl_s=cfg.civic_cache_ttl_s,
+        max_bytes=cfg.civic_cache_max_bytes,
+        encoding=cfg.civic_cache_encoding,
+        negative_ttl_s=cfg.civic_negative_ttl_s,
+    )
+
+def cmd_civic_cache(action: str, backend: str | None, src: str | None, remove_source: bool) -> int:
+    cfg = load_config()
+    if action == "migrate":
+        src_dir = Path(src).resolve() if src else cfg.civic_cache_dir
+        dest = _open_civic_cache(cfg, backend or "sqlite")
+        if isinstance(dest, JsonFileCache):
+            raise SystemExit("migrate needs a non-JSON destination backend (e.g. --backend sqlite)")
+        n = migrate_json_cache(src_dir, dest, remove_source=remove_source)
+        result = {"migrated": n, "from": str(src_dir / "requests"), **dest.stats()}
+        dest.close()
+    else:
+        cache = _open_civic_cache(cfg, backend)
+        result = cache.prune() if action == "prune" else {}
+        result.update(cache.stats())
+        cache.close()
+    print(json.dumps(result, indent=2))
+    return 0
+
+def cmd_civic_misses(prefetch: bool, clear: bool, batch_size: int, jobs: int, min_delay_s: float) -> int:
+    cfg = load_config()
+    ledger = MissLedger.for_cache_dir(cfg.civic_cache_dir)
+    if clear:
+        ledger.clear()
+        print(json.dumps({"ledger": str(ledger.path), "cleared": True}, indent=2))
+        return 0
+
+    cache = _open_civic_cache(cfg)
+    result = {"ledger": str(ledger.path)}
+    if prefetch:
+        transport = configured_transport(cfg)
+        result["prefetch"] = prefetch_misses(
+            ledger, cache, transport, TokenBucket.from_min_delay(min_delay_s), batch_size=batch_size, jobs=jobs,
+        )
+        log_event(get_logger(), "civic.misses.prefetch", **result["prefetch"], **transport.stats().as_dict())
+
+    misses = ledger.summary()
+    for m in misses:
+        m["cached"] = cache.get(m["key"]) is not None
+        m.pop("variables", None)
+    cache.close()
+    result["keys"] = len(misses)
+    result["still_missing"] = sum(1 for m in misses if not m["cached"])
+    result["misses"] = misses
+    print(json.dumps(result, indent=2))
+    return 0
+
+def cmd_civic_serve(snapshot: str | None, from_cache: bool, host: str, port: int, faults: Faults) -> int:
+    cfg = load_config()
+    if snapshot:
+        data = StandinData.from_snapshot(Path(snapshot).resolve())
+    elif from_cache:
+        cache = _open_civic_cache(cfg)
+        data = StandinData.from_cache(cache)
+        cache.close()
+    else:
+        data = StandinData.from_snapshot(cfg.civic_snapshot_path)
+    server = StandinServer(data, host=host, port=port, faults=faults)
+    log_event(get_logger(), "civic.standin.start", endpoint=server.endpoint, genes=len(data.nodes_by_gene),
+              latency_s=faults.latency_s, error_rate=faults.error_rate, rate_429=faults.rate_429, max_rps=faults.max_rps)
+    print(f"Serving CIViC stand-in at {server.endpoint} (set TTRECON_CIVIC_ENDPOINT to use it)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        log_event(get_logger(), "civic.standin.stop", **server.stats())
+    return 0
+
+def cmd_serve(target: str, host: str, port: int, socket_path: str | None, jobs: int, defaults: dict,
+              roots: list[str] | None = None) -> int:
+    cfg = load_config()
+    server = RunServer(cfg, target=target, host=host, port=port,
+                       socket_path=Path(socket_path).resolve() if socket_path else None,
+                       jobs=jobs, defaults=defaults, roots=[Path(r) for r in roots] if roots else None)
+    log_event(get_logger(), "serve.start", endpoint=server.endpoint, targets=server.health()["targets"], jobs=jobs)
+    print(f"Serving TT-RECON at {server.endpoint} (POST /run, GET /health)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        log_event(get_logger(), "serve.stop", **server.health())
     return 0
 
 def cmd_run(case_path: Path, target: str, out_dir: Path,
             civic: bool, civic_mode: str | None, civic_source: str | None, civic_snapshot: str | None,
-            civic_claims: bool, civic_min_rating: float | None, civic_levels: str | None) -> int:
+            civic_claims: bool, civic_min_rating: float | None, civic_levels: str | None,
+            civic_jobs: int | None = None, target_jobs: int = 1, profile: bool = False,
+            incremental: bool = False, evidence_format: str | None = None,
+            compact_json: bool = False, gzip_evidence: bool = False) -> int:
     logger = get_logger()
-    cfg = load_config()
+    cfg = _output_config(load_config(), evidence_format, compact_json, gzip_evidence)
     cmode = (civic_mode or cfg.civic_mode or "strict").strip().lower()
     csrc = (civic_source or cfg.civic_source or "live").strip().lower()
     csnap = Path(civic_snapshot).resolve() if civic_snapshot else cfg.civic_snapshot_path
@@ -94,26 +222,109 @@ def cmd_run(case_path: Path, target: str, out_dir: Path,
         civic_claims=civic_claims,
         civic_min_rating=civic_min_rating,
         civic_levels=civic_levels,
+        civic_jobs=civic_jobs,
     )
 
-    manifest = run_pipeline(
+    with profile_to(out_dir) if profile else nullcontext():
+        if is_multi_target(target):
+            multi = run_targets(
+                cfg,
+                case_path=case_path,
+                targets=target,
+                out_dir=out_dir,
+                target_jobs=target_jobs,
+                civic=civic,
+                civic_mode=cmode,
+                civic_source=csrc,
+                civic_snapshot=csnap,
+                civic_claims=civic_claims,
+                civic_min_rating=civic_min_rating,
+                civic_levels=civic_levels,
+                civic_jobs=civic_jobs,
+                incremental=incremental or None,
+            )
+            log_event(logger, "run.done", run_id=multi.run_id, targets=multi.targets, outputs=multi.outputs)
+            print(f"OK: run_id={multi.run_id} targets={','.join(multi.targets)}")
+            for name in multi.targets:
+                print(f"Report: {out_dir / name / 'report.md'}")
+            return 0
+
+        manifest = run_pipeline(
+            cfg,
+            case_path=case_path,
+            target=target,
+            out_dir=out_dir,
+            civic=civic,
+            civic_mode=cmode,
+            civic_source=csrc,
+            civic_snapshot=csnap,
+            civic_claims=civic_claims,
+            civic_min_rating=civic_min_rating,
+            civic_levels=civic_levels,
+            civic_jobs=civic_jobs,
+            incremental=incremental or None,
+        )
+
+        log_event(logger, "run.done", run_id=manifest.run_id, outputs=manifest.outputs)
+        print(f"OK: run_id={manifest.run_id}")
+        print(f"Report: {out_dir / 'report.md'}")
+        return 0
+
+def cmd_run_batch(cases: str, target: str, out_dir: Path, workers: int,
+                  civic: bool, civic_mode: str | None, civic_source: str | None, civic_snapshot: str | None,
+                  civic_claims: bool, civic_min_rating: float | None, civic_levels: str | None,
+                  civic_jobs: int | None = None, incremental: bool = False,
+                  evidence_format: str | None = None, compact_json: bool = False,
+                  gzip_evidence: bool = False) -> int:
+    logger = get_logger()
+    cfg = _output_config(load_config(), evidence_format, compact_json, gzip_evidence)
+    log_event(logger, "batch.start", version=__version__, cases=cases, target=target, out=str(out_dir), workers=workers)
+    manifest = run_batch(
         cfg,
-        case_path=case_path,
+        cases,
         target=target,
         out_dir=out_dir,
+        workers=workers,
         civic=civic,
-        civic_mode=cmode,
-        civic_source=csrc,
-        civic_snapshot=csnap,
+        civic_mode=civic_mode,
+        civic_source=civic_source,
+        civic_snapshot=Path(civic_snapshot).resolve() if civic_snapshot else None,
         civic_claims=civic_claims,
         civic_min_rating=civic_min_rating,
         civic_levels=civic_levels,
+        civic_jobs=civic_jobs,
+        incremental=incremental or None,
     )
+    print(f"OK: {manifest.ok}/{manifest.total} cases ({manifest.failed} failed)")
+    print(f"Manifest: {out_dir / 'batch_manifest.json'}")
+    return 0 if manifest.failed == 0 else 1
 
-    log_event(logger, "run.done", run_id=manifest.run_id, outputs=manifest.outputs)
-    print(f"OK: run_id={manifest.run_id}")
-    print(f"Report: {out_dir / 'report.md'}")
-    return 0
+def _output_config(cfg, evidence_format: str | None, compact_json: bool, gzip_evidence: bool):
+    """Apply the output-format flags of `run` / `run-batch` over the environment's config."""
+    if evidence_format:
+        cfg = replace(cfg, evidence_format=evidence_format)
+    if compact_json:
+        cfg = replace(cfg, compact_json=True)
+    if gzip_evidence:
+        cfg = replace(cfg, evidence_gzip=True)
+    return cfg
+
+def _add_output_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--evidence-format", choices=["inline", "normalized"], default=None,
+                   help="normalized: write each CIViC node once to civic_nodes.jsonl and reference it from evidence.jsonl")
+    p.add_argument("--compact-json", action="store_true", help="Write JSON outputs without indentation")
+    p.add_argument("--gzip-evidence", action="store_true", help="Write evidence.jsonl.gz instead of evidence.jsonl")
+
+def _add_civic_run_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--civic", action="store_true", help="Enable CIViC enrichment")
+    p.add_argument("--civic-mode", choices=["strict", "loose"], default=None, help="CIViC matching mode")
+    p.add_argument("--civic-source", choices=["live", "cache", "snapshot"], default=None, help="Where CIViC data comes from")
+    p.add_argument("--civic-snapshot", type=str, default=None, help="Path to CIViC snapshot JSON (for snapshot mode)")
+    p.add_argument("--civic-jobs", type=int, default=None, help="Parallel CIViC queries (shared rate limit; output order is unchanged)")
+
+    p.add_argument("--civic-claims", action="store_true", help="Promote CIViC evidence items into structured Claims")
+    p.add_argument("--civic-min-rating", type=float, default=None, help="Minimum CIViC evidenceRating (0-5) for promotion")
+    p.add_argument("--civic-levels", type=str, default=None, help="Comma-separated allowlist of CIViC evidenceLevel (e.g., A,B)")
 
 def main() -> None:
     parser = argparse.ArgumentParser(prog="ttrecon", description="TT-RECON v0.5")
@@ -127,22 +338,71 @@ def main() -> None:
 
     p_run = sub.add_parser("run", help="Run TT-RECON")
     p_run.add_argument("--case", required=True, type=str, help="Path to case JSON")
-    p_run.add_argument("--target", required=True, type=str, help="Target pack name (e.g., EGFR)")
+    p_run.add_argument("--target", required=True, type=str,
+                       help="Target pack name (e.g., EGFR), a comma-separated list, or ALL")
+    p_run.add_argument("--target-jobs", type=int, default=1,
+                       help="Target packs to run concurrently when several are selected")
+    p_run.add_argument("--profile", action="store_true",
+                       help="Profile the run with cProfile; writes profile.pstats and profile.txt to --out")
+    p_run.add_argument("--incremental", action="store_true",
+                       help="Reuse unchanged stage outputs from the stage cache (deterministic run_id)")
     p_run.add_argument("--out", required=True, type=str, help="Output directory")
+    _add_output_args(p_run)
 
-    p_run.add_argument("--civic", action="store_true", help="Enable CIViC enrichment")
-    p_run.add_argument("--civic-mode", choices=["strict", "loose"], default=None, help="CIViC matching mode")
-    p_run.add_argument("--civic-source", choices=["live", "cache", "snapshot"], default=None, help="Where CIViC data comes from")
-    p_run.add_argument("--civic-snapshot", type=str, default=None, help="Path to CIViC snapshot JSON (for snapshot mode)")
-
-    p_run.add_argument("--civic-claims", action="store_true", help="Promote CIViC evidence items into structured Claims")
-    p_run.add_argument("--civic-min-rating", type=float, default=None, help="Minimum CIViC evidenceRating (0-5) for promotion")
-    p_run.add_argument("--civic-levels", type=str, default=None, help="Comma-separated allowlist of CIViC evidenceLevel (e.g., A,B)")
+    _add_civic_run_args(p_run)
 
     p_run.set_defaults(_fn=lambda a: cmd_run(
         Path(a.case), a.target, Path(a.out),
         a.civic, a.civic_mode, a.civic_source, a.civic_snapshot,
-        a.civic_claims, a.civic_min_rating, a.civic_levels
+        a.civic_claims, a.civic_min_rating, a.civic_levels,
+        a.civic_jobs, a.target_jobs, a.profile, a.incremental, a.evidence_format,
+        a.compact_json, a.gzip_evidence,
+    ))
+
+    p_batch = sub.add_parser("run-batch", help="Run many cases on a pool of warm worker processes")
+    p_batch.add_argument("--cases", required=True, type=str, help="Directory of case JSONs, a JSONL file (one case per line), a JSON array of cases, or a glob")
+    p_batch.add_argument("--target", required=True, type=str,
+                         help="Target pack name (e.g., EGFR), a comma-separated list, or ALL")
+    p_batch.add_argument("--out", required=True, type=str, help="Output directory (one subdirectory per case + batch_manifest.json)")
+    p_batch.add_argument("--workers", type=int, default=1, help="Worker processes")
+    p_batch.add_argument("--incremental", action="store_true",
+                         help="Reuse unchanged stage outputs from the stage cache (deterministic run_id)")
+    _add_output_args(p_batch)
+    _add_civic_run_args(p_batch)
+    p_batch.set_defaults(_fn=lambda a: cmd_run_batch(
+        a.cases, a.target, Path(a.out), a.workers,
+        a.civic, a.civic_mode, a.civic_source, a.civic_snapshot,
+        a.civic_claims, a.civic_min_rating, a.civic_levels,
+        a.civic_jobs, a.incremental, a.evidence_format, a.compact_json, a.gzip_evidence,
+    ))
+
+    p_serve = sub.add_parser("serve", help="Keep packs, templates and snapshots warm and run cases sent over HTTP")
+    p_serve.add_argument("--target", type=str, default="ALL",
+                         help="Packs to preload and the default target for requests (name, list or ALL)")
+    p_serve.add_argument("--host", type=str, default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8787)
+    p_serve.add_argument("--socket", type=str, default=None, help="Listen on this Unix socket instead of TCP")
+    p_serve.add_argument("--jobs", type=int, default=4, help="Runs executed concurrently")
+    p_serve.add_argument("--root", action="append", default=None,
+                         help="Directory that request paths (case_path, out, civic_snapshot) must be under; "
+                              "repeatable (default: the working directory)")
+    p_serve.add_argument("--incremental", action="store_true",
+                         help="Default requests to incremental mode (stage cache)")
+    _add_civic_run_args(p_serve)
+    p_serve.set_defaults(_fn=lambda a: cmd_serve(
+        a.target, a.host, a.port, a.socket, a.jobs,
+        {
+            "civic": a.civic or None,
+            "civic_mode": a.civic_mode,
+            "civic_source": a.civic_source,
+            "civic_snapshot": Path(a.civic_snapshot).resolve() if a.civic_snapshot else None,
+            "civic_claims": a.civic_claims or None,
+            "civic_min_rating": a.civic_min_rating,
+            "civic_levels": a.civic_levels,
+            "civic_jobs": a.civic_jobs,
+            "incremental": a.incremental or None,
+        },
+        a.root,
     ))
 
     p_pack = sub.add_parser("pack", help="Target pack utilities")
@@ -161,7 +421,49 @@ def main() -> None:
     p_sync.add_argument("--out", type=str, default=None, help="Output snapshot path (default: cache snapshots/civic_snapshot.json)")
     p_sync.add_argument("--max-items", type=int, default=500, help="Max evidence items per gene to store")
     p_sync.add_argument("--min-delay-s", type=float, default=0.35, help="Minimum delay between network calls (uncached)")
-    p_sync.set_defaults(_fn=lambda a: cmd_civic_sync(a.genes, a.genes_file, a.out, a.max_items, a.min_delay_s))
+    p_sync.add_argument("--batch-size", type=int, default=20, help="Gene lookups per batched GraphQL request (1 disables batching)")
+    p_sync.add_argument("--format", choices=["v1", "v2"], default="v1", help="Snapshot format: v1 (single JSON) or v2 (indexed, memory-mappable)")
+    p_sync.add_argument("--incremental", action="store_true", help="Start from the existing snapshot at --out; refetch only genes whose CIViC totalCount changed")
+    p_sync.add_argument("--resume", action="store_true", help="Continue an interrupted sync from its checkpoint")
+    p_sync.add_argument("--jobs", type=int, default=1, help="Genes paged concurrently (shared rate limit; snapshot content is unchanged)")
+    p_sync.add_argument("--profile", choices=list(QUERY_PROFILES), default=None, help="Evidence fields to fetch (default: TTRECON_CIVIC_QUERY_PROFILE or full)")
+    p_sync.add_argument("--encoding", choices=list(ENCODINGS), default="json", help="On-disk encoding: json (indented), compact, gzip or zstd (v2: per-block compression)")
+    p_sync.set_defaults(_fn=lambda a: cmd_civic_sync(
+        a.genes, a.genes_file, a.out, a.max_items, a.min_delay_s, a.batch_size, a.format,
+        a.incremental, a.resume, a.jobs, a.profile, a.encoding,
+    ))
+
+    p_cache = civic_sub.add_parser("cache", help="Inspect or maintain the CIViC request cache")
+    p_cache.add_argument("action", choices=["stats", "prune", "migrate"], help="stats | prune (drop expired, enforce size cap) | migrate (import JSON-file cache)")
+    p_cache.add_argument("--backend", choices=["json", "sqlite"], default=None, help="Cache backend (default: TTRECON_CIVIC_CACHE_BACKEND; migrate defaults to sqlite)")
+    p_cache.add_argument("--from", dest="src", type=str, default=None, help="migrate: CIViC cache dir holding requests/*.json (default: configured cache dir)")
+    p_cache.add_argument("--remove-source", action="store_true", help="migrate: delete JSON files after importing them")
+    p_cache.set_defaults(_fn=lambda a: cmd_civic_cache(a.action, a.backend, a.src, a.remove_source))
+
+    p_misses = civic_sub.add_parser("misses", help="Report request-cache misses recorded by cache-only runs")
+    p_misses.add_argument("--prefetch", action="store_true", help="Fetch every missing lookup (batched) and drop resolved entries from the ledger")
+    p_misses.add_argument("--clear", action="store_true", help="Delete the miss ledger")
+    p_misses.add_argument("--batch-size", type=int, default=20, help="Lookups per batched GraphQL request when prefetching")
+    p_misses.add_argument("--jobs", type=int, default=1, help="Concurrent batched requests when prefetching (shared rate limit)")
+    p_misses.add_argument("--min-delay-s", type=float, default=0.35, help="Minimum delay between network calls when prefetching")
+    p_misses.set_defaults(_fn=lambda a: cmd_civic_misses(a.prefetch, a.clear, a.batch_size, a.jobs, a.min_delay_s))
+
+    p_serve = civic_sub.add_parser("serve", help="Run a local CIViC GraphQL stand-in (for offline load/regression testing)")
+    p_serve.add_argument("--snapshot", type=str, default=None, help="Serve evidence from this snapshot (default: TTRECON_CIVIC_SNAPSHOT)")
+    p_serve.add_argument("--from-cache", action="store_true", help="Serve every evidence item found in the request cache instead")
+    p_serve.add_argument("--host", type=str, default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--latency-ms", type=float, default=0.0, help="Added latency per request")
+    p_serve.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random latency per request")
+    p_serve.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    p_serve.add_argument("--rate-429", type=float, default=0.0, help="Fraction of requests answered with 429")
+    p_serve.add_argument("--max-rps", type=float, default=0.0, help="Answer 429 above this many requests per second (0: off)")
+    p_serve.add_argument("--retry-after-s", type=float, default=1.0, help="Retry-After sent with 429s")
+    p_serve.add_argument("--seed", type=int, default=0, help="Seed for injected faults")
+    p_serve.set_defaults(_fn=lambda a: cmd_civic_serve(a.snapshot, a.from_cache, a.host, a.port, Faults(
+        latency_s=a.latency_ms / 1000.0, jitter_s=a.jitter_ms / 1000.0, error_rate=a.error_rate, rate_429=a.rate_429,
+        max_rps=a.max_rps, retry_after_s=a.retry_after_s, seed=a.seed,
+    )))
 
     args = parser.parse_args()
     raise SystemExit(args._fn(args))
@@ -2,6 +2,8 @@ import os
 from dataclasses import dataclass
 from pathlib import Path
 
+from ttrecon.connectors.civic.util import CIVIC_GQL_ENDPOINT
+
 @dataclass(frozen=True)
 class TTReconConfig:
     cache_dir: Path
@@ -19,6 +21,26 @@ class TTReconConfig:
     civic_claims_min_rating: float
     civic_claims_levels: str  # comma-separated, empty means allow all
 
+    civic_jobs: int = 1
+    civic_rate_per_s: float = 0.0  # 0 means derive from civic_min_delay_s
+    civic_burst: int = 1
+    civic_max_retries: int = 4
+    civic_timeout_s: float = 30.0
+    civic_batch_size: int = 20  # lookups per batched GraphQL request; <=1 disables batching
+    civic_cache_backend: str = "json"  # json|sqlite
+    civic_cache_ttl_s: float = 0.0  # 0 means entries never expire
+    civic_cache_max_bytes: int = 0  # sqlite only; 0 means unbounded
+    civic_query_profile: str = "full"  # minimal|claims|full
+    civic_cache_encoding: str = "json"  # json|compact|gzip|zstd (json backend only)
+    civic_negative_ttl_s: float = 0.0  # TTL for zero-node responses; 0 means use civic_cache_ttl_s
+    civic_endpoint: str = CIVIC_GQL_ENDPOINT  # e.g. a local `ttrecon civic serve` stand-in
+
+    incremental: bool = False  # reuse unchanged stage outputs from the stage cache
+    stage_cache_dir: Path | None = None  # None means <cache_dir>/stages
+    evidence_format: str = "inline"  # inline|normalized (CIViC nodes once, in civic_nodes.jsonl)
+    compact_json: bool = False  # JSON outputs without indentation/spaces
+    evidence_gzip: bool = False  # write evidence.jsonl.gz (and civic_nodes.jsonl.gz) instead
+
 def _env_bool(name: str, default: str = "0") -> bool:
     v = os.getenv(name, default).strip().lower()
     return v in ("1", "true", "yes", "y", "on")
@@ -51,6 +73,26 @@ def load_config() -> TTReconConfig:
     civic_claims_min_rating = _env_float("TTRECON_CIVIC_CLAIMS_MIN_RATING", "0")
     civic_claims_levels = os.getenv("TTRECON_CIVIC_CLAIMS_LEVELS", "").strip()
 
+    civic_jobs = _env_int("TTRECON_CIVIC_JOBS", "1")
+    civic_rate_per_s = _env_float("TTRECON_CIVIC_RATE_PER_S", "0")
+    civic_burst = _env_int("TTRECON_CIVIC_BURST", "1")
+    civic_max_retries = _env_int("TTRECON_CIVIC_MAX_RETRIES", "4")
+    civic_timeout_s = _env_float("TTRECON_CIVIC_TIMEOUT_S", "30")
+    civic_batch_size = _env_int("TTRECON_CIVIC_BATCH_SIZE", "20")
+    civic_cache_backend = os.getenv("TTRECON_CIVIC_CACHE_BACKEND", "json").strip().lower()
+    civic_cache_ttl_s = _env_float("TTRECON_CIVIC_CACHE_TTL_S", "0")
+    civic_cache_max_bytes = int(_env_float("TTRECON_CIVIC_CACHE_MAX_MB", "0") * 1024 * 1024)
+    civic_query_profile = os.getenv("TTRECON_CIVIC_QUERY_PROFILE", "full").strip().lower()
+    civic_cache_encoding = os.getenv("TTRECON_CIVIC_CACHE_ENCODING", "json").strip().lower()
+    civic_negative_ttl_s = _env_float("TTRECON_CIVIC_NEGATIVE_TTL_S", "0")
+    civic_endpoint = os.getenv("TTRECON_CIVIC_ENDPOINT", CIVIC_GQL_ENDPOINT).strip() or CIVIC_GQL_ENDPOINT
+
+    incremental = _env_bool("TTRECON_INCREMENTAL", "0")
+    stage_cache_dir = Path(os.getenv("TTRECON_STAGE_CACHE_DIR", str(cache_dir / "stages"))).resolve()
+    evidence_format = os.getenv("TTRECON_EVIDENCE_FORMAT", "inline").strip().lower()
+    compact_json = _env_bool("TTRECON_COMPACT_JSON", "0")
+    evidence_gzip = _env_bool("TTRECON_EVIDENCE_GZIP", "0")
+
     return TTReconConfig(
         cache_dir=cache_dir,
         targets_dir=targets_dir,
@@ -64,4 +106,22 @@ def load_config() -> TTReconConfig:
         civic_claims_enabled=civic_claims_enabled,
         civic_claims_min_rating=civic_claims_min_rating,
         civic_claims_levels=civic_claims_levels,
+        civic_jobs=civic_jobs,
+        civic_rate_per_s=civic_rate_per_s,
+        civic_burst=civic_burst,
+        civic_max_retries=civic_max_retries,
+        civic_timeout_s=civic_timeout_s,
+        civic_batch_size=civic_batch_size,
+        civic_cache_backend=civic_cache_backend,
+        civic_cache_ttl_s=civic_cache_ttl_s,
+        civic_cache_max_bytes=civic_cache_max_bytes,
+        civic_query_profile=civic_query_profile,
+        civic_cache_encoding=civic_cache_encoding,
+        civic_negative_ttl_s=civic_negative_ttl_s,
+        civic_endpoint=civic_endpoint,
+        incremental=incremental,
+        stage_cache_dir=stage_cache_dir,
+        evidence_format=evidence_format,
+        compact_json=compact_json,
+        evidence_gzip=evidence_gzip,
     )
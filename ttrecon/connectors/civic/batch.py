@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import requests
+
+from ttrecon.connectors.civic.cache import CacheBackend
+from ttrecon.connectors.civic.graphql import (
+    build_batched_evidence_query,
+    evidence_items_query,
+    evidence_items_variables,
+    split_batched_response,
+)
+from ttrecon.connectors.civic.ratelimit import TokenBucket
+from ttrecon.connectors.civic.transport import CivicTransport
+from ttrecon.connectors.civic.util import post_graphql, hash_request
+from ttrecon.logging import get_logger, log_event
+
+def _post_chunk(
+    chunk: List[Tuple[str, Dict[str, Any]]],
+    cache: CacheBackend,
+    transport: CivicTransport,
+    limiter: TokenBucket,
+    profile: str = "full",
+    fetched: Optional[Set[str]] = None,
+) -> int:
+    """Fetch one batch of uncached pages and store each under its own cache key (added to `fetched`)."""
+    query, variables = build_batched_evidence_query([v for _, v in chunk], profile=profile)
+    limiter.acquire()
+    try:
+        data = post_graphql(query, variables, transport=transport)
+    except (requests.RequestException, ValueError) as e:
+        # Leave these pages uncached; the per-query path refetches them and
+        # reports any error the way it always has.
+        log_event(get_logger(), "civic.batch.failed", size=len(chunk), error=str(e))
+        return 0
+
+    saved = 0
+    cached_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    for (key, v), res in zip(chunk, split_batched_response(data, len(chunk))):
+        if res.get("errors") or res["data"]["evidenceItems"] is None:
+            continue
+        cache.put(key, res, {
+            "endpoint": transport.endpoint,
+            "variables": v,
+            "cached_at_utc": cached_at,
+            "batched": True,
+        })
+        if fetched is not None:
+            fetched.add(key)
+        saved += 1
+    return saved
+
+def prefetch_evidence_pages(
+    seeds: List[Tuple[str, Optional[str]]],
+    cache: CacheBackend,
+    transport: CivicTransport,
+    limiter: TokenBucket,
+    page_size: int,
+    max_items: int,
+    batch_size: int = 20,
+    jobs: int = 1,
+    profile: str = "full",
+    fetched: Optional[Set[str]] = None,
+    on_pages: Optional[Callable[[int], None]] = None,
+) -> Dict[str, int]:
+    """Warm the request cache for every page the per-query loops will ask for.
+
+    Each seed is a (geneName, variantName) lookup. Pages are fetched in waves:
+    wave k holds page k of every lookup that still has one, and its uncached
+    pages are sent `batch_size` at a time as aliased GraphQL documents. Pages
+    are stored under the same `hash_request(evidence_items_query(profile), ...)`
+    keys the sequential loops use, so those loops then run entirely from cache.
+    The keys of pages fetched from the network are added to `fetched`, and
+    `on_pages(n)` is called after each batch with the pages it stored.
+    """
+    stats = {"requests": 0, "pages": 0}
+    if batch_size <= 1:
+        return stats
+    single_query = evidence_items_query(profile)
+
+    states: List[Dict[str, Any]] = []
+    seen = set()
+    for gene, variant in seeds:
+        if (gene, variant) in seen:
+            continue
+        seen.add((gene, variant))
+        states.append({"gene": gene, "variant": variant, "after": None, "fetched": 0})
+
+    while states:
+        wave: List[Tuple[Dict[str, Any], str]] = []
+        missing: Dict[str, Dict[str, Any]] = {}
+        for st in states:
+            first = min(page_size, max_items - st["fetched"])
+            v = evidence_items_variables(st["gene"], st["variant"], st["after"], first)
+            key = hash_request(single_query, v)
+            wave.append((st, key))
+            if key not in missing and cache.get(key) is None:
+                missing[key] = v
+
+        items = list(missing.items())
+        chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+        stats["requests"] += len(chunks)
+        def post(chunk: List[Tuple[str, Dict[str, Any]]]) -> int:
+            n = _post_chunk(chunk, cache, transport, limiter, profile, fetched)
+            if on_pages is not None:
+                on_pages(n)
+            return n
+
+        if jobs > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="civic-batch") as pool:
+                saved = list(pool.map(post, chunks))
+        else:
+            saved = [post(c) for c in chunks]
+        stats["pages"] += sum(saved)
+
+        next_states: List[Dict[str, Any]] = []
+        for st, key in wave:
+            data = cache.get(key)
+            if data is None or data.get("errors"):
+                continue
+            conn = (((data.get("data") or {}).get("evidenceItems")) or {})
+            nodes = conn.get("nodes") or []
+            page_info = conn.get("pageInfo") or {}
+            st["after"] = page_info.get("endCursor")
+            st["fetched"] += len(nodes)
+            if page_info.get("hasNextPage") and nodes and st["fetched"] < max_items:
+                next_states.append(st)
+        states = next_states
+
+    return stats
+
+def probe_total_counts(
+    genes: List[str],
+    transport: CivicTransport,
+    limiter: TokenBucket,
+    batch_size: int = 20,
+) -> Dict[str, Optional[int]]:
+    """Fetch each gene's current accepted `totalCount` from CIViC, bypassing the cache.
+
+    Genes are probed `batch_size` at a time with one-node `minimal` pages. A gene whose
+    probe fails maps to None (callers treat that as "changed").
+    """
+    out: Dict[str, Optional[int]] = {g: None for g in genes}
+    size = max(1, batch_size)
+    for i in range(0, len(genes), size):
+        chunk = genes[i:i + size]
+        query, variables = build_batched_evidence_query(
+            [evidence_items_variables(g, None, None, 1) for g in chunk], profile="minimal",
+        )
+        limiter.acquire()
+        try:
+            data = post_graphql(query, variables, transport=transport)
+        except (requests.RequestException, ValueError) as e:
+            log_event(get_logger(), "civic.probe.failed", size=len(chunk), error=str(e))
+            continue
+        for gene, res in zip(chunk, split_batched_response(data, len(chunk))):
+            conn = res["data"]["evidenceItems"]
+            if res.get("errors") or not conn or conn.get("totalCount") is None:
+                continue
+            out[gene] = int(conn["totalCount"])
+    return out
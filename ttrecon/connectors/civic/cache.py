@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ttrecon.connectors.civic import codec
+from ttrecon.connectors.civic.util import cache_paths, load_cache, save_cache
+
+CACHE_BACKENDS = ("json", "sqlite")
+
+_DATA_SUFFIXES = (".json", ".json.gz", ".json.zst")
+
+def is_negative_response(data: Dict[str, Any]) -> bool:
+    """True for an error-free evidenceItems response with no nodes on it."""
+    if data.get("errors"):
+        return False
+    conn = (data.get("data") or {}).get("evidenceItems")
+    return isinstance(conn, dict) and not conn.get("nodes")
+
+class CacheBackend(ABC):
+    """Request cache keyed by `hash_request` digests.
+
+    Empty evidenceItems responses ("negative" entries) expire after
+    `negative_ttl_s` when it is set, instead of `default_ttl_s`.
+    """
+
+    name: str = ""
+    default_ttl_s: float = 0.0
+    negative_ttl_s: float = 0.0
+
+    def _entry_ttl(self, data: Dict[str, Any], meta: Dict[str, Any],
+                   ttl_s: Optional[float]) -> Tuple[Optional[float], Dict[str, Any]]:
+        """(ttl, meta) for a new entry; negative entries are flagged in meta."""
+        if not is_negative_response(data):
+            return (self.default_ttl_s if ttl_s is None else ttl_s), meta
+        meta = {**meta, "negative": True}
+        if ttl_s is None:
+            ttl_s = self.negative_ttl_s or self.default_ttl_s
+        return ttl_s, meta
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put(self, key: str, data: Dict[str, Any], meta: Dict[str, Any], ttl_s: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def describe(self, key: str) -> str:
+        """Human-readable location of `key` (used as Evidence.ref for cache misses)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        """Yield (key, data, meta) for every live entry."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def prune(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Attribute the lookups and writes made inside the block to `name` (see `CountingCache`)."""
+        yield
+
+    def close(self) -> None:
+        pass
+
+def _expires_at(ttl_s: Optional[float]) -> Optional[float]:
+    return (time.time() + ttl_s) if ttl_s and ttl_s > 0 else None
+
+class JsonFileCache(CacheBackend):
+    """Legacy layout: `<cache_dir>/requests/<key>.json` + `<key>.meta.json`.
+
+    Per-entry TTLs are recorded as `expires_at` (epoch seconds) in the meta
+    file; entries written before TTLs existed never expire. `encoding`
+    (see `codec.ENCODINGS`) controls how new entries are written: `json`
+    keeps the original indented files, `compact` drops indentation, and
+    `gzip`/`zstd` write `<key>.json.gz`/`<key>.json.zst`. Entries in any
+    encoding are read back, so the setting can change without a cold cache.
+    """
+
+    name = "json"
+
+    def __init__(self, cache_dir: Path, default_ttl_s: float = 0.0, encoding: str = "json",
+                 negative_ttl_s: float = 0.0) -> None:
+        self.cache_dir = cache_dir
+        self.default_ttl_s = default_ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.encoding = codec.check_encoding(encoding)
+
+    def _expired(self, meta_path: Path) -> bool:
+        meta = load_cache(meta_path) or {}
+        exp = meta.get("expires_at")
+        return exp is not None and float(exp) <= time.time()
+
+    def _data_paths(self, key: str) -> List[Path]:
+        """Candidate data files for `key`, the configured encoding first."""
+        req_dir = self.cache_dir / "requests"
+        suffixes = [codec.suffix(self.encoding)] + [s for s in _DATA_SUFFIXES if s != codec.suffix(self.encoding)]
+        return [req_dir / f"{key}{s}" for s in suffixes]
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return codec.loads(path.read_bytes())
+        except Exception:
+            return None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        _, cache_meta = cache_paths(self.cache_dir, key)
+        for p in self._data_paths(key):
+            if p.exists():
+                data = self._read(p)
+                if data is None or self._expired(cache_meta):
+                    return None
+                return data
+        return None
+
+    def put(self, key: str, data: Dict[str, Any], meta: Dict[str, Any], ttl_s: Optional[float] = None) -> None:
+        cache_json, cache_meta = cache_paths(self.cache_dir, key)
+        ttl_s, meta = self._entry_ttl(data, meta, ttl_s)
+        exp = _expires_at(ttl_s)
+        if exp is not None:
+            meta = {**meta, "expires_at": exp}
+        if self.encoding == "json":
+            save_cache(cache_json, cache_meta, data, meta)
+        else:
+            target, *stale = self._data_paths(key)
+            target.write_bytes(codec.dumps(data, self.encoding))
+            cache_meta.write_text(codec.dumps_text(meta, "compact"), encoding="utf-8")
+            for p in stale:
+                p.unlink(missing_ok=True)
+
+    def describe(self, key: str) -> str:
+        return str(self._data_paths(key)[0])
+
+    def _files(self) -> Iterator[Tuple[str, Path]]:
+        req_dir = self.cache_dir / "requests"
+        if not req_dir.exists():
+            return
+        seen = set()
+        for p in sorted(req_dir.iterdir()):
+            name = p.name
+            if name.endswith(".meta.json") or ".json" not in name or not name.endswith(_DATA_SUFFIXES):
+                continue
+            key = name[:name.index(".json")]
+            if key not in seen:
+                seen.add(key)
+                yield key, p
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        for key, p in self._files():
+            meta_path = p.with_name(f"{key}.meta.json")
+            if self._expired(meta_path):
+                continue
+            data = self.get(key)
+            if data is not None:
+                yield key, data, load_cache(meta_path) or {}
+
+    def stats(self) -> Dict[str, Any]:
+        entries = 0
+        size = 0
+        expired = 0
+        for key, p in self._files():
+            entries += 1
+            meta_path = p.with_name(f"{key}.meta.json")
+            size += p.stat().st_size + (meta_path.stat().st_size if meta_path.exists() else 0)
+            if self._expired(meta_path):
+                expired += 1
+        return {"backend": self.name, "path": str(self.cache_dir / "requests"), "encoding": self.encoding,
+                "entries": entries, "bytes": size, "expired": expired}
+
+    def remove(self, key: str) -> None:
+        for p in self._data_paths(key):
+            p.unlink(missing_ok=True)
+        cache_paths(self.cache_dir, key)[1].unlink(missing_ok=True)
+
+    def prune(self) -> Dict[str, Any]:
+        removed = 0
+        for key, p in list(self._files()):
+            if self._expired(p.with_name(f"{key}.meta.json")):
+                self.remove(key)
+                removed += 1
+        return {"expired_removed": removed, "evicted": 0}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+  key TEXT PRIMARY KEY,
+  data BLOB NOT NULL,
+  meta TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  created REAL NOT NULL,
+  accessed REAL NOT NULL,
+  expires REAL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed);
+CREATE INDEX IF NOT EXISTS entries_expires ON entries(expires);
+"""
+
+class SqliteCache(CacheBackend):
+    """Single-file request cache: zlib-compressed compact JSON in SQLite.
+
+    Entries carry an optional expiry (per-entry `ttl_s`, else `default_ttl_s`)
+    and a last-access time; when `max_bytes` is set, least recently used
+    entries are evicted once the stored payload size exceeds it.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: Path, default_ttl_s: float = 0.0, max_bytes: int = 0, negative_ttl_s: float = 0.0) -> None:
+        self.path = path
+        self.default_ttl_s = default_ttl_s
+        self.negative_ttl_s = negative_ttl_s
+        self.max_bytes = max(0, int(max_bytes))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._total = self._sum_size()
+
+    def _sum_size(self) -> int:
+        return int(self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0])
+
+    @staticmethod
+    def _encode(data: Dict[str, Any]) -> bytes:
+        return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(blob: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT data, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= now:
+                self._delete(key)
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        try:
+            return self._decode(row[0])
+        except Exception:
+            return None
+
+    def _delete(self, key: str) -> None:
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._total -= int(row[0])
+
+    def put(self, key: str, data: Dict[str, Any], meta: Dict[str, Any], ttl_s: Optional[float] = None) -> None:
+        blob = self._encode(data)
+        now = time.time()
+        ttl_s, meta = self._entry_ttl(data, meta, ttl_s)
+        exp = _expires_at(ttl_s)
+        with self._lock:
+            self._delete(key)
+            self._conn.execute(
+                "INSERT INTO entries(key, data, meta, size, created, accessed, expires) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, blob, json.dumps(meta, ensure_ascii=False), len(blob), now, now, exp),
+            )
+            self._total += len(blob)
+            if self.max_bytes and self._total > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> int:
+        """Drop least recently used entries until under 90% of max_bytes (lock held)."""
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        while self._total > target:
+            rows = self._conn.execute("SELECT key, size FROM entries ORDER BY accessed LIMIT 256").fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._total -= int(size)
+                evicted += 1
+                if self._total <= target:
+                    break
+        return evicted
+
+    def describe(self, key: str) -> str:
+        return f"{self.path}#{key}"
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, data, meta FROM entries WHERE expires IS NULL OR expires > ? ORDER BY key", (now,)
+            ).fetchall()
+        for key, blob, meta in rows:
+            yield key, self._decode(blob), json.loads(meta)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            expired = self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,)
+            ).fetchone()[0]
+        file_bytes = self.path.stat().st_size if self.path.exists() else 0
+        return {
+            "backend": self.name,
+            "path": str(self.path),
+            "entries": int(entries),
+            "bytes": int(size),
+            "file_bytes": file_bytes,
+            "expired": int(expired),
+            "max_bytes": self.max_bytes,
+        }
+
+    def prune(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,)
+            ).rowcount
+            self._total = self._sum_size()
+            evicted = self._evict() if self.max_bytes and self._total > self.max_bytes else 0
+            self._conn.execute("VACUUM")
+        return {"expired_removed": int(removed), "evicted": evicted}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+class CountingCache(CacheBackend):
+    """Wraps a backend and counts lookups (hits/misses) and writes; everything else is delegated.
+
+    Counts go to `cache_hits`/`cache_misses`/`cache_puts`, except inside a
+    `phase(name)` block, where they go to `<name>_hits`/`<name>_misses`/`<name>_puts`.
+    """
+
+    def __init__(self, inner: CacheBackend) -> None:
+        self.inner = inner
+        self.name = inner.name
+        self.default_ttl_s = inner.default_ttl_s
+        self.negative_ttl_s = inner.negative_ttl_s
+        self._lock = threading.Lock()
+        self._prefix = "cache"
+        self._counts: Dict[str, int] = {"cache_hits": 0, "cache_misses": 0, "cache_puts": 0}
+
+    def _count(self, what: str) -> None:
+        with self._lock:
+            key = f"{self._prefix}_{what}"
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self.inner.get(key)
+        self._count("misses" if data is None else "hits")
+        return data
+
+    def put(self, key: str, data: Dict[str, Any], meta: Dict[str, Any], ttl_s: Optional[float] = None) -> None:
+        self.inner.put(key, data, meta, ttl_s=ttl_s)
+        self._count("puts")
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        # The prefix is shared by all threads: phases must not overlap other lookups.
+        with self._lock:
+            prev, self._prefix = self._prefix, name
+            for what in ("hits", "misses", "puts"):
+                self._counts.setdefault(f"{name}_{what}", 0)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._prefix = prev
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def describe(self, key: str) -> str:
+        return self.inner.describe(key)
+
+    def items(self) -> Iterator[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+        return self.inner.items()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.inner.stats()
+
+    def prune(self) -> Dict[str, Any]:
+        return self.inner.prune()
+
+    def close(self) -> None:
+        self.inner.close()
+
+def open_cache(cache_dir: Path, backend: str = "json", default_ttl_s: float = 0.0, max_bytes: int = 0,
+               encoding: str = "json", negative_ttl_s: float = 0.0) -> CacheBackend:
+    """Open the request cache under `cache_dir`; `encoding` applies to the json backend (sqlite is always compressed)."""
+    backend = (backend or "json").strip().lower()
+    if backend == "sqlite":
+        return SqliteCache(cache_dir / "requests.sqlite", default_ttl_s=default_ttl_s, max_bytes=max_bytes,
+                           negative_ttl_s=negative_ttl_s)
+    if backend == "json":
+        return JsonFileCache(cache_dir, default_ttl_s=default_ttl_s, encoding=encoding, negative_ttl_s=negative_ttl_s)
+    raise ValueError(f"Unknown CIViC cache backend '{backend}'. Expected one of {CACHE_BACKENDS}")
+
+def migrate_json_cache(src_dir: Path, dest: CacheBackend, remove_source: bool = False) -> int:
+    """Copy every entry of a JSON-file cache into `dest`, keeping its original keys."""
+    src = JsonFileCache(src_dir)
+    n = 0
+    for key, data, meta in src.items():
+        exp = meta.get("expires_at")
+        ttl = (float(exp) - time.time()) if exp is not None else 0.0
+        dest.put(key, data, meta, ttl_s=ttl)
+        if remove_source:
+            src.remove(key)
+        n += 1
+    return n
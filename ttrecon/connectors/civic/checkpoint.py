@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CHECKPOINT_SCHEMA = "civic_sync_checkpoint_v1"
+
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]")
+
+def _atomic_write_json(path: Path, obj: Any) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+class SyncCheckpoint:
+    """On-disk progress of a `civic sync` so an interrupted build can resume.
+
+    `<out>.checkpoint.json` holds per-gene status ("partial" or "done") and
+    paging cursors. A gene being paged appends each page's nodes to
+    `<out>.parts/<GENE>.partial.jsonl` (one node per line, so a page costs
+    its own size); a finished gene's bucket is `<out>.parts/<GENE>.json`.
+    Both are removed once the snapshot has been written. Only syncs run with
+    `resume` write checkpoints (`enabled`). Safe to update from several sync
+    workers at once.
+    """
+
+    def __init__(self, out_path: Path, genes: List[str], max_items: int, profile: str = "full",
+                 enabled: bool = True) -> None:
+        self.path = out_path.with_name(out_path.name + ".checkpoint.json")
+        self.parts_dir = out_path.with_name(out_path.name + ".parts")
+        self.genes = list(genes)
+        self.max_items = max_items
+        self.profile = profile
+        self.enabled = enabled
+        self.status: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, out_path: Path, genes: List[str], max_items: int, resume: bool,
+             profile: str = "full") -> "SyncCheckpoint":
+        """Start a checkpoint, picking up an existing one when `resume` is set and it matches this sync."""
+        cp = cls(out_path, genes, max_items, profile=profile, enabled=resume)
+        if resume and cp.path.exists():
+            try:
+                state = json.loads(cp.path.read_text(encoding="utf-8"))
+            except Exception:
+                state = {}
+            if (
+                state.get("schema") == CHECKPOINT_SCHEMA
+                and state.get("genes") == cp.genes
+                and state.get("max_items") == max_items
+                and state.get("profile", "full") == profile
+            ):
+                cp.status = state.get("status") or {}
+                return cp
+        cp.discard()
+        return cp
+
+    def _part(self, gene: str) -> Path:
+        return self.parts_dir / f"{_UNSAFE.sub('_', gene)}.json"
+
+    def _partial_nodes(self, gene: str) -> Path:
+        return self.parts_dir / f"{_UNSAFE.sub('_', gene)}.partial.jsonl"
+
+    def _set(self, gene: str, st: Dict[str, Any]) -> None:
+        with self._lock:
+            self.status[gene] = st
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _atomic_write_json(self.path, {
+                "schema": CHECKPOINT_SCHEMA,
+                "genes": self.genes,
+                "max_items": self.max_items,
+                "profile": self.profile,
+                "status": self.status,
+            })
+
+    def _load_part(self, gene: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._part(gene).read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def is_done(self, gene: str) -> bool:
+        return (self.status.get(gene) or {}).get("state") == "done"
+
+    def completed(self, gene: str) -> Optional[Dict[str, Any]]:
+        """The finished bucket for `gene`, if a previous attempt completed it."""
+        if not self.is_done(gene):
+            return None
+        return self._load_part(gene)
+
+    def partial(self, gene: str) -> Optional[Dict[str, Any]]:
+        """{"nodes", "after", "fetched", "total_count"} for a gene interrupted mid-paging."""
+        st = self.status.get(gene) or {}
+        if st.get("state") != "partial":
+            return None
+        # Only the first `fetched` lines are committed; anything after them is an
+        # interrupted append and is cut off so the next page lines up.
+        want = int(st.get("fetched") or 0)
+        nodes: List[Dict[str, Any]] = []
+        try:
+            with self._partial_nodes(gene).open("r+b") as f:
+                end = 0
+                while len(nodes) < want:
+                    line = f.readline()
+                    if not line.endswith(b"\n"):
+                        return None
+                    nodes.append(json.loads(line))
+                    end += len(line)
+                f.truncate(end)
+        except Exception:
+            return None
+        return {**st, "nodes": nodes}
+
+    def save_partial(self, gene: str, page: List[Dict[str, Any]], after: Optional[str], fetched: int,
+                     total_count: Optional[int]) -> None:
+        """Record one more page of `gene` (`page` holds its nodes; `fetched` counts all nodes so far)."""
+        if not self.enabled:
+            return
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        mode = "w" if fetched == len(page) else "a"  # a gene's first page starts the file afresh
+        with self._partial_nodes(gene).open(mode, encoding="utf-8") as f:
+            for node in page:
+                f.write(json.dumps(node, ensure_ascii=False, separators=(",", ":")) + "\n")
+        self._set(gene, {"state": "partial", "after": after, "fetched": fetched, "total_count": total_count})
+
+    def save_done(self, gene: str, bucket: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        self.parts_dir.mkdir(parents=True, exist_ok=True)
+        _atomic_write_json(self._part(gene), bucket)
+        self._set(gene, {"state": "done"})
+        self._partial_nodes(gene).unlink(missing_ok=True)
+
+    def discard(self) -> None:
+        self.status = {}
+        self.path.unlink(missing_ok=True)
+        shutil.rmtree(self.parts_dir, ignore_errors=True)
@@ -1,23 +1,29 @@
 from __future__ import annotations
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
 from ttrecon.core.ids import stable_id, IDPrefixes
-from ttrecon.core.models import Case, Evidence
-from ttrecon.connectors.civic.graphql import EVIDENCE_ITEMS_QUERY
-from ttrecon.connectors.civic.snapshot import load_snapshot
+from ttrecon.core.models import Alteration, Case, Evidence
+from ttrecon.connectors.civic.batch import prefetch_evidence_pages
+from ttrecon.connectors.civic.cache import CacheBackend, JsonFileCache
+from ttrecon.connectors.civic.graphql import check_profile, evidence_items_query, evidence_items_variables
+from ttrecon.connectors.civic.intern import NodeInterner, default_node_interner
+from ttrecon.connectors.civic.misses import MissLedger
+from ttrecon.connectors.civic.ratelimit import TokenBucket
+from ttrecon.connectors.civic.registry import SnapshotRegistry, default_snapshot_registry
+from ttrecon.connectors.civic.snapshot import SnapshotV1, SnapshotV2
+from ttrecon.connectors.civic.transport import CivicTransport, configured_transport
 from ttrecon.connectors.civic.util import (
-    CIVIC_GQL_ENDPOINT,
     post_graphql,
     hash_request,
-    cache_paths,
-    load_cache,
-    save_cache,
     evidence_link,
 )
 
+PAGE_SIZE = 25
+
 def _normalize_variant_query(alt: Dict[str, Any]) -> Optional[str]:
     pc = (alt.get("protein_change") or "").strip()
     if pc:
@@ -39,32 +45,48 @@ def civic_enrich_from_snapshot(
     snapshot_path: Path,
     mode: str = "strict",
     max_items: int = 50,
+    snapshot: "SnapshotV1 | SnapshotV2 | None" = None,
+    registry: SnapshotRegistry | None = None,
+    interner: NodeInterner | None = None,
 ) -> List[Evidence]:
-    snap = load_snapshot(snapshot_path)
-    items_by_gene = (snap.get("items_by_gene") or {})
-    out: List[Evidence] = []
+    """Build CIViC Evidence rows from an offline snapshot.
+
+    Unless an opened `snapshot` is passed, the snapshot is taken from
+    `registry` (default: the process-wide `SnapshotRegistry`), so repeated
+    runs reuse the parsed file and its strict-match `VariantIndex`. Rows
+    reference nodes interned in `interner` (default: the process-wide one).
+    """
+    if snapshot is None:
+        snapshot = (registry or default_snapshot_registry()).get(snapshot_path)
+    return list(_iter_snapshot_evidence(case, snapshot, snapshot_path, mode, max_items, interner))
+
+def _iter_snapshot_evidence(
+    case: Case,
+    snap: "SnapshotV1 | SnapshotV2",
+    snapshot_path: Path,
+    mode: str,
+    max_items: int,
+    interner: NodeInterner | None = None,
+) -> Iterator[Evidence]:
+    limit = max(1, max_items)
+    interner = interner or default_node_interner()
 
     for alt_idx, alt in enumerate(case.alterations):
         gene = (alt.gene or "").strip().upper()
         if not gene:
             continue
-        bucket = items_by_gene.get(gene) or {}
-        nodes = bucket.get("nodes") or []
-        picked: List[Dict[str, Any]] = []
-
-        for node in nodes:
-            if mode == "strict" and not _variant_match_strict(alt.dict(), node):
-                continue
-            picked.append(node)
-            if len(picked) >= max_items:
-                break
+        alt_d = alt.model_dump()
+        if mode == "strict":
+            picked = snap.variant_index().match(gene, alt_d.get("protein_change"))[:limit]
+        else:
+            picked = (snap.bucket(gene).get("nodes") or [])[:limit]
 
         for node in picked:
             eid = node.get("id")
             if eid is None:
                 continue
             evid_id = stable_id(IDPrefixes.EVID, case.case_id, "civic", str(eid))
-            out.append(Evidence(
+            yield Evidence(
                 evid_id=evid_id,
                 source="civic",
                 kind="annotation",
@@ -73,13 +95,152 @@ def civic_enrich_from_snapshot(
                     "mode": mode,
                     "source_mode": "snapshot",
                     "snapshot": str(snapshot_path),
-                    "civic": node,
-                    "case_alteration": alt.dict(),
+                    "civic": interner.intern(node),
+                    "case_alteration": alt_d,
                     "from_cache": True,
                 }
+            )
+
+def _enrich_alteration(
+    case: Case,
+    alt_idx: int,
+    alt: Alteration,
+    cache: CacheBackend,
+    mode: str,
+    source: str,
+    max_items: int,
+    limiter: TokenBucket,
+    transport: CivicTransport,
+    profile: str = "full",
+    ledger: MissLedger | None = None,
+    interner: NodeInterner | None = None,
+    prefetched: Set[str] | None = None,
+) -> List[Evidence]:
+    out: List[Evidence] = []
+    interner = interner or default_node_interner()
+    gene = (alt.gene or "").strip().upper()
+    if not gene:
+        return out
+
+    query = evidence_items_query(profile)
+
+    alt_d = alt.model_dump()
+    variant_q = _normalize_variant_query(alt_d)
+    gene_q = gene
+
+    if mode == "loose":
+        variant_q = None
+
+    after = None
+    fetched = 0
+
+    while fetched < max_items:
+        first = min(PAGE_SIZE, max_items - fetched)
+        variables = evidence_items_variables(gene_q, variant_q, after, first)
+
+        key = hash_request(query, variables)
+
+        data = cache.get(key)
+        from_cache = data is not None and not _take(prefetched, key)
+
+        if data is None:
+            if source == "cache":
+                if ledger is not None:
+                    ledger.record(key, variables, profile, PAGE_SIZE, max_items, case_id=case.case_id)
+                evid_id = stable_id(IDPrefixes.EVID, case.case_id, "civic", gene, str(alt_idx), "CACHE_MISS")
+                out.append(Evidence(
+                    evid_id=evid_id,
+                    source="civic",
+                    kind="annotation",
+                    ref=cache.describe(key),
+                    payload={
+                        "mode": mode,
+                        "source_mode": "cache",
+                        "gene": gene_q,
+                        "variantName": variant_q,
+                        "error": "CACHE_MISS (no network allowed)",
+                    }
+                ))
+                break
+
+            limiter.acquire()
+            data = post_graphql(query, variables, transport=transport)
+
+            meta = {
+                "endpoint": transport.endpoint,
+                "variables": variables,
+                "cached_at_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            }
+            cache.put(key, data, meta)
+
+        if "errors" in data and data["errors"]:
+            evid_id = stable_id(IDPrefixes.EVID, case.case_id, "civic", gene, str(alt_idx), "ERROR")
+            out.append(Evidence(
+                evid_id=evid_id,
+                source="civic",
+                kind="annotation",
+                ref=transport.endpoint,
+                payload={
+                    "mode": mode,
+                    "source_mode": source,
+                    "gene": gene_q,
+                    "variantName": variant_q,
+                    "errors": data.get("errors"),
+                    "from_cache": from_cache,
+                }
+            ))
+            break
+
+        conn = (((data.get("data") or {}).get("evidenceItems")) or {})
+        nodes = conn.get("nodes") or []
+        page_info = conn.get("pageInfo") or {}
+        after = page_info.get("endCursor")
+        has_next = bool(page_info.get("hasNextPage"))
+
+        for node in nodes:
+            eid = node.get("id")
+            if eid is None:
+                continue
+            evid_id = stable_id(IDPrefixes.EVID, case.case_id, "civic", str(eid))
+            out.append(Evidence(
+                evid_id=evid_id,
+                source="civic",
+                kind="annotation",
+                ref=evidence_link(int(eid)),
+                payload={
+                    "mode": mode,
+                    "source_mode": source,
+                    "query": {"geneName": gene_q, "variantName": variant_q},
+                    "civic": interner.intern(node),
+                    "case_alteration": alt_d,
+                    "from_cache": from_cache,
+                }
             ))
+
+        fetched += len(nodes)
+        if not has_next or not nodes:
+            break
+
     return out
 
+def _take(keys: Set[str] | None, key: str) -> bool:
+    """Remove `key` from `keys`; True if it was there (set.remove is atomic, so threads claim a key once)."""
+    if not keys:
+        return False
+    try:
+        keys.remove(key)
+    except KeyError:
+        return False
+    return True
+
+def _query_identity(alt: Alteration, mode: str) -> Optional[Tuple[str, Optional[str]]]:
+    gene = (alt.gene or "").strip().upper()
+    if not gene:
+        return None
+    if mode == "loose":
+        return gene, None
+    return gene, _normalize_variant_query(alt.model_dump())
+
 def civic_enrich(
     case: Case,
     cache_dir: Path,
@@ -88,134 +249,135 @@ def civic_enrich(
     min_delay_s: float = 0.35,
     source: str = "live",
     snapshot_path: Path | None = None,
+    jobs: int = 1,
+    rate_per_s: float | None = None,
+    burst: int = 1,
+    limiter: TokenBucket | None = None,
+    transport: CivicTransport | None = None,
+    batch_size: int = 1,
+    cache: CacheBackend | None = None,
+    profile: str = "full",
+    ledger: MissLedger | None = None,
+    interner: NodeInterner | None = None,
 ) -> List[Evidence]:
+    """Build CIViC Evidence rows for every alteration in `case`; see `iter_civic_enrich`."""
+    return list(iter_civic_enrich(
+        case, cache_dir, mode=mode, max_items=max_items, min_delay_s=min_delay_s, source=source,
+        snapshot_path=snapshot_path, jobs=jobs, rate_per_s=rate_per_s, burst=burst, limiter=limiter,
+        transport=transport, batch_size=batch_size, cache=cache, profile=profile, ledger=ledger, interner=interner,
+    ))
+
+def iter_civic_enrich(
+    case: Case,
+    cache_dir: Path,
+    mode: str = "strict",
+    max_items: int = 50,
+    min_delay_s: float = 0.35,
+    source: str = "live",
+    snapshot_path: Path | None = None,
+    jobs: int = 1,
+    rate_per_s: float | None = None,
+    burst: int = 1,
+    limiter: TokenBucket | None = None,
+    transport: CivicTransport | None = None,
+    batch_size: int = 1,
+    cache: CacheBackend | None = None,
+    profile: str = "full",
+    ledger: MissLedger | None = None,
+    interner: NodeInterner | None = None,
+) -> Iterator[Evidence]:
+    """Yield CIViC Evidence rows for every alteration in `case`, in alteration order.
+
+    Rows are yielded as each alteration completes, so callers can write or
+    index them without holding the whole result.
+
+    With `jobs > 1` the per-alteration queries run on a thread pool. All
+    network calls go through one shared `TokenBucket` (by default
+    `1 / min_delay_s` requests per second, or `rate_per_s` if given), and
+    results are assembled in alteration order so the output is identical to
+    a sequential run. HTTP goes through `transport` (default: the shared
+    pooled transport), so connections are reused across alterations. In
+    live mode with `batch_size > 1`, uncached pages are first fetched as
+    batched multi-alias queries (see `prefetch_evidence_pages`). Responses
+    are stored in `cache` (default: the JSON-file cache under `cache_dir`).
+    `profile` picks the node fields requested (see `graphql.QUERY_PROFILES`).
+    In cache-only mode, misses are also appended to `ledger` when given.
+
+    Each CIViC node is interned in `interner` (default: the process-wide
+    `NodeInterner`), so every row, of this case and of later cases in the
+    same process, that matches a node references one shared copy of it, and
+    all rows of an alteration share one `case_alteration` dict.
+    """
     source = (source or "live").strip().lower()
     mode = (mode or "strict").strip().lower()
     if mode not in ("strict", "loose"):
         mode = "strict"
     if source not in ("live", "cache", "snapshot"):
         source = "live"
+    profile = check_profile(profile)
 
     if source == "snapshot":
         if not snapshot_path:
             raise ValueError("snapshot_path is required when source='snapshot'")
-        return civic_enrich_from_snapshot(case, snapshot_path=snapshot_path, mode=mode, max_items=max_items)
+        snap = default_snapshot_registry().get(snapshot_path)
+        yield from _iter_snapshot_evidence(case, snap, snapshot_path, mode, max_items, interner)
+        return
 
-    out: List[Evidence] = []
     cache_dir.mkdir(parents=True, exist_ok=True)
+    if cache is None:
+        cache = JsonFileCache(cache_dir)
 
-    last_network_ts = 0.0
+    if transport is None:
+        transport = configured_transport()
+    if limiter is None:
+        if rate_per_s:
+            limiter = TokenBucket(rate_per_s, burst=burst)
+        else:
+            limiter = TokenBucket.from_min_delay(min_delay_s, burst=burst)
 
-    for alt_idx, alt in enumerate(case.alterations):
-        gene = (alt.gene or "").strip().upper()
-        if not gene:
-            continue
-
-        variant_q = _normalize_variant_query(alt.dict())
-        gene_q = gene
+    # Pages the prefetch fetched over the network in this run. The first
+    # alteration to read each one reports from_cache=False, as it would had
+    # it fetched the page itself.
+    prefetched: Set[str] = set()
+    if source == "live" and batch_size > 1:
+        seeds = [ident for ident in (_query_identity(a, mode) for a in case.alterations) if ident is not None]
+        with cache.phase("prefetch"):
+            prefetch_evidence_pages(
+                seeds, cache=cache, transport=transport, limiter=limiter,
+                page_size=PAGE_SIZE, max_items=max_items, batch_size=batch_size, jobs=jobs, profile=profile,
+                fetched=prefetched,
+            )
 
-        if mode == "loose":
-            variant_q = None
+    def work(alt_idx: int) -> List[Evidence]:
+        return _enrich_alteration(
+            case, alt_idx, case.alterations[alt_idx],
+            cache=cache, mode=mode, source=source, max_items=max_items,
+            limiter=limiter, transport=transport, profile=profile, ledger=ledger, interner=interner,
+            prefetched=prefetched,
+        )
 
-        after = None
-        fetched = 0
+    indices = list(range(len(case.alterations)))
+    if jobs <= 1 or len(indices) <= 1:
+        for i in indices:
+            yield from work(i)
+        return
 
-        while fetched < max_items:
-            first = min(25, max_items - fetched)
-            variables = {
-                "geneName": gene_q,
-                "variantName": variant_q,
-                "status": "ACCEPTED",
-                "after": after,
-                "first": first,
-            }
-
-            key = hash_request(EVIDENCE_ITEMS_QUERY, variables)
-            cache_json, cache_meta = cache_paths(cache_dir, key)
-
-            data = load_cache(cache_json)
-            from_cache = data is not None
-
-            if data is None:
-                if source == "cache":
-                    evid_id = stable_id(IDPrefixes.EVID, case.case_id, "civic", gene, str(alt_idx), "CACHE_MISS")
-                    out.append(Evidence(
-                        evid_id=evid_id,
-                        source="civic",
-                        kind="annotation",
-                        ref=str(cache_json),
-                        payload={
-                            "mode": mode,
-                            "source_mode": "cache",
-                            "gene": gene_q,
-                            "variantName": variant_q,
-                            "error": "CACHE_MISS (no network allowed)",
-                        }
-                    ))
-                    break
-
-                now = time.time()
-                if last_network_ts > 0:
-                    wait = (last_network_ts + min_delay_s) - now
-                    if wait > 0:
-                        time.sleep(wait)
-
-                data = post_graphql(EVIDENCE_ITEMS_QUERY, variables)
-                last_network_ts = time.time()
-
-                meta = {
-                    "endpoint": CIVIC_GQL_ENDPOINT,
-                    "variables": variables,
-                    "cached_at_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                }
-                save_cache(cache_json, cache_meta, data, meta)
-
-            if "errors" in data and data["errors"]:
-                evid_id = stable_id(IDPrefixes.EVID, case.case_id, "civic", gene, str(alt_idx), "ERROR")
-                out.append(Evidence(
-                    evid_id=evid_id,
-                    source="civic",
-                    kind="annotation",
-                    ref=CIVIC_GQL_ENDPOINT,
-                    payload={
-                        "mode": mode,
-                        "source_mode": source,
-                        "gene": gene_q,
-                        "variantName": variant_q,
-                        "errors": data.get("errors"),
-                        "from_cache": from_cache,
-                    }
-                ))
-                break
-
-            conn = (((data.get("data") or {}).get("evidenceItems")) or {})
-            nodes = conn.get("nodes") or []
-            page_info = conn.get("pageInfo") or {}
-            after = page_info.get("endCursor")
-            has_next = bool(page_info.get("hasNextPage"))
-
-            for node in nodes:
-                eid = node.get("id")
-                if eid is None:
-                    continue
-                evid_id = stable_id(IDPrefixes.EVID, case.case_id, "civic", str(eid))
-                out.append(Evidence(
-                    evid_id=evid_id,
-                    source="civic",
-                    kind="annotation",
-                    ref=evidence_link(int(eid)),
-                    payload={
-                        "mode": mode,
-                        "source_mode": source,
-                        "query": {"geneName": gene_q, "variantName": variant_q},
-                        "civic": node,
-                        "case_alteration": alt.dict(),
-                        "from_cache": from_cache,
-                    }
-                ))
-
-            fetched += len(nodes)
-            if not has_next or not nodes:
-                break
+    # Alterations that issue the same query as an earlier one run after it,
+    # so they hit its cache entries (and report from_cache) exactly as in a
+    # sequential run instead of racing it to the network.
+    owners: List[int] = []
+    seen: Set[Tuple[str, Optional[str]]] = set()
+    for i in indices:
+        ident = _query_identity(case.alterations[i], mode)
+        if ident is not None and ident in seen:
+            continue
+        if ident is not None:
+            seen.add(ident)
+        owners.append(i)
+    is_owner = set(owners)
 
-    return out
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="civic") as pool:
+        owned = pool.map(work, owners)
+        for i in indices:
+            # A follower's owner has a lower index, so it has finished by now.
+            yield from (next(owned) if i in is_owner else work(i))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+from typing import IO, Any
+
+# On-disk encodings for request-cache entries and v1 snapshots.
+#   json     indented JSON (the original layout)
+#   compact  JSON without indentation or spaces
+#   gzip     compact JSON, gzip-compressed
+#   zstd     compact JSON, zstd-compressed (needs the optional `zstandard` package)
+ENCODINGS = ("json", "compact", "gzip", "zstd")
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_SUFFIX = {"json": ".json", "compact": ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+
+def check_encoding(encoding: str) -> str:
+    encoding = (encoding or "json").strip().lower()
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding '{encoding}'. Expected one of {ENCODINGS}")
+    if encoding == "zstd":
+        _zstd()
+    return encoding
+
+def suffix(encoding: str) -> str:
+    return _SUFFIX[encoding]
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstd encoding requires the 'zstandard' package (pip install 'ttrecon[zstd]')") from e
+    return zstandard
+
+def dumps_text(obj: Any, encoding: str) -> str:
+    if encoding == "json":
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def dumps(obj: Any, encoding: str) -> bytes:
+    raw = dumps_text(obj, encoding).encode("utf-8")
+    if encoding == "gzip":
+        # mtime=0 keeps the output deterministic.
+        return gzip.compress(raw, mtime=0)
+    if encoding == "zstd":
+        return _zstd().ZstdCompressor().compress(raw)
+    return raw
+
+def decompress(raw: bytes) -> bytes:
+    """Undo gzip/zstd compression (detected from the magic bytes); plain bytes pass through."""
+    if raw[:2] == GZIP_MAGIC:
+        return gzip.decompress(raw)
+    if raw[:4] == ZSTD_MAGIC:
+        return _zstd().ZstdDecompressor().decompressobj().decompress(raw)
+    return raw
+
+def loads(raw: bytes) -> Any:
+    return json.loads(decompress(raw).decode("utf-8"))
+
+def open_text_writer(raw: IO[bytes], encoding: str) -> IO[str]:
+    """Wrap a binary file so text written to it is stored with `encoding`'s compression."""
+    if encoding == "gzip":
+        stream: IO[bytes] = gzip.GzipFile(fileobj=raw, mode="wb", mtime=0)
+    elif encoding == "zstd":
+        stream = _zstd().ZstdCompressor().stream_writer(raw, closefd=False)
+    else:
+        stream = raw
+    return io.TextIOWrapper(stream, encoding="utf-8", newline="")
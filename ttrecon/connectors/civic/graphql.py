@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-EVIDENCE_ITEMS_QUERY = """query EvidenceItems($geneName: String, $variantName: String, $status: EvidenceStatusFilter, $after: String, $first: Int) {
-  evidenceItems(geneName: $geneName, variantName: $variantName, status: $status, after: $after, first: $first) {
-    totalCount
+from typing import Any, Dict, List, Tuple
+
+# Selection set shared by the single and batched evidenceItems queries.
+EVIDENCE_ITEMS_SELECTION = """    totalCount
     pageInfo {
       endCursor
       hasNextPage
@@ -39,7 +40,137 @@ EVIDENCE_ITEMS_QUERY = """query EvidenceItems($geneName: String, $variantName: S
         name
         ncitId
       }
+    }"""
+
+_PAGE_FIELDS = """    totalCount
+    pageInfo {
+      endCursor
+      hasNextPage
     }
-  }
-}
+    nodes {
 """
+
+# Node fields per query profile. `minimal` is what evidence rows, strict
+# matching and reports need; `claims` adds what CIViC claim promotion reads
+# (description, citation, drug names); `full` is the original selection.
+_MINIMAL_NODE_FIELDS = """      id
+      status
+      evidenceType
+      evidenceLevel
+      evidenceRating
+      evidenceDirection
+      gene {
+        name
+      }
+      variant {
+        name
+      }
+      disease {
+        name
+      }"""
+
+_CLAIMS_NODE_FIELDS = _MINIMAL_NODE_FIELDS + """
+      description
+      source {
+        citation
+      }
+      drugs {
+        name
+      }"""
+
+QUERY_PROFILES = ("minimal", "claims", "full")
+
+_SELECTIONS = {
+    "minimal": _PAGE_FIELDS + _MINIMAL_NODE_FIELDS + "\n    }",
+    "claims": _PAGE_FIELDS + _CLAIMS_NODE_FIELDS + "\n    }",
+    "full": EVIDENCE_ITEMS_SELECTION,
+}
+
+def check_profile(profile: str | None) -> str:
+    profile = (profile or "full").strip().lower()
+    if profile not in QUERY_PROFILES:
+        raise ValueError(f"Unknown CIViC query profile '{profile}'. Expected one of {QUERY_PROFILES}")
+    return profile
+
+def evidence_items_selection(profile: str = "full") -> str:
+    return _SELECTIONS[check_profile(profile)]
+
+def evidence_items_query(profile: str = "full") -> str:
+    """The single-page evidenceItems query for `profile`.
+
+    The query text is part of every request-cache key, so each profile
+    caches separately; `full` is exactly `EVIDENCE_ITEMS_QUERY`.
+    """
+    return (
+        "query EvidenceItems($geneName: String, $variantName: String, $status: EvidenceStatusFilter, $after: String, $first: Int) {\n"
+        "  evidenceItems(geneName: $geneName, variantName: $variantName, status: $status, after: $after, first: $first) {\n"
+        + evidence_items_selection(profile)
+        + "\n  }\n}\n"
+    )
+
+EVIDENCE_ITEMS_QUERY = evidence_items_query("full")
+
+def evidence_items_variables(gene: str, variant: str | None, after: str | None, first: int) -> Dict[str, Any]:
+    """Variables for one EVIDENCE_ITEMS_QUERY page (also the request-cache key input)."""
+    return {
+        "geneName": gene,
+        "variantName": variant,
+        "status": "ACCEPTED",
+        "after": after,
+        "first": first,
+    }
+
+_BATCH_ARGS = (
+    ("geneName", "g", "String"),
+    ("variantName", "v", "String"),
+    ("status", "s", "EvidenceStatusFilter"),
+    ("after", "a", "String"),
+    ("first", "f", "Int"),
+)
+
+def batch_alias(i: int) -> str:
+    return f"q{i}"
+
+def build_batched_evidence_query(variables_list: List[Dict[str, Any]], profile: str = "full") -> Tuple[str, Dict[str, Any]]:
+    """Pack several evidenceItems lookups (selecting `profile`'s fields) into one document.
+
+    Lookup `i` becomes the aliased field `q{i}` with variables `g{i}`, `v{i}`,
+    `s{i}`, `a{i}`, `f{i}`. Use `split_batched_response` to get per-lookup
+    results shaped like single-query responses.
+    """
+    params: List[str] = []
+    fields: List[str] = []
+    variables: Dict[str, Any] = {}
+    selection = evidence_items_selection(profile)
+    for i, v in enumerate(variables_list):
+        args: List[str] = []
+        for name, prefix, gql_type in _BATCH_ARGS:
+            var = f"{prefix}{i}"
+            params.append(f"${var}: {gql_type}")
+            args.append(f"{name}: ${var}")
+            variables[var] = v.get(name)
+        fields.append(
+            f"  {batch_alias(i)}: evidenceItems({', '.join(args)}) {{\n"
+            + selection
+            + "\n  }"
+        )
+    query = f"query EvidenceItemsBatch({', '.join(params)}) {{\n" + "\n".join(fields) + "\n}\n"
+    return query, variables
+
+def split_batched_response(data: Dict[str, Any], n: int) -> List[Dict[str, Any]]:
+    """Split a batched response into `n` single-query responses.
+
+    GraphQL errors are routed to the lookup named by the first element of
+    their `path`; errors without a path are attached to every lookup.
+    """
+    body = data.get("data") or {}
+    errors = data.get("errors") or []
+    out: List[Dict[str, Any]] = []
+    for i in range(n):
+        alias = batch_alias(i)
+        errs = [e for e in errors if not (e.get("path") or []) or (e.get("path") or [None])[0] == alias]
+        res: Dict[str, Any] = {"data": {"evidenceItems": body.get(alias)}}
+        if errs:
+            res["errors"] = errs
+        out.append(res)
+    return out
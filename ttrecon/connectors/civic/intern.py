@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict
+
+class NodeInterner:
+    """Process-wide table of CIViC evidence nodes, one shared copy per node id.
+
+    Evidence rows built from the same CIViC node (several alterations
+    matching it, the same gene queried by many cases of a batch) all hold a
+    reference to the interned dict instead of their own copy. A node whose
+    content differs from the interned one (e.g. a refreshed cache entry)
+    replaces it. At most `max_nodes` nodes are kept, least recently used
+    first out. Interned nodes are shared: callers must not mutate them.
+    """
+
+    def __init__(self, max_nodes: int = 100_000) -> None:
+        self.max_nodes = max(0, int(max_nodes))
+        self._lock = threading.Lock()
+        self._nodes: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        eid = node.get("id")
+        if eid is None or not self.max_nodes:
+            return node
+        key = str(eid)
+        with self._lock:
+            cur = self._nodes.get(key)
+            if cur is not None and (cur is node or cur == node):
+                self.hits += 1
+                self._nodes.move_to_end(key)
+                return cur
+            self.misses += 1
+            self._nodes[key] = node
+            self._nodes.move_to_end(key)
+            while len(self._nodes) > self.max_nodes:
+                self._nodes.popitem(last=False)
+            return node
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"nodes": len(self._nodes), "max_nodes": self.max_nodes, "hits": self.hits, "misses": self.misses}
+
+_default = NodeInterner()
+
+def default_node_interner() -> NodeInterner:
+    return _default
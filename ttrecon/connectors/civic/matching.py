@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Set, Tuple
+
+_GRAM = 3
+
+def _grams(s: str) -> Set[str]:
+    return {s[i:i + _GRAM] for i in range(len(s) - _GRAM + 1)}
+
+class _GeneIndex:
+    def __init__(self, nodes: List[Dict[str, Any]]) -> None:
+        self.nodes = nodes
+        # upper-cased variant name -> node positions (in snapshot order)
+        self.by_name: Dict[str, List[int]] = {}
+        for pos, node in enumerate(nodes):
+            vname = ((node.get("variant") or {}).get("name") or "").upper()
+            self.by_name.setdefault(vname, []).append(pos)
+        self.names = list(self.by_name.keys())
+        # trigram -> indexes into self.names
+        self.postings: Dict[str, Set[int]] = {}
+        for i, name in enumerate(self.names):
+            for g in _grams(name):
+                self.postings.setdefault(g, set()).add(i)
+
+    def positions(self, pc_u: str) -> Tuple[int, ...]:
+        if len(pc_u) >= _GRAM:
+            cands: Set[int] | None = None
+            for g in _grams(pc_u):
+                post = self.postings.get(g)
+                if not post:
+                    return ()
+                cands = set(post) if cands is None else (cands & post)
+                if not cands:
+                    return ()
+            names = [self.names[i] for i in sorted(cands or ())]
+        else:
+            names = self.names
+        hits: List[int] = []
+        for name in names:
+            if pc_u in name:
+                hits.extend(self.by_name[name])
+        hits.sort()
+        return tuple(hits)
+
+class VariantIndex:
+    """Strict-mode CIViC match index for one loaded snapshot.
+
+    Resolves (gene, protein_change) to the snapshot nodes whose variant name
+    contains the protein change, case-insensitively — the same node set, in
+    the same order, as testing `_variant_match_strict` against every node.
+    Genes are indexed on first lookup (so v2 snapshots stay lazily decoded)
+    and results are memoized, so repeated lookups across cases are O(1).
+    """
+
+    def __init__(self, snapshot: Any) -> None:
+        self._snap = snapshot
+        self._genes: Dict[str, _GeneIndex] = {}
+        self._memo: Dict[Tuple[str, str], Tuple[int, ...]] = {}
+        self._lock = threading.Lock()
+
+    def _gene(self, gene: str) -> _GeneIndex:
+        gi = self._genes.get(gene)
+        if gi is None:
+            gi = _GeneIndex(self._snap.bucket(gene).get("nodes") or [])
+            with self._lock:
+                gi = self._genes.setdefault(gene, gi)
+        return gi
+
+    def match(self, gene: str, protein_change: str | None) -> List[Dict[str, Any]]:
+        gi = self._gene(gene)
+        pc = (protein_change or "").strip()
+        if not pc:
+            return gi.nodes
+        key = (gene, pc.upper())
+        pos = self._memo.get(key)
+        if pos is None:
+            pos = gi.positions(key[1])
+            with self._lock:
+                self._memo[key] = pos
+        return [gi.nodes[i] for i in pos]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from ttrecon.connectors.civic.batch import prefetch_evidence_pages
+from ttrecon.connectors.civic.cache import CacheBackend
+from ttrecon.connectors.civic.ratelimit import TokenBucket
+from ttrecon.connectors.civic.transport import CivicTransport
+
+LEDGER_NAME = "misses.jsonl"
+
+def _now_utc_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+@contextmanager
+def _locked(path: Path) -> Iterator[None]:
+    """Hold an exclusive lock on `path` (a sidecar file), across processes."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+class MissLedger:
+    """Append-only record of request-cache misses seen by cache-only CIViC runs.
+
+    Each line of `<civic cache>/misses.jsonl` is one miss: the cache key, the
+    query variables and profile, the run's paging limits, the case and a
+    timestamp. `summary()` folds them per key, so `ttrecon civic misses` can
+    report (and prefetch) every missing page in one go instead of finding
+    them one run at a time.
+
+    Several processes (e.g. `run-batch` workers) may share a ledger, so
+    appends and rewrites hold a lock on `<ledger>.lock`; the file is read
+    line by line, never whole.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock_path = path.with_name(path.name + ".lock")
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _exclusive(self) -> Iterator[None]:
+        with self._lock, _locked(self.lock_path):
+            yield
+
+    @classmethod
+    def for_cache_dir(cls, cache_dir: Path) -> "MissLedger":
+        return cls(cache_dir / LEDGER_NAME)
+
+    def record(self, key: str, variables: Dict[str, Any], profile: str, page_size: int, max_items: int,
+               case_id: Optional[str] = None) -> None:
+        line = json.dumps({
+            "key": key,
+            "variables": variables,
+            "profile": profile,
+            "page_size": page_size,
+            "max_items": max_items,
+            "case_id": case_id,
+            "seen_utc": _now_utc_iso(),
+        }, ensure_ascii=False, separators=(",", ":"))
+        with self._exclusive():
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def _records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(raw line, parsed record) for every readable line, streamed."""
+        try:
+            f = self.path.open("r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except Exception:
+                    continue  # torn write from an interrupted run
+                if isinstance(rec, dict):
+                    yield line, rec
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """One entry per missed key (first-seen order), with hit counts and the cases that missed it."""
+        by_key: Dict[str, Dict[str, Any]] = {}
+        for _, rec in self._records():
+            key = rec.get("key")
+            if not key:
+                continue
+            cur = by_key.get(key)
+            if cur is None:
+                v = rec.get("variables") or {}
+                cur = by_key[key] = {
+                    "key": key,
+                    "gene": v.get("geneName"),
+                    "variantName": v.get("variantName"),
+                    "after": v.get("after"),
+                    "profile": rec.get("profile") or "full",
+                    "page_size": rec.get("page_size"),
+                    "max_items": rec.get("max_items"),
+                    "variables": v,
+                    "count": 0,
+                    "cases": [],
+                    "first_seen_utc": rec.get("seen_utc"),
+                }
+            cur["count"] += 1
+            cur["last_seen_utc"] = rec.get("seen_utc")
+            if rec.get("case_id") and rec["case_id"] not in cur["cases"]:
+                cur["cases"].append(rec["case_id"])
+        return list(by_key.values())
+
+    def resolve(self, cache: CacheBackend) -> int:
+        """Drop ledger lines whose key is now cached; returns how many keys were resolved."""
+        with self._exclusive():
+            keys = {rec.get("key") for _, rec in self._records()}
+            cached = {k for k in keys if k and cache.get(k) is not None}
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            kept = 0
+            with tmp.open("w", encoding="utf-8") as out:
+                for line, rec in self._records():
+                    if rec.get("key") not in cached:
+                        out.write(line if line.endswith("\n") else line + "\n")
+                        kept += 1
+            if kept:
+                os.replace(tmp, self.path)
+            else:
+                tmp.unlink()
+                self.path.unlink(missing_ok=True)
+        return len(cached)
+
+    def clear(self) -> None:
+        with self._exclusive():
+            self.path.unlink(missing_ok=True)
+
+def prefetch_misses(
+    ledger: MissLedger,
+    cache: CacheBackend,
+    transport: CivicTransport,
+    limiter: TokenBucket,
+    batch_size: int = 20,
+    jobs: int = 1,
+) -> Dict[str, int]:
+    """Fetch every still-missing ledger entry with batched queries, then drop the resolved lines.
+
+    Lookups are grouped by (profile, page size, max_items) so pages land
+    under the exact cache keys the cache-only run will ask for.
+    """
+    groups: Dict[Tuple[str, int, int], List[Tuple[str, Optional[str]]]] = {}
+    for m in ledger.summary():
+        if not m.get("gene") or not m.get("page_size") or not m.get("max_items") or cache.get(m["key"]) is not None:
+            continue
+        seed = (m["gene"], m.get("variantName"))
+        group = groups.setdefault((m["profile"], int(m["page_size"]), int(m["max_items"])), [])
+        if seed not in group:
+            group.append(seed)
+
+    stats = {"lookups": sum(len(g) for g in groups.values()), "requests": 0, "pages": 0}
+    for (profile, page_size, max_items), seeds in groups.items():
+        got = prefetch_evidence_pages(
+            seeds, cache=cache, transport=transport, limiter=limiter,
+            page_size=page_size, max_items=max_items, batch_size=max(2, batch_size), jobs=jobs, profile=profile,
+        )
+        stats["requests"] += got["requests"]
+        stats["pages"] += got["pages"]
+    stats["resolved"] = ledger.resolve(cache)
+    return stats
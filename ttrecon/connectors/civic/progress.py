@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from ttrecon.connectors.civic.transport import CivicTransport
+from ttrecon.logging import log_event
+
+class SyncProgress:
+    """Thread-safe progress/throughput counters for `civic sync`, reported via `log_event`.
+
+    Emits `civic.sync.progress` after each finished gene (at most every
+    `every_s` seconds, plus the last one) and `civic.sync.done` at the end.
+    Pages fetched by the batched prefetch are reported through `prefetched`
+    (as `phase: "prefetch"` progress events) and count as network pages;
+    the per-gene loops later read them from the cache. Bytes are taken from
+    the transport's cumulative counters.
+    """
+
+    def __init__(self, logger: logging.Logger, total_genes: int, transport: CivicTransport, every_s: float = 1.0) -> None:
+        self.logger = logger
+        self.total_genes = total_genes
+        self.transport = transport
+        self.every_s = every_s
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._bytes0 = transport.stats().bytes_received
+        self._last_emit = 0.0
+        self.genes_done = 0
+        self.pages = 0
+        self.network_pages = 0
+        self.items = 0
+
+    def page(self, n_items: int, network: bool) -> None:
+        with self._lock:
+            self.pages += 1
+            self.items += n_items
+            if network:
+                self.network_pages += 1
+
+    def prefetched(self, n_pages: int) -> None:
+        with self._lock:
+            self.network_pages += n_pages
+            now = time.perf_counter()
+            if now - self._last_emit < self.every_s:
+                return
+            self._last_emit = now
+            payload = self.snapshot()
+        log_event(self.logger, "civic.sync.progress", phase="prefetch", **payload)
+
+    def snapshot(self) -> Dict[str, Any]:
+        elapsed = max(time.perf_counter() - self._t0, 1e-9)
+        nbytes = self.transport.stats().bytes_received - self._bytes0
+        return {
+            "genes_done": self.genes_done,
+            "genes_total": self.total_genes,
+            "pages": self.pages,
+            "network_pages": self.network_pages,
+            "items": self.items,
+            "bytes": nbytes,
+            "elapsed_s": round(elapsed, 3),
+            "genes_per_s": round(self.genes_done / elapsed, 3),
+            "items_per_s": round(self.items / elapsed, 3),
+            "bytes_per_s": round(nbytes / elapsed, 1),
+        }
+
+    def gene_done(self, gene: str) -> None:
+        with self._lock:
+            self.genes_done += 1
+            now = time.perf_counter()
+            last = self.genes_done >= self.total_genes
+            if not last and now - self._last_emit < self.every_s:
+                return
+            self._last_emit = now
+            payload = self.snapshot()
+        log_event(self.logger, "civic.sync.progress", gene=gene, **payload)
+
+    def done(self, **extra: Any) -> Dict[str, Any]:
+        with self._lock:
+            payload = self.snapshot()
+        log_event(self.logger, "civic.sync.done", **payload, **extra)
+        return payload
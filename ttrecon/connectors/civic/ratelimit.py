@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every worker talking to CIViC.
+
+    `rate_per_s` tokens are added per second up to `burst`. Callers that find
+    the bucket empty reserve a token anyway and sleep outside the lock, so
+    concurrent workers are served in arrival order. A rate of 0 disables
+    limiting.
+    """
+
+    def __init__(
+        self,
+        rate_per_s: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate_per_s = max(0.0, float(rate_per_s or 0.0))
+        self.burst = max(1, int(burst or 1))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._last = clock()
+
+    @classmethod
+    def from_min_delay(cls, min_delay_s: float, burst: int = 1) -> "TokenBucket":
+        rate = (1.0 / min_delay_s) if min_delay_s and min_delay_s > 0 else 0.0
+        return cls(rate, burst=burst)
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take `tokens` and return how long the caller must wait before using them."""
+        if self.rate_per_s <= 0:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._last) * self.rate_per_s)
+            self._last = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_s
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        wait = self.reserve(tokens)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from ttrecon.connectors.civic.snapshot import SnapshotV1, SnapshotV2, open_snapshot
+
+_StatKey = Tuple[str, int, int]
+_Key = Tuple[str, int, int, str]
+
+def _file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+class SnapshotRegistry:
+    """Process-wide LRU of opened CIViC snapshots.
+
+    Entries are keyed by (resolved path, size, mtime_ns, sha256), so a
+    rewritten snapshot is reloaded while repeated runs against the same file
+    reuse the parsed snapshot together with its derived indexes (e.g.
+    `variant_index()`). The content hash is computed once per
+    (path, size, mtime) and remembered.
+    """
+
+    def __init__(self, max_entries: int = 4) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[_Key, SnapshotV1 | SnapshotV2]" = OrderedDict()
+        self._hashes: Dict[_StatKey, str] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, path: Path) -> _Key:
+        rp = path.resolve()
+        st = rp.stat()
+        skey = (str(rp), st.st_size, st.st_mtime_ns)
+        h = self._hashes.get(skey)
+        if h is None:
+            h = _file_sha256(rp)
+            self._hashes = {k: v for k, v in self._hashes.items() if k[0] != skey[0]}
+            self._hashes[skey] = h
+        return skey + (h,)
+
+    def get(self, path: Path) -> "SnapshotV1 | SnapshotV2":
+        with self._lock:
+            key = self._key(path)
+            snap = self._entries.get(key)
+            if snap is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return snap
+            self.misses += 1
+            snap = open_snapshot(Path(key[0]))
+            # Older versions of the same file are no longer reachable by key.
+            for k in [k for k in self._entries if k[0] == key[0]]:
+                del self._entries[k]
+                self.evictions += 1
+            self._entries[key] = snap
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return snap
+
+    def clear(self) -> None:
+        # Entries are dropped rather than closed: callers may still hold them.
+        with self._lock:
+            self._entries.clear()
+            self._hashes.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "paths": [k[0] for k in self._entries],
+            }
+
+_default = SnapshotRegistry()
+
+def default_snapshot_registry() -> SnapshotRegistry:
+    return _default
@@ -1,100 +1,661 @@
 from __future__ import annotations
 
 import json
+import mmap
+import os
+import struct
+import threading
 import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
-
-from ttrecon.connectors.civic.graphql import EVIDENCE_ITEMS_QUERY
-from ttrecon.connectors.civic.util import (
-    CIVIC_GQL_ENDPOINT,
-    post_graphql,
-    hash_request,
-    cache_paths,
-    load_cache,
-    save_cache,
-)
+from typing import Any, Deque, Dict, List, Tuple
+
+from ttrecon.connectors.civic import codec
+from ttrecon.connectors.civic.batch import prefetch_evidence_pages, probe_total_counts
+from ttrecon.connectors.civic.cache import CacheBackend, JsonFileCache
+from ttrecon.connectors.civic.checkpoint import SyncCheckpoint
+from ttrecon.connectors.civic.graphql import check_profile, evidence_items_query, evidence_items_variables
+from ttrecon.connectors.civic.matching import VariantIndex
+from ttrecon.connectors.civic.progress import SyncProgress
+from ttrecon.connectors.civic.ratelimit import TokenBucket
+from ttrecon.connectors.civic.transport import CivicTransport, configured_transport
+from ttrecon.connectors.civic.util import post_graphql, hash_request
+from ttrecon.logging import get_logger, log_event
+
+PAGE_SIZE = 50
 
 def _now_utc_iso() -> str:
     return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
-def build_snapshot_for_genes(
+def _fetch_gene_bucket(
+    gene: str,
+    cache: CacheBackend,
+    transport: CivicTransport,
+    limiter: TokenBucket,
+    max_items: int,
+    refresh: bool = False,
+    resume_from: Dict[str, Any] | None = None,
+    checkpoint: SyncCheckpoint | None = None,
+    progress: SyncProgress | None = None,
+    profile: str = "full",
+) -> Dict[str, Any]:
+    """Page through one gene's accepted evidence items.
+
+    With `refresh`, cached pages are ignored (and overwritten). `resume_from`
+    continues an interrupted gene from its checkpointed cursor.
+    """
+    after = None
+    fetched = 0
+    total_count: int | None = None
+    nodes_all: List[Dict[str, Any]] = []
+    if resume_from:
+        after = resume_from.get("after")
+        fetched = int(resume_from.get("fetched") or 0)
+        total_count = resume_from.get("total_count")
+        nodes_all = list(resume_from.get("nodes") or [])
+
+    query = evidence_items_query(profile)
+    while fetched < max_items:
+        first = min(PAGE_SIZE, max_items - fetched)
+        variables = evidence_items_variables(gene, None, after, first)
+
+        key = hash_request(query, variables)
+        data = None if refresh else cache.get(key)
+        network = data is None
+
+        if data is None:
+            limiter.acquire()
+            data = post_graphql(query, variables, transport=transport)
+            cache.put(key, data, {
+                "endpoint": transport.endpoint,
+                "variables": variables,
+                "cached_at_utc": _now_utc_iso(),
+            })
+
+        if "errors" in data and data["errors"]:
+            return {"errors": data["errors"], "nodes": nodes_all}
+
+        conn = (((data.get("data") or {}).get("evidenceItems")) or {})
+        nodes = conn.get("nodes") or []
+        page_info = conn.get("pageInfo") or {}
+        after = page_info.get("endCursor")
+        has_next = bool(page_info.get("hasNextPage"))
+        if conn.get("totalCount") is not None:
+            total_count = int(conn["totalCount"])
+        if progress is not None:
+            progress.page(len(nodes), network)
+
+        nodes_all.extend(nodes)
+        fetched += len(nodes)
+        if not has_next or not nodes:
+            break
+        if checkpoint is not None:
+            checkpoint.save_partial(gene, nodes, after, fetched, total_count)
+
+    bucket: Dict[str, Any] = {"nodes": nodes_all}
+    if total_count is not None:
+        bucket["total_count"] = total_count
+    return bucket
+
+def bucket_summary(bucket: Dict[str, Any]) -> Dict[str, Any]:
+    """What an incremental sync needs to know about a stored bucket, without its nodes."""
+    return {
+        "total_count": bucket.get("total_count"),
+        "nodes": len(bucket.get("nodes") or []),
+        "errors": bool(bucket.get("errors")),
+    }
+
+def _unchanged(prev: Dict[str, Any], total: int | None, max_items: int) -> bool:
+    """`prev` is a `bucket_summary` of the stored bucket."""
+    if total is None or prev["errors"] or prev["total_count"] != total:
+        return False
+    return prev["nodes"] == min(total, max_items)
+
+def _sync_genes(
     genes: List[str],
     out_path: Path,
     cache_dir: Path,
+    sink: Any,
     max_items_per_gene: int = 500,
     min_delay_s: float = 0.35,
+    transport: CivicTransport | None = None,
+    batch_size: int = 1,
+    cache: CacheBackend | None = None,
+    incremental: bool = False,
+    resume: bool = False,
+    jobs: int = 1,
+    profile: str = "full",
 ) -> Dict[str, Any]:
+    """Fetch or reuse every gene's bucket and hand them to `sink` in sorted gene order.
+
+    `sink` gets `begin(header)`, `add(gene, bucket)` per gene, then
+    `commit()` (or `abort()` on failure). At most about `2 * jobs` fetched
+    buckets are held in memory at once. Genes carried over from an
+    incremental run's previous snapshot are decoded one at a time (or, when
+    `sink` has `copy_from`, copied without decoding). Returns the snapshot header.
+    """
     genes_norm = sorted({g.strip().upper() for g in genes if g.strip()})
+    profile = check_profile(profile)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     cache_dir.mkdir(parents=True, exist_ok=True)
+    if cache is None:
+        cache = JsonFileCache(cache_dir)
 
-    snapshot: Dict[str, Any] = {
-        "schema": "civic_snapshot_v1",
-        "endpoint": CIVIC_GQL_ENDPOINT,
-        "created_utc": _now_utc_iso(),
-        "genes": genes_norm,
-        "items_by_gene": {},
-    }
+    if transport is None:
+        transport = configured_transport()
+    limiter = TokenBucket.from_min_delay(min_delay_s)
+    logger = get_logger()
 
-    last_network_ts = 0.0
-
-    for gene in genes_norm:
-        after = None
-        fetched = 0
-        nodes_all: List[Dict[str, Any]] = []
-
-        while fetched < max_items_per_gene:
-            first = min(50, max_items_per_gene - fetched)
-            variables = {
-                "geneName": gene,
-                "variantName": None,
-                "status": "ACCEPTED",
-                "after": after,
-                "first": first,
-            }
-
-            key = hash_request(EVIDENCE_ITEMS_QUERY, variables)
-            cache_json, cache_meta = cache_paths(cache_dir, key)
-            data = load_cache(cache_json)
-
-            if data is None:
-                now = time.time()
-                if last_network_ts > 0:
-                    wait = (last_network_ts + min_delay_s) - now
-                    if wait > 0:
-                        time.sleep(wait)
-
-                data = post_graphql(EVIDENCE_ITEMS_QUERY, variables)
-                last_network_ts = time.time()
-                save_cache(cache_json, cache_meta, data, {
-                    "endpoint": CIVIC_GQL_ENDPOINT,
-                    "variables": variables,
-                    "cached_at_utc": _now_utc_iso(),
-                })
-
-            if "errors" in data and data["errors"]:
-                snapshot["items_by_gene"][gene] = {"errors": data["errors"], "nodes": nodes_all}
-                break
-
-            conn = (((data.get("data") or {}).get("evidenceItems")) or {})
-            nodes = conn.get("nodes") or []
-            page_info = conn.get("pageInfo") or {}
-            after = page_info.get("endCursor")
-            has_next = bool(page_info.get("hasNextPage"))
-
-            nodes_all.extend(nodes)
-            fetched += len(nodes)
-            if not has_next or not nodes:
-                break
-
-        snapshot["items_by_gene"][gene] = {"nodes": nodes_all}
-
-    return snapshot
-
-def write_snapshot(snapshot: Dict[str, Any], out_path: Path) -> None:
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(snapshot, indent=2, ensure_ascii=False), encoding="utf-8")
+    previous: "SnapshotV1 | SnapshotV2 | None" = None
+    if incremental and out_path.exists():
+        previous = open_snapshot(out_path)
+        prev_profile = previous.header.get("profile", "full")
+        if prev_profile != profile:
+            previous.close()
+            raise ValueError(
+                f"{out_path} was built with query profile '{prev_profile}', not '{profile}'; "
+                "rebuild it without incremental mode"
+            )
+
+    try:
+        prev_genes = set(previous.genes) if previous else set()
+        all_genes = sorted(set(genes_norm) | prev_genes)
+        header: Dict[str, Any] = {
+            "schema": SCHEMA_V1,
+            "endpoint": transport.endpoint,
+            "created_utc": _now_utc_iso(),
+            "genes": all_genes,
+            "profile": profile,
+        }
+
+        # Genes carried over from the previous snapshot; buckets are read from it lazily.
+        reuse: set = set()
+        refresh: set = set()
+        if previous is not None:
+            requested_prev = [g for g in genes_norm if g in prev_genes]
+            totals = probe_total_counts(requested_prev, transport, limiter, batch_size=batch_size)
+            for g in previous.genes:
+                if g not in genes_norm or _unchanged(previous.summary(g), totals.get(g), max_items_per_gene):
+                    reuse.add(g)
+                else:
+                    refresh.add(g)
+            log_event(logger, "civic.sync.incremental", requested=len(genes_norm),
+                      unchanged=len([g for g in requested_prev if g in reuse]), changed=len(refresh),
+                      new=len([g for g in genes_norm if g not in prev_genes]))
+
+        checkpoint = SyncCheckpoint.open(out_path, genes_norm, max_items_per_gene, resume=resume, profile=profile)
+
+        todo = [g for g in genes_norm if g not in reuse and not checkpoint.is_done(g)]
+        prefetchable = [g for g in todo if g not in refresh and checkpoint.partial(g) is None]
+        # Created before the prefetch, so its pages and bytes count towards throughput.
+        progress = SyncProgress(logger, total_genes=len(todo), transport=transport)
+        if batch_size > 1 and prefetchable:
+            stats = prefetch_evidence_pages(
+                [(g, None) for g in prefetchable],
+                cache=cache,
+                transport=transport,
+                limiter=limiter,
+                page_size=PAGE_SIZE,
+                max_items=max_items_per_gene,
+                batch_size=batch_size,
+                jobs=jobs,
+                profile=profile,
+                on_pages=progress.prefetched,
+            )
+            log_event(logger, "civic.sync.prefetch", genes=len(prefetchable), batch_size=batch_size, **stats)
+
+        todo_set = set(todo)
+
+        def work(gene: str) -> Dict[str, Any]:
+            bucket = _fetch_gene_bucket(
+                gene, cache, transport, limiter, max_items_per_gene,
+                refresh=gene in refresh,
+                resume_from=checkpoint.partial(gene),
+                checkpoint=checkpoint,
+                progress=progress,
+                profile=profile,
+            )
+            checkpoint.save_done(gene, bucket)
+            progress.gene_done(gene)
+            return bucket
+
+        def resolve(gene: str) -> Dict[str, Any]:
+            if gene in reuse:
+                return previous.bucket(gene, cache=False)
+            bucket = checkpoint.completed(gene)
+            return bucket if bucket is not None else work(gene)
+
+        copy_from = getattr(sink, "copy_from", None)
+
+        def emit(gene: str) -> None:
+            if gene in reuse and copy_from is not None and copy_from(previous, gene):
+                return
+            sink.add(gene, resolve(gene))
+
+        sink.begin(header)
+        try:
+            if jobs > 1 and len(todo) > 1:
+                window = 2 * jobs
+                with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="civic-sync") as pool:
+                    pending: Deque[Tuple[str, Future | None]] = deque()
+                    in_flight = 0
+                    it = iter(all_genes)
+                    exhausted = False
+                    while True:
+                        while not exhausted and in_flight < window:
+                            gene = next(it, None)
+                            if gene is None:
+                                exhausted = True
+                                break
+                            fut = pool.submit(work, gene) if gene in todo_set else None
+                            in_flight += fut is not None
+                            pending.append((gene, fut))
+                        if not pending:
+                            break
+                        gene, fut = pending.popleft()
+                        if fut is not None:
+                            in_flight -= 1
+                            sink.add(gene, fut.result())
+                        else:
+                            emit(gene)
+            else:
+                for gene in all_genes:
+                    emit(gene)
+            sink.commit()
+        except BaseException:
+            sink.abort()
+            raise
+
+        requested_fresh = [g for g in genes_norm if g not in reuse]
+        progress.done(jobs=jobs, reused=len(reuse), checkpointed=len(requested_fresh) - len(todo))
+    finally:
+        if previous is not None:
+            previous.close()
+
+    checkpoint.discard()
+    return header
+
+class _CollectSink:
+    """Sink that assembles a v1-shaped snapshot dict, optionally streaming it to `writer` too."""
+
+    def __init__(self, writer: Any = None) -> None:
+        self.writer = writer
+        self.snapshot: Dict[str, Any] = {}
+
+    def begin(self, header: Dict[str, Any]) -> None:
+        self.snapshot = {**header, "items_by_gene": {}}
+        if self.writer is not None:
+            self.writer.begin(header)
+
+    def add(self, gene: str, bucket: Dict[str, Any]) -> None:
+        self.snapshot["items_by_gene"][gene] = bucket
+        if self.writer is not None:
+            self.writer.add(gene, bucket)
+
+    def commit(self) -> None:
+        if self.writer is not None:
+            self.writer.commit()
+
+    def abort(self) -> None:
+        if self.writer is not None:
+            self.writer.abort()
+
+def build_snapshot_for_genes(
+    genes: List[str],
+    out_path: Path,
+    cache_dir: Path,
+    max_items_per_gene: int = 500,
+    min_delay_s: float = 0.35,
+    transport: CivicTransport | None = None,
+    batch_size: int = 1,
+    cache: CacheBackend | None = None,
+    incremental: bool = False,
+    resume: bool = False,
+    fmt: str | None = None,
+    jobs: int = 1,
+    profile: str = "full",
+    encoding: str = "json",
+) -> Dict[str, Any]:
+    """Build a CIViC snapshot for `genes` and return it as a dict; if `fmt` is given, also write it to `out_path`.
+
+    Progress is checkpointed per gene next to `out_path` and cleared once the
+    snapshot is complete (written, when `fmt` is given); with `resume`, a
+    matching checkpoint from an interrupted run is picked up. With
+    `incremental`, the snapshot already at `out_path` is the starting point:
+    each requested gene's live `totalCount` is probed, genes whose count
+    still matches are kept as-is, changed or new genes are refetched
+    (bypassing cached pages for changed ones), and genes not requested this
+    time are carried over.
+
+    With `jobs > 1`, genes are paged concurrently under one shared rate
+    limit; buckets are still assembled in sorted gene order, so the snapshot
+    content does not depend on `jobs`. Progress and throughput are reported
+    through `log_event` (`civic.sync.progress`, `civic.sync.done`).
+    `profile` picks the node fields fetched (recorded in the header) and
+    `encoding` how the file is stored (see `codec.ENCODINGS`).
+
+    This keeps the whole snapshot in memory; use `sync_snapshot` to stream
+    large panels straight to disk.
+    """
+    sink = _CollectSink(open_snapshot_writer(out_path, fmt, encoding=encoding) if fmt else None)
+    _sync_genes(
+        genes, out_path, cache_dir, sink,
+        max_items_per_gene=max_items_per_gene, min_delay_s=min_delay_s, transport=transport,
+        batch_size=batch_size, cache=cache, incremental=incremental, resume=resume, jobs=jobs, profile=profile,
+    )
+    return sink.snapshot
+
+def sync_snapshot(
+    genes: List[str],
+    out_path: Path,
+    cache_dir: Path,
+    fmt: str = "v1",
+    max_items_per_gene: int = 500,
+    min_delay_s: float = 0.35,
+    transport: CivicTransport | None = None,
+    batch_size: int = 1,
+    cache: CacheBackend | None = None,
+    incremental: bool = False,
+    resume: bool = False,
+    jobs: int = 1,
+    profile: str = "full",
+    encoding: str = "json",
+) -> Dict[str, Any]:
+    """Like `build_snapshot_for_genes`, but streams each gene to `out_path` as it completes.
+
+    Memory stays bounded by the genes in flight (about `2 * jobs`) instead
+    of the whole panel. The file appears atomically when the sync finishes.
+    Returns the snapshot header.
+    """
+    return _sync_genes(
+        genes, out_path, cache_dir, open_snapshot_writer(out_path, fmt, encoding=encoding),
+        max_items_per_gene=max_items_per_gene, min_delay_s=min_delay_s, transport=transport,
+        batch_size=batch_size, cache=cache, incremental=incremental, resume=resume, jobs=jobs, profile=profile,
+    )
+
+SCHEMA_V1 = "civic_snapshot_v1"
+SCHEMA_V2 = "civic_snapshot_v2"
+SNAPSHOT_FORMATS = ("v1", "v2")
+
+# v2 layout: MAGIC, per-gene blocks, header JSON (incl. gene -> [offset, length]
+# index and gene -> `bucket_summary`), then a fixed trailer:
+# <header offset:u64><header length:u64>MAGIC. Putting the index last lets
+# blocks be appended as genes finish; the summaries let incremental syncs
+# compare and carry over genes without decoding their blocks.
+V2_MAGIC = b"CIVSNAP2"
+_V2_TRAILER = struct.Struct("<QQ8s")
+V2_COMPRESSIONS = ("none", "zlib", "zstd")
+_V2_BLOCK_COMPRESSION = {"json": "none", "compact": "none", "gzip": "zlib", "zstd": "zstd"}
+
+class SnapshotV1:
+    """Whole-file `civic_snapshot_v1` JSON, exposed through the snapshot reader interface."""
+
+    format = "v1"
+
+    def __init__(self, data: Dict[str, Any], path: Path | None = None) -> None:
+        self.path = path
+        self._data = data
+        self.header = {k: v for k, v in data.items() if k != "items_by_gene"}
+        self._vindex: VariantIndex | None = None
+
+    @property
+    def genes(self) -> List[str]:
+        return list((self._data.get("items_by_gene") or {}).keys())
+
+    def bucket(self, gene: str, cache: bool = True) -> Dict[str, Any]:
+        return (self._data.get("items_by_gene") or {}).get(gene) or {}
+
+    def summary(self, gene: str) -> Dict[str, Any]:
+        return bucket_summary(self.bucket(gene))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._data
+
+    def variant_index(self) -> VariantIndex:
+        if self._vindex is None:
+            self._vindex = VariantIndex(self)
+        return self._vindex
+
+    def close(self) -> None:
+        pass
+
+class SnapshotV2:
+    """Memory-mapped `civic_snapshot_v2` file; gene blocks are decoded on first use."""
+
+    format = "v2"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fh = path.open("rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(V2_MAGIC)] != V2_MAGIC or len(self._mm) < len(V2_MAGIC) + _V2_TRAILER.size:
+            self.close()
+            raise ValueError(f"Not a {SCHEMA_V2} file: {path}")
+        h_off, h_len, magic = _V2_TRAILER.unpack(self._mm[-_V2_TRAILER.size:])
+        if magic != V2_MAGIC:
+            self.close()
+            raise ValueError(f"Truncated {SCHEMA_V2} file: {path}")
+        header = json.loads(self._mm[h_off:h_off + h_len].decode("utf-8"))
+        self._index: Dict[str, List[int]] = header.pop("index", {})
+        # Per-gene `bucket_summary`, absent from files written before it was added.
+        self._summary: Dict[str, Dict[str, Any]] = header.pop("summary", {})
+        self.header = header
+        self._decoded: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._vindex: VariantIndex | None = None
+
+    @property
+    def genes(self) -> List[str]:
+        return list(self._index.keys())
+
+    def block(self, gene: str) -> bytes | None:
+        """The gene's stored block, still compressed as the header's `compression` says."""
+        loc = self._index.get(gene)
+        if loc is None:
+            return None
+        off, length = loc
+        return self._mm[off:off + length]
+
+    def bucket(self, gene: str, cache: bool = True) -> Dict[str, Any]:
+        """Decode the gene's bucket; with `cache=False` it is not kept (for one-pass readers)."""
+        got = self._decoded.get(gene)
+        if got is not None:
+            return got
+        raw = self.block(gene)
+        if raw is None:
+            return {}
+        compression = self.header.get("compression")
+        if compression == "zlib":
+            raw = zlib.decompress(raw)
+        elif compression == "zstd":
+            raw = codec.decompress(raw)
+        got = json.loads(raw.decode("utf-8"))
+        if not cache:
+            return got
+        with self._lock:
+            return self._decoded.setdefault(gene, got)
+
+    def summary(self, gene: str) -> Dict[str, Any]:
+        got = self._summary.get(gene)
+        return got if got is not None else bucket_summary(self.bucket(gene, cache=False))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**self.header, "items_by_gene": {g: self.bucket(g) for g in self.genes}}
+
+    def variant_index(self) -> VariantIndex:
+        if self._vindex is None:
+            self._vindex = VariantIndex(self)
+        return self._vindex
+
+    def close(self) -> None:
+        try:
+            self._mm.close()
+        finally:
+            self._fh.close()
+
+def _is_v2(path: Path) -> bool:
+    with path.open("rb") as f:
+        return f.read(len(V2_MAGIC)) == V2_MAGIC
+
+def open_snapshot(path: Path) -> "SnapshotV1 | SnapshotV2":
+    """Open a v1 or v2 snapshot; v2 files are memory-mapped and decoded per gene."""
+    if _is_v2(path):
+        return SnapshotV2(path)
+    return SnapshotV1(codec.loads(path.read_bytes()), path=path)
+
+def _indent(text: str, n: int) -> str:
+    return text.replace("\n", "\n" + " " * n)
+
+class V1SnapshotWriter:
+    """Streams a `civic_snapshot_v1` file gene by gene.
+
+    With the default `json` encoding the output is byte-identical to
+    `json.dumps(snapshot, indent=2)`; other encodings (see `codec.ENCODINGS`)
+    write compact JSON, optionally gzip/zstd-compressed. Output goes to a
+    temp file that replaces `out_path` on `commit()`.
+    """
+
+    def __init__(self, out_path: Path, encoding: str = "json") -> None:
+        self.out_path = out_path
+        self.encoding = codec.check_encoding(encoding)
+        self.tmp = out_path.with_name(out_path.name + ".tmp")
+        self._raw: Any = None
+        self._f: Any = None
+        self._n = 0
+
+    def _dumps(self, obj: Any, depth: int) -> str:
+        if self.encoding == "json":
+            return _indent(json.dumps(obj, indent=2, ensure_ascii=False), 2 * depth)
+        return codec.dumps_text(obj, self.encoding)
+
+    def _nl(self, depth: int) -> str:
+        return "\n" + "  " * depth if self.encoding == "json" else ""
+
+    def _sep(self) -> str:
+        return ": " if self.encoding == "json" else ":"
+
+    def begin(self, header: Dict[str, Any]) -> None:
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._raw = self.tmp.open("wb")
+        self._f = codec.open_text_writer(self._raw, self.encoding)
+        self._f.write("{")
+        for k, v in header.items():
+            self._f.write(self._nl(1) + json.dumps(k, ensure_ascii=False) + self._sep() + self._dumps(v, 1) + ",")
+        self._f.write(self._nl(1) + '"items_by_gene"' + self._sep() + "{")
+
+    def add(self, gene: str, bucket: Dict[str, Any]) -> None:
+        self._f.write(("," if self._n else "") + self._nl(2) + json.dumps(gene, ensure_ascii=False) + self._sep()
+                      + self._dumps(bucket, 2))
+        self._n += 1
+
+    def commit(self) -> None:
+        self._f.write((self._nl(1) + "}" if self._n else "}") + self._nl(0) + "}")
+        self._f.close()
+        self._raw.close()
+        os.replace(self.tmp, self.out_path)
+
+    def abort(self) -> None:
+        for f in (self._f, self._raw):
+            if f is not None:
+                try:
+                    f.close()
+                except Exception:
+                    pass
+        self.tmp.unlink(missing_ok=True)
+
+class V2SnapshotWriter:
+    """Streams a `civic_snapshot_v2` file: blocks are appended as genes arrive, the index is written last."""
+
+    def __init__(self, out_path: Path, compression: str = "none") -> None:
+        if compression not in V2_COMPRESSIONS:
+            raise ValueError(f"Unsupported v2 block compression '{compression}'")
+        if compression == "zstd":
+            codec.check_encoding("zstd")
+        self.out_path = out_path
+        self.compression = compression
+        self.tmp = out_path.with_name(out_path.name + ".tmp")
+        self._f: Any = None
+        self._header: Dict[str, Any] = {}
+        self._index: Dict[str, List[int]] = {}
+        self._summary: Dict[str, Dict[str, Any]] = {}
+
+    def begin(self, header: Dict[str, Any]) -> None:
+        self.out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._header = {**header, "schema": SCHEMA_V2, "compression": self.compression}
+        self._f = self.tmp.open("wb")
+        self._f.write(V2_MAGIC)
+
+    def add(self, gene: str, bucket: Dict[str, Any]) -> None:
+        raw = json.dumps(bucket, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        if self.compression == "zlib":
+            raw = zlib.compress(raw)
+        elif self.compression == "zstd":
+            raw = codec.dumps(bucket, "zstd")
+        self._index[gene] = [self._f.tell(), len(raw)]
+        self._summary[gene] = bucket_summary(bucket)
+        self._f.write(raw)
+
+    def copy_from(self, snapshot: "SnapshotV1 | SnapshotV2", gene: str) -> bool:
+        """Copy the gene's block from a v2 snapshot with the same compression, without decoding it.
+
+        Returns False (nothing written) when the block cannot be copied as-is.
+        """
+        if not isinstance(snapshot, SnapshotV2) or snapshot.header.get("compression") != self.compression:
+            return False
+        summary = snapshot._summary.get(gene)
+        raw = snapshot.block(gene)
+        if summary is None or raw is None:
+            return False
+        self._index[gene] = [self._f.tell(), len(raw)]
+        self._summary[gene] = summary
+        self._f.write(raw)
+        return True
+
+    def commit(self) -> None:
+        h_raw = json.dumps({**self._header, "index": self._index, "summary": self._summary}, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        h_off = self._f.tell()
+        self._f.write(h_raw)
+        self._f.write(_V2_TRAILER.pack(h_off, len(h_raw), V2_MAGIC))
+        self._f.close()
+        os.replace(self.tmp, self.out_path)
+
+    def abort(self) -> None:
+        if self._f is not None:
+            self._f.close()
+        self.tmp.unlink(missing_ok=True)
+
+def open_snapshot_writer(out_path: Path, fmt: str = "v1", encoding: str = "json") -> "V1SnapshotWriter | V2SnapshotWriter":
+    """Writer for `fmt`; v2 maps `encoding` onto its per-block compression (gzip -> zlib)."""
+    if fmt == "v2":
+        return V2SnapshotWriter(out_path, compression=_V2_BLOCK_COMPRESSION[codec.check_encoding(encoding)])
+    if fmt == "v1":
+        return V1SnapshotWriter(out_path, encoding=encoding)
+    raise ValueError(f"Unknown snapshot format '{fmt}'. Expected one of {SNAPSHOT_FORMATS}")
+
+def _write_with(writer: "V1SnapshotWriter | V2SnapshotWriter", snapshot: Dict[str, Any]) -> None:
+    writer.begin({k: v for k, v in snapshot.items() if k != "items_by_gene"})
+    try:
+        for gene, bucket in (snapshot.get("items_by_gene") or {}).items():
+            writer.add(gene, bucket)
+        writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+def write_snapshot_v2(snapshot: Dict[str, Any], out_path: Path, compression: str = "none") -> None:
+    _write_with(V2SnapshotWriter(out_path, compression=compression), snapshot)
+
+def write_snapshot(snapshot: Dict[str, Any], out_path: Path, fmt: str = "v1", encoding: str = "json") -> None:
+    _write_with(open_snapshot_writer(out_path, fmt, encoding=encoding), snapshot)
 
 def load_snapshot(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    """Load a whole snapshot (v1 or v2) as a v1-shaped dict."""
+    if _is_v2(path):
+        snap = SnapshotV2(path)
+        try:
+            return snap.to_dict()
+        finally:
+            snap.close()
+    return codec.loads(path.read_bytes())
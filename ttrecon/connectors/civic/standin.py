@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import base64
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from ttrecon.connectors.civic.cache import CacheBackend
+from ttrecon.connectors.civic.snapshot import open_snapshot
+
+# A local stand-in for the CIViC GraphQL endpoint, serving `evidenceItems`
+# pages (single or aliased/batched queries) from a snapshot or a request
+# cache, with optional latency, error and 429 injection. Point a run at it
+# with TTRECON_CIVIC_ENDPOINT=http://127.0.0.1:<port>/graphql.
+
+DEFAULT_FIRST = 25
+MAX_FIRST = 100
+
+class StandinQueryError(ValueError):
+    pass
+
+# --- a tiny GraphQL subset: fields, aliases, arguments, selections --------
+
+_TOKEN = re.compile(r"\s*(\.\.\.|[A-Za-z_][A-Za-z0-9_]*|\$[A-Za-z_][A-Za-z0-9_]*|-?\d+|\"(?:[^\"\\]|\\.)*\"|[{}():,!\[\]=])")
+
+def _tokenize(text: str) -> List[str]:
+    text = re.sub(r"#[^\n]*", "", text)
+    out: List[str] = []
+    pos = 0
+    while True:
+        while pos < len(text) and text[pos].isspace():
+            pos += 1
+        if pos >= len(text):
+            break
+        m = _TOKEN.match(text, pos)
+        if m is None:
+            raise StandinQueryError(f"Unexpected character at offset {pos}")
+        out.append(m.group(1))
+        pos = m.end()
+    return out
+
+@dataclass
+class _Field:
+    name: str
+    alias: str
+    args: Dict[str, Any]
+    selection: Optional[List["_Field"]]
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self.toks = _tokenize(text)
+        self.i = 0
+
+    def _peek(self) -> Optional[str]:
+        return self.toks[self.i] if self.i < len(self.toks) else None
+
+    def _take(self, expect: Optional[str] = None) -> str:
+        tok = self._peek()
+        if tok is None or (expect is not None and tok != expect):
+            raise StandinQueryError(f"Expected {expect or 'token'}, got {tok!r}")
+        self.i += 1
+        return tok
+
+    def document(self) -> List[_Field]:
+        if self._peek() in ("query",):
+            self._take()
+            if self._peek() not in ("{", "("):
+                self._take()  # operation name
+            if self._peek() == "(":
+                depth = 0
+                while True:  # variable definitions are not needed to execute
+                    tok = self._take()
+                    depth += tok == "("
+                    depth -= tok == ")"
+                    if depth == 0:
+                        break
+        fields = self.selection()
+        if self._peek() is not None:
+            raise StandinQueryError("Only a single query operation is supported")
+        return fields
+
+    def selection(self) -> List[_Field]:
+        self._take("{")
+        fields: List[_Field] = []
+        while self._peek() != "}":
+            fields.append(self.field())
+        self._take("}")
+        return fields
+
+    def field(self) -> _Field:
+        name = self._take()
+        alias = name
+        if self._peek() == ":":
+            self._take()
+            name = self._take()
+        args: Dict[str, Any] = {}
+        if self._peek() == "(":
+            self._take()
+            while self._peek() != ")":
+                arg = self._take()
+                self._take(":")
+                args[arg] = self._take()
+                if self._peek() == ",":
+                    self._take()
+            self._take(")")
+        sel = self.selection() if self._peek() == "{" else None
+        return _Field(name=name, alias=alias, args=args, selection=sel)
+
+def _arg_value(tok: str, variables: Dict[str, Any]) -> Any:
+    if tok.startswith("$"):
+        return variables.get(tok[1:])
+    if tok.startswith('"'):
+        return json.loads(tok)
+    if tok == "null":
+        return None
+    if tok in ("true", "false"):
+        return tok == "true"
+    if re.fullmatch(r"-?\d+", tok):
+        return int(tok)
+    return tok  # enum value, e.g. ACCEPTED
+
+def _project(obj: Any, selection: Optional[List[_Field]]) -> Any:
+    if selection is None or obj is None:
+        return obj
+    if isinstance(obj, list):
+        return [_project(o, selection) for o in obj]
+    return {f.alias: _project(obj.get(f.name), f.selection) for f in selection}
+
+def encode_cursor(offset: int) -> str:
+    return base64.b64encode(str(offset).encode("ascii")).decode("ascii")
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        return int(base64.b64decode(cursor.encode("ascii")).decode("ascii"))
+    except Exception as e:
+        raise StandinQueryError(f"Invalid cursor {cursor!r}") from e
+
+# --- data -------------------------------------------------------------------
+
+def _id_order(node: Dict[str, Any]) -> Tuple[int, Any]:
+    eid = node["id"]
+    return (0, eid) if isinstance(eid, int) else (1, str(eid))
+
+class StandinData:
+    """Evidence nodes per gene (upper-cased), in the order they will be paged."""
+
+    def __init__(self, nodes_by_gene: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.nodes_by_gene = {g.upper(): list(ns) for g, ns in nodes_by_gene.items()}
+
+    @classmethod
+    def from_snapshot(cls, path: Path) -> "StandinData":
+        snap = open_snapshot(path)
+        try:
+            return cls({g: snap.bucket(g).get("nodes") or [] for g in snap.genes})
+        finally:
+            snap.close()
+
+    @classmethod
+    def from_cache(cls, cache: CacheBackend) -> "StandinData":
+        """Collect every cached evidenceItems node, de-duplicated by id, per gene."""
+        by_gene: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        for _key, data, meta in cache.items():
+            conn = ((data.get("data") or {}).get("evidenceItems")) or {}
+            default_gene = ((meta.get("variables") or {}).get("geneName") or "").upper()
+            for node in conn.get("nodes") or []:
+                gene = (((node.get("gene") or {}).get("name")) or default_gene).upper()
+                if gene and node.get("id") is not None:
+                    by_gene.setdefault(gene, {}).setdefault(node["id"], node)
+        return cls({g: sorted(ns.values(), key=_id_order) for g, ns in by_gene.items()})
+
+    def evidence_items(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        gene = (args.get("geneName") or "").upper()
+        variant = (args.get("variantName") or "").upper()
+        nodes = self.nodes_by_gene.get(gene, []) if gene else [n for ns in self.nodes_by_gene.values() for n in ns]
+        if variant:
+            nodes = [n for n in nodes if variant in (((n.get("variant") or {}).get("name")) or "").upper()]
+        start = decode_cursor(args.get("after"))
+        first = args.get("first")
+        first = DEFAULT_FIRST if first is None else max(0, min(int(first), MAX_FIRST))
+        page = nodes[start:start + first]
+        end = start + len(page)
+        return {
+            "totalCount": len(nodes),
+            "pageInfo": {
+                "startCursor": encode_cursor(start) if page else None,
+                "endCursor": encode_cursor(end) if page else None,
+                "hasNextPage": end < len(nodes),
+                "hasPreviousPage": start > 0,
+            },
+            "nodes": page,
+        }
+
+    def execute(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            fields = _Parser(query).document()
+        except StandinQueryError as e:
+            return {"errors": [{"message": f"Syntax error: {e}"}]}
+        data: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        for f in fields:
+            if f.name != "evidenceItems":
+                data[f.alias] = None
+                errors.append({"message": f"Field '{f.name}' is not served by the stand-in", "path": [f.alias]})
+                continue
+            try:
+                args = {k: _arg_value(v, variables) for k, v in f.args.items()}
+                data[f.alias] = _project(self.evidence_items(args), f.selection)
+            except (StandinQueryError, ValueError, TypeError) as e:
+                data[f.alias] = None
+                errors.append({"message": str(e), "path": [f.alias]})
+        out: Dict[str, Any] = {"data": data}
+        if errors:
+            out["errors"] = errors
+        return out
+
+# --- server -----------------------------------------------------------------
+
+@dataclass
+class Faults:
+    """Injected misbehaviour. Rates are probabilities per request."""
+
+    latency_s: float = 0.0
+    jitter_s: float = 0.0
+    error_rate: float = 0.0  # answer 503
+    rate_429: float = 0.0  # answer 429 at random
+    max_rps: float = 0.0  # answer 429 once more than this many requests arrive within 1s (0: off)
+    retry_after_s: float = 1.0
+    seed: int = 0
+
+class StandinServer:
+    """Threaded HTTP stand-in for CIViC; `endpoint` is the URL to point a transport at."""
+
+    def __init__(self, data: StandinData, host: str = "127.0.0.1", port: int = 0, faults: Faults | None = None) -> None:
+        self.data = data
+        self.faults = faults or Faults()
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._recent: Deque[float] = deque()
+        self.requests = 0
+        self.by_status: Dict[str, int] = {}
+        self.peak_rps = 0
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def _decide(self) -> Tuple[int, float]:
+        """(status, delay) for the next request; also updates counters."""
+        f = self.faults
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            self._recent.append(now)
+            while self._recent and self._recent[0] <= now - 1.0:
+                self._recent.popleft()
+            self.peak_rps = max(self.peak_rps, len(self._recent))
+            delay = f.latency_s + (self._rng.uniform(0, f.jitter_s) if f.jitter_s > 0 else 0.0)
+            roll = self._rng.random()
+            if f.max_rps and len(self._recent) > f.max_rps:
+                status = 429
+            elif roll < f.rate_429:
+                status = 429
+            elif roll < f.rate_429 + f.error_rate:
+                status = 503
+            else:
+                status = 200
+            self.by_status[str(status)] = self.by_status.get(str(status), 0) + 1
+        return status, delay
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] | None = None) -> None:
+                body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self) -> None:
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                status, delay = server._decide()
+                if delay > 0:
+                    time.sleep(delay)
+                if status == 429:
+                    self._send(429, {"errors": [{"message": "Too many requests"}]},
+                               {"Retry-After": f"{server.faults.retry_after_s:g}"})
+                    return
+                if status != 200:
+                    self._send(status, {"errors": [{"message": "Injected failure"}]})
+                    return
+                try:
+                    req = json.loads(raw or b"{}")
+                except ValueError:
+                    self._send(400, {"errors": [{"message": "Body is not JSON"}]})
+                    return
+                self._send(200, server.data.execute(req.get("query") or "", req.get("variables") or {}))
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": self.requests, "by_status": dict(self.by_status), "peak_rps": self.peak_rps}
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="civic-standin", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ttrecon.connectors.civic.util import CIVIC_GQL_ENDPOINT
+
+if TYPE_CHECKING:
+    from ttrecon.config import TTReconConfig
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+@dataclass
+class CallStats:
+    status: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency_s: float = 0.0
+    retries: int = 0
+
+@dataclass
+class TransportStats:
+    calls: int = 0
+    retries: int = 0
+    failures: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    latency_s: float = 0.0
+    by_status: Dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "failures": self.failures,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "latency_s": round(self.latency_s, 6),
+            "by_status": dict(self.by_status),
+        }
+
+def _retry_after_s(resp: requests.Response) -> Optional[float]:
+    v = (resp.headers.get("Retry-After") or "").strip()
+    if not v:
+        return None
+    try:
+        return max(0.0, float(v))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(v).timestamp() - time.time())
+    except Exception:
+        return None
+
+class CivicTransport:
+    """Pooled HTTP client for the CIViC GraphQL endpoint.
+
+    Keeps one `requests.Session` (keep-alive, gzip) and retries connection
+    errors and 429/5xx responses with bounded exponential backoff, honouring
+    `Retry-After` when the server sends it. Per-call and cumulative byte,
+    latency and retry counters are recorded for diagnostics.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = CIVIC_GQL_ENDPOINT,
+        max_retries: int = 4,
+        backoff_s: float = 0.5,
+        max_backoff_s: float = 30.0,
+        timeout_s: float = 30.0,
+        pool_size: int = 8,
+        session: Optional[requests.Session] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.endpoint = endpoint
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_s = max(0.0, float(backoff_s))
+        self.max_backoff_s = max(0.0, float(max_backoff_s))
+        self.timeout_s = timeout_s
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._stats = TransportStats()
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, int(pool_size)))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Content-Type": "application/json",
+        })
+        self.session = session
+
+    def _backoff(self, attempt: int, resp: Optional[requests.Response]) -> float:
+        if resp is not None:
+            ra = _retry_after_s(resp)
+            if ra is not None:
+                return min(ra, self.max_backoff_s)
+        return min(self.backoff_s * (2 ** attempt), self.max_backoff_s)
+
+    def request(self, query: str, variables: Dict[str, Any], timeout_s: Optional[float] = None) -> Tuple[Dict[str, Any], CallStats]:
+        body = json.dumps({"query": query, "variables": variables}).encode("utf-8")
+        cs = CallStats(bytes_sent=len(body))
+        t0 = time.perf_counter()
+        attempt = 0
+        try:
+            while True:
+                resp: Optional[requests.Response] = None
+                try:
+                    resp = self.session.post(self.endpoint, data=body, timeout=self.timeout_s if timeout_s is None else timeout_s)
+                except (requests.ConnectionError, requests.Timeout):
+                    if attempt >= self.max_retries:
+                        raise
+                else:
+                    cs.status = resp.status_code
+                    if resp.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                        resp.raise_for_status()
+                        wire = resp.headers.get("Content-Length")
+                        cs.bytes_received = int(wire) if wire and wire.isdigit() else len(resp.content)
+                        return resp.json(), cs
+                self._sleep(self._backoff(attempt, resp))
+                attempt += 1
+                cs.retries = attempt
+        except Exception:
+            with self._lock:
+                self._stats.failures += 1
+            raise
+        finally:
+            cs.latency_s = time.perf_counter() - t0
+            with self._lock:
+                st = self._stats
+                st.calls += 1
+                st.retries += cs.retries
+                st.bytes_sent += cs.bytes_sent
+                st.bytes_received += cs.bytes_received
+                st.latency_s += cs.latency_s
+                k = str(cs.status)
+                st.by_status[k] = st.by_status.get(k, 0) + 1
+
+    def post(self, query: str, variables: Dict[str, Any], timeout_s: Optional[float] = None) -> Dict[str, Any]:
+        data, _ = self.request(query, variables, timeout_s=timeout_s)
+        return data
+
+    def stats(self) -> TransportStats:
+        with self._lock:
+            st = self._stats
+            return TransportStats(
+                calls=st.calls,
+                retries=st.retries,
+                failures=st.failures,
+                bytes_sent=st.bytes_sent,
+                bytes_received=st.bytes_received,
+                latency_s=st.latency_s,
+                by_status=dict(st.by_status),
+            )
+
+    def close(self) -> None:
+        self.session.close()
+
+_shared_lock = threading.Lock()
+_shared: Dict[Tuple[Any, ...], CivicTransport] = {}
+
+def shared_transport(
+    endpoint: str = CIVIC_GQL_ENDPOINT,
+    max_retries: int = 4,
+    timeout_s: float = 30.0,
+    pool_size: int = 16,
+) -> CivicTransport:
+    """Return the process-wide transport for these settings (created on first use)."""
+    key = (endpoint, int(max_retries), float(timeout_s), int(pool_size))
+    with _shared_lock:
+        t = _shared.get(key)
+        if t is None:
+            t = CivicTransport(endpoint=endpoint, max_retries=max_retries, timeout_s=timeout_s, pool_size=pool_size)
+            _shared[key] = t
+        return t
+
+def configured_transport(config: "TTReconConfig | None" = None) -> CivicTransport:
+    """The shared transport for `config`'s endpoint, retries and timeout (default: `load_config()`, i.e. the environment).
+
+    Callers that are not handed a transport use this, so `TTRECON_CIVIC_ENDPOINT`
+    and friends apply everywhere.
+    """
+    if config is None:
+        from ttrecon.config import load_config
+        config = load_config()
+    return shared_transport(
+        endpoint=config.civic_endpoint,
+        max_retries=config.civic_max_retries,
+        timeout_s=config.civic_timeout_s,
+    )
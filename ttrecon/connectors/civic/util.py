@@ -5,8 +5,6 @@ import hashlib
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
-import requests
-
 CIVIC_GQL_ENDPOINT = "https://civicdb.org/api/graphql"
 
 def hash_request(query: str, variables: Dict[str, Any]) -> str:
@@ -30,15 +28,15 @@ def save_cache(cache_json: Path, cache_meta: Path, data: Dict[str, Any], meta: D
     cache_json.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
     cache_meta.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
 
-def post_graphql(query: str, variables: Dict[str, Any], timeout_s: int = 30) -> Dict[str, Any]:
-    resp = requests.post(
-        CIVIC_GQL_ENDPOINT,
-        json={"query": query, "variables": variables},
-        headers={"Accept": "application/json"},
-        timeout=timeout_s,
-    )
-    resp.raise_for_status()
-    return resp.json()
+def post_graphql(query: str, variables: Dict[str, Any], timeout_s: Optional[float] = None, transport=None) -> Dict[str, Any]:
+    """POST one GraphQL request through `transport` (default: the configured shared transport).
+
+    `timeout_s` overrides the transport's own timeout for this call only.
+    """
+    if transport is None:
+        from ttrecon.connectors.civic.transport import configured_transport
+        transport = configured_transport()
+    return transport.post(query, variables, timeout_s=timeout_s)
 
 def evidence_link(evidence_id: int) -> str:
     return f"https://civicdb.org/links/evidence/{evidence_id}"
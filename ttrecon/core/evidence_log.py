@@ -0,0 +1,265 @@
+import itertools
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+from .models import Evidence
+
+_spool_seq = itertools.count()
+
+def _part(path: Path) -> Path:
+    # Unique per log, so runs sharing an out_dir never write the same spool file.
+    return path.with_name(f"{path.name}.{os.getpid()}.{next(_spool_seq)}.part")
+
+class EvidenceLog(Sequence[Evidence]):
+    """Evidence rows spooled to a JSONL file as they are produced, read back on demand.
+
+    Rows are appended to `path` (the run's `evidence.jsonl`) as soon as they
+    arrive, and only their byte offsets stay in memory. The log behaves like a
+    read-only list: iteration streams the file, and indexing seeks to one row
+    (recently read rows are kept in a small LRU). Peak memory therefore
+    depends on the largest row rather than on the total evidence.
+
+    With `nodes_path` the log is written in normalized form: each CIViC node
+    (`payload["civic"]`) is written once to that side table (JSONL, one node
+    per line) and rows reference it as `{"$ref": "<node id>"}`. Rows read
+    back have their references resolved to one shared copy of each node, so
+    memory and file size grow with unique nodes rather than with matches.
+
+    A new log is spooled to a `<path>.<pid>.<n>.part` file and renamed
+    to `path` when sealed, so `path` never holds a partial log; `abort()`
+    discards the spool of a log that will not be sealed.
+    """
+
+    def __init__(self, path: Path, cache_rows: int = 256, nodes_path: Optional[Path] = None,
+                 compact: bool = False) -> None:
+        self.path = path
+        self.nodes_path = nodes_path
+        self._separators = (",", ":") if compact else None
+        self._publish: Optional[Tuple[Path, Optional[Path]]] = None  # renamed to these by seal()
+        self._scratch = False  # files removed by close()
+        self._nodes: Dict[str, Dict[str, Any]] = {}
+        self._nodes_writer: Optional[IO[bytes]] = None
+        self._offsets: List[int] = []
+        self._end = 0
+        self._writer: Optional[IO[bytes]] = None
+        self._reader: Optional[IO[bytes]] = None
+        self._cache: "OrderedDict[int, Evidence]" = OrderedDict()
+        self._cache_rows = max(0, int(cache_rows))
+        self._lock = threading.Lock()  # indexed reads share one file handle
+
+    @classmethod
+    def create(cls, path: Path, nodes_path: Optional[Path] = None, compact: bool = False,
+               publish: bool = True) -> "EvidenceLog":
+        """Start a new, empty log for `path` (replacing any existing file once sealed).
+
+        With `publish=False` the log is a scratch file that is never renamed
+        to `path` and is removed by `close()` (e.g. when the output is
+        written gzipped instead).
+        """
+        log = cls(_part(path), nodes_path=nodes_path and _part(nodes_path), compact=compact)
+        log._set_target(path, nodes_path, publish)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            log._writer = log.path.open("wb")
+            if log.nodes_path is not None:
+                log._nodes_writer = log.nodes_path.open("wb")
+        except BaseException:
+            log.abort()
+            raise
+        return log
+
+    @classmethod
+    def restore(cls, src: Path, path: Path, src_nodes: Optional[Path] = None, nodes_path: Optional[Path] = None,
+                publish: bool = True) -> "EvidenceLog":
+        """A sealed log for `path` holding a copy of the log file `src` (e.g. from the stage cache)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part, nodes_part = _part(path), nodes_path and _part(nodes_path)
+        try:
+            shutil.copyfile(src, part)
+            if src_nodes is not None and nodes_part is not None:
+                shutil.copyfile(src_nodes, nodes_part)
+            log = cls.open(part, nodes_path=nodes_part)
+        except BaseException:
+            for p in (part, nodes_part):
+                if p is not None:
+                    p.unlink(missing_ok=True)
+            raise
+        log._set_target(path, nodes_path, publish)
+        log.seal()
+        return log
+
+    def _set_target(self, path: Path, nodes_path: Optional[Path], publish: bool) -> None:
+        if publish:
+            self._publish = (path, nodes_path)
+        else:
+            self._scratch = True
+
+    @classmethod
+    def open(cls, path: Path, nodes_path: Optional[Path] = None) -> "EvidenceLog":
+        """Index an existing JSONL file (one scan for line offsets) and load its node table, if any."""
+        log = cls(path, nodes_path=nodes_path)
+        if nodes_path is not None and nodes_path.exists():
+            with nodes_path.open("rb") as f:
+                for line in f:
+                    if line.strip():
+                        node = json.loads(line)
+                        log._nodes[str(node.get("id"))] = node
+        with path.open("rb") as f:
+            pos = 0
+            for line in f:
+                if line.strip():
+                    log._offsets.append(pos)
+                pos += len(line)
+        log._end = pos
+        return log
+
+    def append(self, ev: Evidence) -> None:
+        if self._writer is None:
+            raise ValueError(f"EvidenceLog {self.path} is closed for writing")
+        line = (json.dumps(self._encode(ev), ensure_ascii=False, separators=self._separators) + "\n").encode("utf-8")
+        self._offsets.append(self._end)
+        self._writer.write(line)
+        self._end += len(line)
+
+    def extend(self, rows: Iterable[Evidence]) -> None:
+        for ev in rows:
+            self.append(ev)
+
+    def _encode(self, ev: Evidence) -> Dict[str, Any]:
+        node = (ev.payload or {}).get("civic")
+        if self._nodes_writer is None or not isinstance(node, dict) or node.get("id") is None:
+            return ev.model_dump()
+        key = str(node["id"])
+        cur = self._nodes.get(key)
+        if cur is None:
+            self._nodes_writer.write((json.dumps(node, ensure_ascii=False, separators=self._separators) + "\n").encode("utf-8"))
+            self._nodes[key] = cur = node
+        if cur is not node and cur != node:
+            return ev.model_dump()  # same id, different content: keep this one inline
+        row = ev.model_dump(exclude={"payload"})
+        row["payload"] = {**ev.payload, "civic": {"$ref": key}}
+        return row
+
+    def _decode(self, line: bytes) -> Evidence:
+        row = json.loads(line)
+        payload = row.get("payload") or {}
+        ref = payload.get("civic")
+        if isinstance(ref, dict) and len(ref) == 1 and "$ref" in ref and ref["$ref"] in self._nodes:
+            payload["civic"] = self._nodes[ref["$ref"]]
+        return Evidence.model_validate(row)
+
+    def seal(self) -> None:
+        """Finish writing; the file is complete (and renamed into place) and the log becomes read-only."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._nodes_writer is not None:
+            self._nodes_writer.close()
+            self._nodes_writer = None
+        if self._publish is not None:
+            path, nodes_path = self._publish
+            with self._lock:
+                self._close_reader()
+                if self.nodes_path is not None and nodes_path is not None:
+                    os.replace(self.nodes_path, nodes_path)
+                    self.nodes_path = nodes_path
+                os.replace(self.path, path)
+                self.path = path
+            self._publish = None
+
+    def _close_reader(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def abort(self) -> None:
+        """Stop writing and remove the spool (and scratch) files; an already published log is just closed."""
+        for w in (self._writer, self._nodes_writer):
+            if w is not None:
+                w.close()
+        self._writer = self._nodes_writer = None
+        if self._publish is not None:
+            self._publish = None
+            self._scratch = True
+        self.close()
+
+    def close(self) -> None:
+        self.seal()
+        with self._lock:
+            self._close_reader()
+            self._cache.clear()
+            if self._scratch:
+                for p in (self.path, self.nodes_path):
+                    if p is not None:
+                        p.unlink(missing_ok=True)
+
+    def _flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def _row(self, i: int) -> Evidence:
+        with self._lock:
+            ev = self._cache.get(i)
+            if ev is not None:
+                self._cache.move_to_end(i)
+                return ev
+            self._flush()
+            if self._reader is None:
+                self._reader = self.path.open("rb")
+            self._reader.seek(self._offsets[i])
+            ev = self._decode(self._reader.readline())
+            if self._cache_rows:
+                self._cache[i] = ev
+                while len(self._cache) > self._cache_rows:
+                    self._cache.popitem(last=False)
+            return ev
+
+    @overload
+    def __getitem__(self, i: int) -> Evidence: ...
+    @overload
+    def __getitem__(self, i: slice) -> List[Evidence]: ...
+    def __getitem__(self, i: Union[int, slice]) -> Union[Evidence, List[Evidence]]:
+        if isinstance(i, slice):
+            return [self._row(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("evidence index out of range")
+        return self._row(i)
+
+    def __iter__(self) -> Iterator[Evidence]:
+        self._flush()
+        n = len(self)
+        with self.path.open("rb") as f:
+            for _ in range(n):
+                line = f.readline()
+                while line and not line.strip():
+                    line = f.readline()
+                yield self._decode(line)
+
+    def iter_rows(self) -> Iterator[bytes]:
+        """The raw JSONL lines (no parsing), e.g. for hashing or copying."""
+        self._flush()
+        with self.path.open("rb") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+
+    def iter_node_rows(self) -> Iterator[bytes]:
+        """The raw lines of the node side table (nothing for an inline log)."""
+        if self.nodes_path is None or not self.nodes_path.exists():
+            return
+        if self._nodes_writer is not None:
+            self._nodes_writer.flush()
+        with self.nodes_path.open("rb") as f:
+            for line in f:
+                if line.strip():
+                    yield line
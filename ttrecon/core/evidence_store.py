@@ -0,0 +1,128 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+from .models import Evidence
+
+def evidence_gene(ev: Evidence) -> str:
+    """Gene an evidence row is about (upper-cased), or "" if it has none."""
+    p = ev.payload or {}
+    civic = p.get("civic") or {}
+    gene = ((civic.get("gene") or {}).get("name")) or p.get("gene") or ((p.get("query") or {}).get("geneName")) or ""
+    return str(gene).strip().upper()
+
+def evidence_variant(ev: Evidence) -> str:
+    """Variant of an evidence row (CIViC variant name, or the case's protein change), upper-cased."""
+    p = ev.payload or {}
+    civic = p.get("civic") or {}
+    var = ((civic.get("variant") or {}).get("name")) or p.get("protein_change") or ""
+    return str(var).strip().upper()
+
+def evidence_civic_id(ev: Evidence) -> Optional[str]:
+    eid = ((ev.payload or {}).get("civic") or {}).get("id")
+    return None if eid is None else str(eid)
+
+class EvidenceStore(Sequence[Evidence]):
+    """Evidence rows plus secondary indexes by source, kind, gene, variant and CIViC id.
+
+    Wraps the run's evidence (a list or an `EvidenceLog`) and indexes rows as
+    they are added, so lookups cost O(matches) instead of a scan. It is a
+    read-only sequence in insertion order, so packs written against
+    `List[Evidence]` keep working; packs that know about the store can call
+    `select(...)` instead of filtering.
+    """
+
+    def __init__(self, rows: Optional[Sequence[Evidence]] = None) -> None:
+        # A list or an EvidenceLog: a sequence that also has append().
+        self.rows: Any = rows if rows is not None else []
+        self._by: Dict[str, Dict[str, List[int]]] = {"source": {}, "kind": {}, "gene": {}, "variant": {}, "civic_id": {}}
+        self._by_id: Dict[str, int] = {}
+        self._ids: List[str] = []  # evid_id by position, so id lookups never touch the rows
+        for i, ev in enumerate(self.rows):
+            self._index(i, ev)
+
+    def _index(self, i: int, ev: Evidence) -> None:
+        keys = {
+            "source": ev.source,
+            "kind": ev.kind,
+            "gene": evidence_gene(ev),
+            "variant": evidence_variant(ev),
+            "civic_id": evidence_civic_id(ev),
+        }
+        for name, key in keys.items():
+            if key:
+                self._by[name].setdefault(key, []).append(i)
+        self._by_id.setdefault(ev.evid_id, i)
+        self._ids.append(ev.evid_id)
+
+    def append(self, ev: Evidence) -> None:
+        self.rows.append(ev)
+        self._index(len(self.rows) - 1, ev)
+
+    def extend(self, rows: Iterable[Evidence]) -> None:
+        for ev in rows:
+            self.append(ev)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    @overload
+    def __getitem__(self, i: int) -> Evidence: ...
+    @overload
+    def __getitem__(self, i: slice) -> Sequence[Evidence]: ...
+    def __getitem__(self, i: Union[int, slice]) -> Union[Evidence, Sequence[Evidence]]:
+        return self.rows[i]
+
+    def __iter__(self) -> Iterator[Evidence]:
+        return iter(self.rows)
+
+    def _positions(self, source: Optional[str], kind: Optional[str], gene: Optional[str],
+                   variant: Optional[str], civic_id: Any) -> Optional[List[int]]:
+        wanted = {
+            "source": source,
+            "kind": kind,
+            "gene": gene.strip().upper() if gene else gene,
+            "variant": variant.strip().upper() if variant else variant,
+            "civic_id": None if civic_id is None else str(civic_id),
+        }
+        lists = [self._by[name].get(key, []) for name, key in wanted.items() if key is not None]
+        if not lists:
+            return None
+        lists.sort(key=len)
+        if len(lists) == 1:
+            return lists[0]
+        rest = [set(p) for p in lists[1:]]
+        return [i for i in lists[0] if all(i in r for r in rest)]
+
+    def select(self, source: Optional[str] = None, kind: Optional[str] = None, gene: Optional[str] = None,
+               variant: Optional[str] = None, civic_id: Any = None) -> List[Evidence]:
+        """Rows matching every given key, in insertion order (all rows if no key is given)."""
+        pos = self._positions(source, kind, gene, variant, civic_id)
+        if pos is None:
+            return list(self.rows)
+        return [self.rows[i] for i in pos]
+
+    def ids(self, source: Optional[str] = None, kind: Optional[str] = None, gene: Optional[str] = None,
+            variant: Optional[str] = None, civic_id: Any = None) -> List[str]:
+        """`evid_id`s of `select(...)`, without reading the rows."""
+        pos = self._positions(source, kind, gene, variant, civic_id)
+        return list(self._ids) if pos is None else [self._ids[i] for i in pos]
+
+    def get(self, evid_id: str) -> Optional[Evidence]:
+        i = self._by_id.get(evid_id)
+        return None if i is None else self.rows[i]
+
+    def genes(self) -> List[str]:
+        return sorted(self._by["gene"])
+
+    # Lifecycle of the underlying EvidenceLog, when there is one.
+
+    def seal(self) -> None:
+        if hasattr(self.rows, "seal"):
+            self.rows.seal()
+
+    def close(self) -> None:
+        if hasattr(self.rows, "close"):
+            self.rows.close()
+
+    def abort(self) -> None:
+        if hasattr(self.rows, "abort"):
+            self.rows.abort()
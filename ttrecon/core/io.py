@@ -1,19 +1,85 @@
+import gzip
 import json
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Iterable
+from typing import IO, Any, Iterable, Iterator
 
-def write_json(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8")
+# Every writer streams into a temporary file next to the target and renames
+# it into place when done, so readers see either the previous file or the
+# complete new one, never a partial write. `compact=True` drops indentation
+# and the spaces after separators.
 
-def write_json_model(path: Path, model: Any) -> None:
-    write_json(path, model.model_dump())
+def _dumps(obj: Any, compact: bool, indent: int | None = 2) -> str:
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(obj, indent=indent, ensure_ascii=False)
 
-def write_json_models(path: Path, models: Iterable[Any]) -> None:
-    write_json(path, [m.model_dump() for m in models])
+@contextmanager
+def atomic_open(path: Path, mode: str = "w", compress: bool = False) -> Iterator[IO[Any]]:
+    """Open a temporary file for writing that replaces `path` only if the block succeeds.
 
-def write_jsonl(path: Path, rows: Iterable[Any]) -> None:
+    `mode` is "w" (text, UTF-8) or "wb"; with `compress` the data is gzipped.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp.open("wb") as raw:
+            # No file name and mtime=0 in the gzip header, so the bytes are reproducible.
+            out: IO[bytes] = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) if compress else raw
+            try:
+                yield _Utf8Writer(out) if mode == "w" else out
+            finally:
+                out.close()
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+class _Utf8Writer:
+    """Minimal text writer over a binary stream (no flushes of its own, unlike TextIOWrapper)."""
+
+    def __init__(self, out: IO[bytes]) -> None:
+        self._out = out
+
+    def write(self, s: str) -> int:
+        self._out.write(s.encode("utf-8"))
+        return len(s)
+
+def write_text(path: Path, chunks: Iterable[str]) -> None:
+    """Write text produced in pieces (e.g. a template's `generate()`), atomically."""
+    with atomic_open(path) as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+def write_json(path: Path, obj: Any, compact: bool = False) -> None:
+    with atomic_open(path) as f:
+        f.write(_dumps(obj, compact))
+
+def write_json_model(path: Path, model: Any, compact: bool = False) -> None:
+    write_json(path, model.model_dump(), compact=compact)
+
+def write_json_models(path: Path, models: Iterable[Any], compact: bool = False) -> None:
+    """A JSON array of models, dumped one at a time (same bytes as `write_json` of the whole list)."""
+    with atomic_open(path) as f:
+        first = True
+        for m in models:
+            item = _dumps(m.model_dump(), compact)
+            if compact:
+                f.write(("[" if first else ",") + item)
+            else:
+                f.write(("[\n  " if first else ",\n  ") + item.replace("\n", "\n  "))
+            first = False
+        f.write("[]" if first else ("]" if compact else "\n]"))
+
+def write_jsonl(path: Path, rows: Iterable[Any], compact: bool = False, compress: bool = False) -> None:
+    with atomic_open(path, compress=compress) as f:
         for row in rows:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.write(_dumps(row, compact, indent=None) + "\n")
+
+def write_lines(path: Path, lines: Iterable[bytes], compress: bool = False) -> None:
+    """Copy already-encoded lines (e.g. an `EvidenceLog`'s rows) to `path`, optionally gzipped."""
+    with atomic_open(path, mode="wb", compress=compress) as f:
+        for line in lines:
+            f.write(line)
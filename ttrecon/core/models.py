@@ -2,7 +2,7 @@ from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
 AlterationType = Literal["SNV", "INDEL", "FUSION", "CNV", "EXPRESSION"]
-ClaimType = Literal["MECHANISM", "SENSITIVITY", "RESISTANCE", "NOTE"]
+ClaimType = Literal["MECHANISM", "SENSITIVITY", "RESISTANCE", "NOTE", "EVIDENCE"]
 
 class Alteration(BaseModel):
     gene: str
@@ -43,7 +43,7 @@ class Claim(BaseModel):
     confidence: float = 0.0
     evidence_ids: List[str] = Field(default_factory=list)
     feature_ids: List[str] = Field(default_factory=list)
-    generated_by: Literal["rule", "ml", "llm"] = "rule"
+    generated_by: Literal["rule", "ml", "llm", "civic"] = "rule"
     tags: List[str] = Field(default_factory=list)
 
 class Report(BaseModel):
@@ -54,6 +54,11 @@ class Report(BaseModel):
     claims_ranked: List[Claim]
     limitations: List[str] = Field(default_factory=list)
 
+class StageTiming(BaseModel):
+    wall_s: float
+    cpu_s: float
+    counts: Dict[str, Any] = Field(default_factory=dict)
+
 class RunManifest(BaseModel):
     run_id: str
     version: str
@@ -63,3 +68,41 @@ class RunManifest(BaseModel):
     started_utc: str
     finished_utc: str
     outputs: Dict[str, str] = Field(default_factory=dict)
+    case_id: Optional[str] = None
+    timings: Dict[str, StageTiming] = Field(default_factory=dict)
+    stage_keys: Dict[str, str] = Field(default_factory=dict)
+
+class MultiRunManifest(BaseModel):
+    run_id: str
+    version: str
+    targets: List[str]
+    case_id: str
+    case_path: str
+    case_sha256: str
+    started_utc: str
+    finished_utc: str
+    outputs: Dict[str, str] = Field(default_factory=dict)
+    runs: Dict[str, RunManifest] = Field(default_factory=dict)
+    timings: Dict[str, StageTiming] = Field(default_factory=dict)
+
+class BatchCaseResult(BaseModel):
+    name: str
+    source: str
+    status: Literal["ok", "failed"]
+    case_id: Optional[str] = None
+    run_id: Optional[str] = None
+    out_dir: Optional[str] = None
+    error: Optional[str] = None
+    elapsed_s: float = 0.0
+
+class BatchManifest(BaseModel):
+    version: str
+    target: str
+    cases_spec: str
+    workers: int
+    started_utc: str
+    finished_utc: str
+    total: int = 0
+    ok: int = 0
+    failed: int = 0
+    cases: List[BatchCaseResult] = Field(default_factory=list)
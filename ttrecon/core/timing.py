@@ -0,0 +1,61 @@
+import cProfile
+import io
+import logging
+import pstats
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from .models import StageTiming
+
+class StageTimer:
+    """Wall/CPU time and item counts per pipeline stage, in the order stages ran.
+
+    Use `with timer.stage("rules") as counts: ...; counts["claims"] = n`.
+    CPU time is process-wide (`time.process_time`), so it includes worker
+    threads started by the stage. Each finished stage is also logged as a
+    `run.stage` event when a logger is given.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, **context: Any) -> None:
+        self.logger = logger
+        self.context = context
+        self.stages: Dict[str, StageTiming] = {}
+
+    @contextmanager
+    def stage(self, name: str, **counts: Any) -> Iterator[Dict[str, Any]]:
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield counts
+        finally:
+            self.record(name, time.perf_counter() - wall0, time.process_time() - cpu0, **counts)
+
+    def record(self, name: str, wall_s: float, cpu_s: float, **counts: Any) -> None:
+        st = StageTiming(wall_s=round(wall_s, 6), cpu_s=round(cpu_s, 6), counts=counts)
+        self.stages[name] = st
+        if self.logger is not None:
+            from ttrecon.logging import log_event
+            log_event(self.logger, "run.stage", stage=name, **self.context,
+                      wall_s=st.wall_s, cpu_s=st.cpu_s, **counts)
+
+    def child(self, **context: Any) -> "StageTimer":
+        """A timer that starts with a copy of this one's stages (e.g. per target after shared stages)."""
+        out = StageTimer(self.logger, **{**self.context, **context})
+        out.stages = {k: v.model_copy(deep=True) for k, v in self.stages.items()}
+        return out
+
+@contextmanager
+def profile_to(out_dir: Path, name: str = "profile", top: int = 40) -> Iterator[cProfile.Profile]:
+    """Run the block under cProfile; write `<name>.pstats` and a cumulative-time `<name>.txt` to `out_dir`."""
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield prof
+    finally:
+        prof.disable()
+        out_dir.mkdir(parents=True, exist_ok=True)
+        prof.dump_stats(str(out_dir / f"{name}.pstats"))
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+        (out_dir / f"{name}.txt").write_text(buf.getvalue(), encoding="utf-8")
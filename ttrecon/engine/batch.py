@@ -0,0 +1,221 @@
+import glob
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ttrecon.config import TTReconConfig
+from ttrecon.core.ids import sha256_hex
+from ttrecon.core.io import write_json_model
+from ttrecon.core.models import BatchCaseResult, BatchManifest, Case
+from ttrecon.core.provenance import utc_now_iso
+from ttrecon.engine.orchestrator import run_pipeline, run_targets
+from ttrecon.ingest.case_loader import is_case_array, iter_case_records, parse_case_json
+from ttrecon.logging import get_logger, log_event
+from ttrecon.targets.registry import is_multi_target, load_rules_callable, resolve_targets
+from ttrecon.version import __version__
+
+@dataclass(frozen=True)
+class CaseSource:
+    """One case to run: a JSON file, or one record of a JSONL file or JSON array (`text`).
+
+    Records read by `iter_case_records` carry their parsed `case`, or the
+    `error` that rejected them.
+    """
+    name: str  # unique within the batch; names the case's output directory
+    source: str  # path, or path:line for records of a multi-case file
+    path: Path
+    text: Optional[str] = None
+    case: Optional[Case] = None
+    error: Optional[str] = None
+
+def discover_cases(spec: str) -> Iterator[CaseSource]:
+    """Cases from a directory (*.json), a JSONL file (one case per line), a JSON file or array of cases, or a glob."""
+    p = Path(spec)
+    if p.is_file() and (p.suffix.lower() == ".jsonl" or is_case_array(p)):
+        by_line = p.suffix.lower() == ".jsonl"
+        for rec in iter_case_records(p):
+            n = rec.line if by_line else rec.index
+            yield CaseSource(f"{p.stem}_{n:06d}", f"{p}:{rec.line}", p, rec.text, rec.case, rec.error)
+        return
+
+    if p.is_dir():
+        files = sorted(p.glob("*.json"))
+    elif p.is_file():
+        files = [p]
+    else:
+        files = sorted(Path(x) for x in glob.glob(spec, recursive=True) if Path(x).is_file())
+    seen: Set[str] = set()
+    for f in files:
+        name, n = f.stem, 1
+        while name in seen:
+            n += 1
+            name = f"{f.stem}_{n}"
+        seen.add(name)
+        yield CaseSource(name, str(f), f)
+
+# Per-process state, set once by _init_worker so every case in a worker
+# reuses the imported modules, resolved pack and opened CIViC snapshot.
+_STATE: Dict[str, Any] = {}
+
+def warm_up(config: TTReconConfig, target: str, run_options: Dict[str, Any]) -> None:
+    """Import the selected target packs and the report renderer, and open the CIViC snapshot if one is used."""
+    for target_name in resolve_targets(config.targets_dir, target):
+        load_rules_callable(target_name)
+    from ttrecon.report.render_md import jinja_environment
+    jinja_environment()
+
+    civic_on = run_options.get("civic") or config.civic_enabled
+    source = (run_options.get("civic_source") or config.civic_source or "").strip().lower()
+    if civic_on and source == "snapshot":
+        from ttrecon.connectors.civic.registry import default_snapshot_registry
+        snap = run_options.get("civic_snapshot") or config.civic_snapshot_path
+        try:
+            default_snapshot_registry().get(Path(snap))
+        except OSError:
+            pass  # reported per case by run_pipeline
+
+def _init_worker(config: TTReconConfig, target: str, run_options: Dict[str, Any]) -> None:
+    _STATE.update(config=config, target=target, run_options=run_options)
+    warm_up(config, target, run_options)
+
+class _RejectedRecord(Exception):
+    """A record `iter_case_records` could not parse or validate; the message is its error."""
+
+def _lost(src: CaseSource, out_root: Path, error: BaseException) -> BatchCaseResult:
+    """A case that never reported back from the process pool."""
+    return BatchCaseResult(
+        name=src.name, source=src.source, status="failed",
+        case_id=src.case.case_id if src.case is not None else None,
+        out_dir=str(out_root / src.name), error=f"{type(error).__name__}: {error}",
+    )
+
+def _run_one(src: CaseSource, out_root: Path) -> BatchCaseResult:
+    t0 = time.perf_counter()
+    out_dir = out_root / src.name
+    case_id = src.case.case_id if src.case is not None else None
+    try:
+        if src.error is not None:
+            raise _RejectedRecord(src.error)
+        case, sha = src.case, None
+        if src.text is not None:
+            if case is None:
+                case = parse_case_json(src.text)
+                case_id = case.case_id
+            sha = sha256_hex(src.text.strip().encode("utf-8"))
+        target = _STATE["target"]
+        if is_multi_target(target):
+            manifest = run_targets(
+                _STATE["config"],
+                case_path=src.path,
+                targets=target,
+                out_dir=out_dir,
+                case=case,
+                case_sha256=sha,
+                **_STATE["run_options"],
+            )
+        else:
+            manifest = run_pipeline(
+                _STATE["config"],
+                case_path=src.path,
+                target=target,
+                out_dir=out_dir,
+                case=case,
+                case_sha256=sha,
+                **_STATE["run_options"],
+            )
+        return BatchCaseResult(
+            name=src.name, source=src.source, status="ok", case_id=manifest.case_id,
+            run_id=manifest.run_id, out_dir=str(out_dir), elapsed_s=round(time.perf_counter() - t0, 6),
+        )
+    except Exception as e:
+        return BatchCaseResult(
+            name=src.name, source=src.source, status="failed", case_id=case_id, out_dir=str(out_dir),
+            error=str(e) if isinstance(e, _RejectedRecord) else f"{type(e).__name__}: {e}", elapsed_s=round(time.perf_counter() - t0, 6),
+        )
+
+def run_batch(
+    config: TTReconConfig,
+    cases: str | Iterable[CaseSource],
+    target: str,
+    out_dir: Path,
+    workers: int = 1,
+    **run_options: Any,
+) -> BatchManifest:
+    """Run many cases, each into `out_dir/<name>/`, and write `out_dir/batch_manifest.json`.
+
+    `cases` is a spec for `discover_cases` or an iterable of `CaseSource`.
+    With `workers > 1` cases run on a process pool whose workers keep their
+    imports, target pack and CIViC snapshot warm across cases; at most a few
+    cases per worker are in flight, so huge inputs are streamed. A failing
+    case is recorded in the manifest and the batch carries on; if a worker
+    dies, the cases the broken pool can no longer run are recorded as failed
+    too. The manifest is written even if the batch is interrupted. `run_options`
+    are passed to `run_pipeline` (civic, civic_mode, ...). A multi-target
+    `target` ("EGFR,ALK" or "ALL") runs each case through `run_targets`.
+    """
+    logger = get_logger()
+    started = utc_now_iso()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    spec = cases if isinstance(cases, str) else "<iterable>"
+    sources = discover_cases(cases) if isinstance(cases, str) else iter(cases)
+    workers = max(1, int(workers))
+
+    results: List[Tuple[int, BatchCaseResult]] = []
+
+    def record(i: int, res: BatchCaseResult) -> None:
+        results.append((i, res))
+        if res.status == "failed":
+            log_event(logger, "batch.case.failed", name=res.name, source=res.source, error=res.error)
+
+    try:
+        if workers == 1:
+            _init_worker(config, target, run_options)
+            for i, src in enumerate(sources):
+                record(i, _run_one(src, out_dir))
+        else:
+            window = workers * 4
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(config, target, run_options)) as pool:
+                pending: Dict[Future, Tuple[int, CaseSource]] = {}
+
+                def collect(fut: Future) -> None:
+                    i, src = pending.pop(fut)
+                    try:
+                        res = fut.result()
+                    except Exception as e:  # the worker died (BrokenProcessPool) or the case could not be sent
+                        res = _lost(src, out_dir, e)
+                    record(i, res)
+
+                for i, src in enumerate(sources):
+                    if len(pending) >= window:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for fut in done:
+                            collect(fut)
+                    try:
+                        pending[pool.submit(_run_one, src, out_dir)] = (i, src)
+                    except BrokenProcessPool as e:
+                        record(i, _lost(src, out_dir, e))
+                for fut in list(pending):
+                    collect(fut)
+    finally:
+        # Written even when the batch is cut short, so the cases that did run are on record.
+        ordered = [r for _, r in sorted(results, key=lambda x: x[0])]
+        ok = sum(1 for r in ordered if r.status == "ok")
+        manifest = BatchManifest(
+            version=__version__,
+            target=target.upper(),
+            cases_spec=spec,
+            workers=workers,
+            started_utc=started,
+            finished_utc=utc_now_iso(),
+            total=len(ordered),
+            ok=ok,
+            failed=len(ordered) - ok,
+            cases=ordered,
+        )
+        write_json_model(out_dir / "batch_manifest.json", manifest)
+    log_event(logger, "batch.done", total=manifest.total, ok=manifest.ok, failed=manifest.failed, workers=workers)
+    return manifest
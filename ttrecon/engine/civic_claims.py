@@ -1,10 +1,20 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
+from ttrecon.core.evidence_store import EvidenceStore
 from ttrecon.core.ids import stable_id, IDPrefixes
 from ttrecon.core.models import Case, Claim, Evidence, Feature
 
+def _numpy():
+    # Optional: vectorizes the promotion filters (pip install 'ttrecon[fast]').
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
 def _parse_levels(levels_csv: str) -> Set[str]:
     if not levels_csv:
         return set()
@@ -31,9 +41,57 @@ def _node_signature(node: Dict) -> Tuple[str, str, str]:
     eid = str(node.get("id") or "")
     return gene, var, eid
 
+def _civic_rows(evidence: Sequence[Evidence]) -> Sequence[Evidence]:
+    return evidence.select(source="civic", kind="annotation") if isinstance(evidence, EvidenceStore) else evidence
+
+def _civic_claim(
+    case: Case,
+    evid_id: str,
+    civic: Dict,
+    gene: str,
+    var: str,
+    eid: str,
+    rating: float,
+    level: str,
+    feat_ids: List[str],
+) -> Claim:
+    e_type = civic.get("evidenceType") or "UNKNOWN"
+    direction = civic.get("evidenceDirection") or "UNKNOWN"
+    disease = ((civic.get("disease") or {}).get("name")) or "N/A"
+    drugs = _short_drug_list(civic)
+    citation = ((civic.get("source") or {}).get("citation")) or ""
+    desc = (civic.get("description") or "").strip()
+
+    # Conservative scoring: rating is 1..5 in CIViC; map to 0..1
+    score = max(0.0, min(1.0, rating / 5.0))
+    confidence = score  # keep simple & transparent
+
+    statement = (
+        f"CIViC evidence {eid}: [{gene} {var}] {e_type} ({level}), {direction}. "
+        f"Disease: {disease}. Drugs: {drugs}. Rating: {rating}."
+    )
+    if citation:
+        statement += f" Source: {citation}."
+    if desc:
+        statement += f" Summary: {desc[:280]}" + ("…" if len(desc) > 280 else "")
+
+    claim_id = stable_id(IDPrefixes.CLAIM, case.case_id, "CIVIC", eid)
+
+    return Claim(
+        claim_id=claim_id,
+        type="EVIDENCE",
+        statement=statement,
+        score=score,
+        confidence=confidence,
+        evidence_ids=[evid_id],
+        feature_ids=feat_ids,
+        generated_by="civic",
+        tags=["CIVIC", gene] + ([var] if var else []) + ([level] if level else [])
+    )
+
 def claims_from_civic_evidence(
     case: Case,
-    evidence: List[Evidence],
+    evidence: Sequence[Evidence],
     features: List[Feature],
     min_rating: float = 0.0,
     allowed_levels_csv: str = "",
@@ -43,6 +101,8 @@ def claims_from_civic_evidence(
     This is *not* a recommender; it's an auditable summarizer:
     - Every Claim cites one CIViC evidence row by evid_id.
     - Filters can be applied via rating and evidenceLevel allowlist.
+    With an `EvidenceStore`, only the CIViC annotation rows are visited.
+    This row-at-a-time version is the reference for `promote_civic_claims`.
     """
     allowed_levels = _parse_levels(allowed_levels_csv)
     feat_ids = [f.feat_id for f in features]
@@ -50,7 +110,7 @@ def claims_from_civic_evidence(
     out: List[Claim] = []
     seen: Set[Tuple[str, str, str]] = set()
 
-    for ev in evidence:
+    for ev in _civic_rows(evidence):
         if ev.source != "civic" or ev.kind != "annotation":
             continue
 
@@ -76,38 +136,83 @@ def claims_from_civic_evidence(
         if allowed_levels and level and (level not in allowed_levels):
             continue
 
-        e_type = civic.get("evidenceType") or "UNKNOWN"
-        direction = civic.get("evidenceDirection") or "UNKNOWN"
-        disease = ((civic.get("disease") or {}).get("name")) or "N/A"
-        drugs = _short_drug_list(civic)
-        citation = ((civic.get("source") or {}).get("citation")) or ""
-        desc = (civic.get("description") or "").strip()
-
-        # Conservative scoring: rating is 1..5 in CIViC; map to 0..1
-        score = max(0.0, min(1.0, rating / 5.0))
-        confidence = score  # keep simple & transparent
-
-        statement = (
-            f"CIViC evidence {eid}: [{gene} {var}] {e_type} ({level}), {direction}. " 
-            f"Disease: {disease}. Drugs: {drugs}. Rating: {rating}."
-        )
-        if citation:
-            statement += f" Source: {citation}."
-        if desc:
-            statement += f" Summary: {desc[:280]}" + ("…" if len(desc) > 280 else "")
-
-        claim_id = stable_id(IDPrefixes.CLAIM, case.case_id, "CIVIC", eid)
-
-        out.append(Claim(
-            claim_id=claim_id,
-            type="EVIDENCE",
-            statement=statement,
-            score=score,
-            confidence=confidence,
-            evidence_ids=[ev.evid_id],
-            feature_ids=feat_ids,
-            generated_by="civic",
-            tags=["CIVIC", gene] + ([var] if var else []) + ([level] if level else [])
-        ))
+        out.append(_civic_claim(case, ev.evid_id, civic, gene, var, eid, rating, level, feat_ids))
+
+    return out
+
+@dataclass
+class CivicColumns:
+    """De-duplicated CIViC annotation rows of a run, as parallel columns.
+
+    Built once per prepared case (`civic_columns`) and shared by every
+    target's promotion, which then only filters the columns and formats the
+    surviving rows.
+    """
+    evid_id: List[str] = field(default_factory=list)
+    node: List[Dict] = field(default_factory=list)
+    gene: List[str] = field(default_factory=list)
+    variant: List[str] = field(default_factory=list)
+    eid: List[str] = field(default_factory=list)
+    rating: List[float] = field(default_factory=list)
+    level: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.evid_id)
+
+def civic_columns(evidence: Sequence[Evidence]) -> CivicColumns:
+    """Extract the promotion inputs of every CIViC annotation row, keeping the first row per node."""
+    cols = CivicColumns()
+    seen: Set[Tuple[str, str, str]] = set()
+    for ev in _civic_rows(evidence):
+        if ev.source != "civic" or ev.kind != "annotation":
+            continue
+        civic = (ev.payload or {}).get("civic") or {}
+        if not civic:
+            continue
+        sig = _node_signature(civic)
+        if not sig[2] or sig in seen:
+            continue
+        seen.add(sig)
+        cols.evid_id.append(ev.evid_id)
+        cols.node.append(civic)
+        cols.gene.append(sig[0])
+        cols.variant.append(sig[1])
+        cols.eid.append(sig[2])
+        cols.rating.append(_safe_float(civic.get("evidenceRating")))
+        cols.level.append((civic.get("evidenceLevel") or "").upper())
+    return cols
+
+def _kept(cols: CivicColumns, min_rating: float, allowed_levels: Set[str]) -> List[int]:
+    np = _numpy()
+    if np is not None and len(cols) > 0:
+        # `not rating < min` (rather than `rating >= min`) keeps NaN ratings, as the reference does.
+        mask = ~(np.asarray(cols.rating, dtype=float) < min_rating)
+        if allowed_levels:
+            level = np.asarray(cols.level, dtype=object)
+            mask &= (level == "") | np.isin(level, sorted(allowed_levels))
+        return np.flatnonzero(mask).tolist()
+    return [
+        i for i, (rating, level) in enumerate(zip(cols.rating, cols.level))
+        if not rating < min_rating and not (allowed_levels and level and level not in allowed_levels)
+    ]
+
+def promote_civic_claims(
+    case: Case,
+    columns: CivicColumns,
+    features: List[Feature],
+    min_rating: float = 0.0,
+    allowed_levels_csv: str = "",
+) -> List[Claim]:
+    """Same claims as `claims_from_civic_evidence`, from pre-extracted `CivicColumns`.
 
+    The rating and level filters run over whole columns (with NumPy when it
+    is installed), and statements are only built for the rows that pass.
+    """
+    feat_ids = [f.feat_id for f in features]
+    out: List[Claim] = []
+    for i in _kept(columns, min_rating or 0.0, _parse_levels(allowed_levels_csv)):
+        out.append(_civic_claim(
+            case, columns.evid_id[i], columns.node[i], columns.gene[i], columns.variant[i], columns.eid[i],
+            columns.rating[i], columns.level[i], feat_ids,
+        ))
     return out
@@ -1,45 +1,59 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Tuple
 
 from ttrecon.config import TTReconConfig
 from ttrecon.core.ids import stable_id, IDPrefixes
-from ttrecon.core.io import write_json_model, write_json_models, write_jsonl
-from ttrecon.core.models import Case, Evidence, Feature, Report, RunManifest
+from ttrecon.core.evidence_log import EvidenceLog
+from ttrecon.core.evidence_store import EvidenceStore
+from ttrecon.core.io import write_json_model, write_json_models, write_jsonl, write_lines
+from ttrecon.core.models import Case, Claim, Evidence, Feature, MultiRunManifest, Report, RunManifest
 from ttrecon.core.provenance import utc_now_iso, file_sha256
+from ttrecon.core.timing import StageTimer
 from ttrecon.engine.feature_builder import build_base_features
 from ttrecon.engine.scoring import rank_claims
 from ttrecon.engine.claim_builder import finalize_claims
-from ttrecon.engine.civic_claims import claims_from_civic_evidence
+from ttrecon.engine.civic_claims import CivicColumns, civic_columns, promote_civic_claims
+from ttrecon.engine.stage_cache import StageCache, cached_file_digest, pack_digest, rows_digest, stage_key
 from ttrecon.ingest.normalize import normalize_case
 from ttrecon.ingest.validators import validate_case
-from ttrecon.targets.registry import resolve_target, load_rules_callable
+from ttrecon.targets.registry import resolve_target, resolve_targets, load_rules_callable, rules_evidence_sources
+from ttrecon.logging import get_logger
 from ttrecon.version import __version__
 
-from ttrecon.connectors.civic.client import civic_enrich
+from ttrecon.connectors.civic.cache import CountingCache, open_cache
+from ttrecon.connectors.civic.client import iter_civic_enrich
+from ttrecon.connectors.civic.misses import MissLedger
+from ttrecon.connectors.civic.transport import configured_transport
 
-def run_pipeline(
-    config: TTReconConfig,
-    case_path: Path,
-    target: str,
-    out_dir: Path,
-    civic: bool = False,
-    civic_mode: str | None = None,
-    civic_source: str | None = None,
-    civic_snapshot: Path | None = None,
-    civic_claims: bool = False,
-    civic_min_rating: float | None = None,
-    civic_levels: str | None = None,
-) -> RunManifest:
-    started = utc_now_iso()
-    out_dir.mkdir(parents=True, exist_ok=True)
+CIVIC_NODES_FILE = "civic_nodes.jsonl"
+
+def _normalized(config: TTReconConfig) -> bool:
+    return (config.evidence_format or "inline").strip().lower() == "normalized"
 
-    from ttrecon.ingest.case_loader import load_case_json
-    case: Case = load_case_json(case_path)
-    case = normalize_case(case)
-    validate_case(case)
+def _nodes_path(config: TTReconConfig, evidence_path: Path) -> Path | None:
+    """Side table of a normalized `evidence.jsonl` (None for the inline format)."""
+    return evidence_path.with_name(CIVIC_NODES_FILE) if _normalized(config) else None
 
-    run_id = stable_id(IDPrefixes.RUN, case.case_id, target.upper(), started)
+@dataclass
+class _Prepared:
+    """A loaded, normalized and enriched case: everything before the target pack runs."""
+    case: Case
+    evidence: EvidenceStore  # over an EvidenceLog (evidence.jsonl) when streamed
+    features: List[Feature]
+    civic_promotion: Tuple[float, str] | None  # (min_rating, levels) when CIViC claims are promoted
+    case_sha256: str
+    timer: StageTimer
+    # Incremental mode only: the stage cache and a digest of everything the rules stage reads.
+    stage_cache: StageCache | None = None
+    inputs_digest: str | None = None
+    stage_keys: Dict[str, str] = field(default_factory=dict)
+    # CIViC promotion inputs, extracted on first use and shared by all targets.
+    civic_columns: CivicColumns | None = None
 
+def _local_evidence(case: Case, case_path: Path) -> List[Evidence]:
     evidence: List[Evidence] = []
     for i, alt in enumerate(case.alterations):
         evid_id = stable_id(
@@ -59,15 +73,98 @@ def run_pipeline(
             ref=str(case_path),
             payload=alt.model_dump(),
         ))
+    return evidence
+
+def _civic_promotion(
+    config: TTReconConfig,
+    civic_claims: bool,
+    civic_min_rating: float | None,
+    civic_levels: str | None,
+) -> Tuple[float, str] | None:
+    if not (civic_claims or config.civic_claims_enabled):
+        return None
+    mr = config.civic_claims_min_rating if civic_min_rating is None else float(civic_min_rating)
+    lv = config.civic_claims_levels if civic_levels is None else str(civic_levels or "")
+    return (mr, lv)
+
+def _civic_fingerprint(
+    config: TTReconConfig,
+    civic: bool,
+    civic_mode: str | None,
+    civic_source: str | None,
+    civic_snapshot: Path | None,
+) -> Dict[str, Any] | None:
+    """What CIViC enrichment depends on, or None when it is not reproducible (live/cache sources)."""
+    if not (civic or config.civic_enabled):
+        return {"civic": False}
+    source = (civic_source or config.civic_source or "live").strip().lower()
+    if source != "snapshot":
+        return None
+    snap = civic_snapshot or config.civic_snapshot_path
+    return {
+        "civic": True,
+        "mode": (civic_mode or config.civic_mode or "strict").strip().lower(),
+        "max_items": config.civic_max_items,
+        "snapshot": cached_file_digest(Path(snap)),
+    }
+
+def _load_case(timer: StageTimer, case_path: Path, case: Case | None) -> Case:
+    if case is None:
+        from ttrecon.ingest.case_loader import load_case_json
+        with timer.stage("case_load") as counts:
+            case = load_case_json(case_path)
+            counts["alterations"] = len(case.alterations)
+    with timer.stage("normalize", alterations=len(case.alterations)):
+        case = normalize_case(case)
+        validate_case(case)
+    return case
 
-    civic_enabled = civic or config.civic_enabled
-    if civic_enabled:
-        mode = (civic_mode or config.civic_mode or "strict").strip().lower()
-        source = (civic_source or config.civic_source or "live").strip().lower()
-        snap = civic_snapshot or config.civic_snapshot_path
-        config.civic_cache_dir.mkdir(parents=True, exist_ok=True)
-        evidence.extend(
-            civic_enrich(
+def _new_evidence(config: TTReconConfig, evidence_path: Path | None) -> EvidenceStore:
+    """Evidence streamed to `evidence_path` (a scratch spool when it is written gzipped), or kept in a list."""
+    if evidence_path is None:
+        return EvidenceStore([])
+    return EvidenceStore(EvidenceLog.create(
+        evidence_path,
+        nodes_path=_nodes_path(config, evidence_path),
+        compact=config.compact_json,
+        publish=not config.evidence_gzip,
+    ))
+
+# Per-alteration page lookups, and separately the batched prefetch's own lookups and writes.
+_CACHE_COUNTS = dict.fromkeys(
+    ("cache_hits", "cache_misses", "cache_puts", "prefetch_hits", "prefetch_misses", "prefetch_puts"), 0)
+
+def _enrich_civic(
+    config: TTReconConfig,
+    timer: StageTimer,
+    case: Case,
+    evidence: EvidenceStore,
+    civic_mode: str | None,
+    civic_source: str | None,
+    civic_snapshot: Path | None,
+    civic_jobs: int | None,
+) -> None:
+    """Append the case's CIViC evidence rows to `evidence` (the `civic_enrich` stage)."""
+    mode = (civic_mode or config.civic_mode or "strict").strip().lower()
+    source = (civic_source or config.civic_source or "live").strip().lower()
+    snap = civic_snapshot or config.civic_snapshot_path
+    config.civic_cache_dir.mkdir(parents=True, exist_ok=True)
+    transport = configured_transport(config)
+    # Snapshot runs never read the request cache, so it is not opened for them.
+    cache = None if source == "snapshot" else CountingCache(open_cache(
+        config.civic_cache_dir,
+        backend=config.civic_cache_backend,
+        default_ttl_s=config.civic_cache_ttl_s,
+        max_bytes=config.civic_cache_max_bytes,
+        encoding=config.civic_cache_encoding,
+        negative_ttl_s=config.civic_negative_ttl_s,
+    ))
+    # The transport is shared by the process, so its counters are read as deltas.
+    net0 = transport.stats()
+    try:
+        with timer.stage("civic_enrich", source=source) as counts:
+            n_before = len(evidence)
+            evidence.extend(iter_civic_enrich(
                 case,
                 cache_dir=config.civic_cache_dir,
                 mode=mode,
@@ -75,32 +172,296 @@ def run_pipeline(
                 snapshot_path=snap,
                 max_items=config.civic_max_items,
                 min_delay_s=config.civic_min_delay_s,
+                jobs=civic_jobs or config.civic_jobs,
+                rate_per_s=config.civic_rate_per_s,
+                burst=config.civic_burst,
+                transport=transport,
+                batch_size=config.civic_batch_size,
+                cache=cache,
+                profile=config.civic_query_profile,
+                ledger=MissLedger.for_cache_dir(config.civic_cache_dir) if source == "cache" else None,
+            ))
+            net1 = transport.stats()
+            counts.update(
+                evidence=len(evidence) - n_before,
+                **{**_CACHE_COUNTS, **(cache.counts() if cache is not None else {})},
+                network_calls=net1.calls - net0.calls,
+                network_retries=net1.retries - net0.retries,
+                network_s=round(net1.latency_s - net0.latency_s, 6),
+                bytes_received=net1.bytes_received - net0.bytes_received,
             )
-        )
+    finally:
+        # Runs in warm processes (run-batch workers, serve) must not leak sqlite connections.
+        if cache is not None:
+            cache.close()
 
-    features: List[Feature] = build_base_features(case, evidence)
+def _prepare_case(
+    config: TTReconConfig,
+    case_path: Path,
+    civic: bool = False,
+    civic_mode: str | None = None,
+    civic_source: str | None = None,
+    civic_snapshot: Path | None = None,
+    civic_claims: bool = False,
+    civic_min_rating: float | None = None,
+    civic_levels: str | None = None,
+    civic_jobs: int | None = None,
+    case: Case | None = None,
+    case_sha256: str | None = None,
+    timer: StageTimer | None = None,
+    stage_cache: StageCache | None = None,
+    evidence_path: Path | None = None,
+) -> _Prepared:
+    """Load, validate and enrich the case.
+
+    Evidence is indexed into an `EvidenceStore` as it is produced. With
+    `evidence_path` the rows themselves are streamed to that JSONL file
+    (an `EvidenceLog`, normalized when `config.evidence_format` says so);
+    otherwise they are kept in a list.
+    """
+    timer = timer or StageTimer()
+    case_sha256 = case_sha256 or file_sha256(case_path)
+    promote = _civic_promotion(config, civic_claims, civic_min_rating, civic_levels)
+
+    prep_key = None
+    if stage_cache is not None:
+        civic_fp = _civic_fingerprint(config, civic, civic_mode, civic_source, civic_snapshot)
+        if civic_fp is not None:
+            prep_key = stage_key(
+                "prepare", __version__, case_sha256, str(case_path), civic_fp, config.evidence_format, config.compact_json,
+            )
+            with timer.stage("stage_cache.prepare") as counts:
+                hit = stage_cache.get("prepare", prep_key)
+                cached_evidence = stage_cache.file("prepare", prep_key, "evidence.jsonl")
+                cached_nodes = _normalized(config) and stage_cache.file("prepare", prep_key, CIVIC_NODES_FILE)
+                if hit is not None and cached_evidence.exists() and (not cached_nodes or cached_nodes.exists()):
+                    if evidence_path is not None:
+                        evidence = EvidenceStore(EvidenceLog.restore(
+                            cached_evidence, evidence_path,
+                            src_nodes=cached_nodes or None, nodes_path=_nodes_path(config, evidence_path),
+                            publish=not config.evidence_gzip,
+                        ))
+                    else:
+                        evidence = EvidenceStore(list(EvidenceLog.open(cached_evidence, nodes_path=cached_nodes or None)))
+                else:
+                    hit = None
+                counts["hit"] = hit is not None
+            if hit is not None:
+                return _Prepared(
+                    case=Case.model_validate(hit["case"]),
+                    evidence=evidence,
+                    features=[Feature.model_validate(f) for f in hit["features"]],
+                    civic_promotion=promote,
+                    case_sha256=case_sha256,
+                    timer=timer,
+                    stage_cache=stage_cache,
+                    inputs_digest=hit["inputs_digest"],
+                    stage_keys={"prepare": prep_key},
+                )
 
-    target_name, _target_dir = resolve_target(config.targets_dir, target)
-    rules_fn = load_rules_callable(target_name)
-    claims = rules_fn(case, evidence, features)
+    case = _load_case(timer, case_path, case)
+    evidence = _new_evidence(config, evidence_path)
+    try:
+        with timer.stage("local_evidence") as counts:
+            evidence.extend(_local_evidence(case, case_path))
+            counts["evidence"] = len(evidence)
 
-    civic_claims_enabled = civic_claims or config.civic_claims_enabled
-    if civic_claims_enabled:
-        mr = config.civic_claims_min_rating if civic_min_rating is None else float(civic_min_rating)
-        lv = config.civic_claims_levels if civic_levels is None else str(civic_levels or "")
-        claims.extend(claims_from_civic_evidence(
-            case,
+        if civic or config.civic_enabled:
+            _enrich_civic(config, timer, case, evidence, civic_mode, civic_source, civic_snapshot, civic_jobs)
+
+        evidence.seal()
+
+        with timer.stage("base_features") as counts:
+            features: List[Feature] = build_base_features(case, evidence)
+            counts["features"] = len(features)
+
+        prep = _Prepared(
+            case=case,
             evidence=evidence,
             features=features,
-            min_rating=mr,
-            allowed_levels_csv=lv,
-        ))
+            civic_promotion=promote,
+            case_sha256=case_sha256,
+            timer=timer,
+        )
+        if stage_cache is not None:
+            case_row = case.model_dump()
+            feature_rows = [f.model_dump() for f in features]
+            log = evidence.rows if isinstance(evidence.rows, EvidenceLog) else None
+            evidence_rows = log.iter_rows() if log is not None else (e.model_dump() for e in evidence)
+            prep.stage_cache = stage_cache
+            node_rows = log.iter_node_rows() if log is not None else iter(())
+            prep.inputs_digest = stage_key(
+                case_row, rows_digest(evidence_rows), rows_digest(node_rows), rows_digest(feature_rows),
+            )
+            if prep_key is not None:
+                if log is not None:
+                    stage_cache.put_file("prepare", prep_key, "evidence.jsonl", log.path)
+                    if log.nodes_path is not None:
+                        stage_cache.put_file("prepare", prep_key, CIVIC_NODES_FILE, log.nodes_path)
+                else:
+                    tmp_log = EvidenceLog.create(
+                        stage_cache.file("prepare", prep_key, "evidence.jsonl"),
+                        nodes_path=stage_cache.file("prepare", prep_key, CIVIC_NODES_FILE) if _normalized(config) else None,
+                        compact=config.compact_json,
+                    )
+                    tmp_log.extend(evidence)
+                    tmp_log.close()
+                stage_cache.put("prepare", prep_key, {
+                    "case": case_row,
+                    "features": feature_rows,
+                    "inputs_digest": prep.inputs_digest,
+                })
+                prep.stage_keys["prepare"] = prep_key
+        return prep
+    except BaseException:
+        evidence.abort()  # no open handles or orphan spool files when enrichment fails
+        raise
+
+def _run_rules(
+    timer: StageTimer,
+    case: Case,
+    evidence: EvidenceStore,
+    base_features: List[Feature],
+    target_name: str,
+) -> Tuple[List[Feature], List[Claim]]:
+    # Packs append to `features` (and may edit them), so each gets its own copy.
+    features = [f.model_copy(deep=True) for f in base_features]
+    with timer.stage("rules") as counts:
+        rules_fn = load_rules_callable(target_name)
+        claims = rules_fn(case, evidence, features)
+        counts.update(claims=len(claims), features=len(features))
+    return features, claims
+
+def _apply_rules(timer: StageTimer, prep: _Prepared, target_name: str) -> Tuple[List[Feature], List[Claim]]:
+    features, claims = _run_rules(timer, prep.case, prep.evidence, prep.features, target_name)
+    return features, _promote_and_rank(timer, prep, features, claims)
+
+def _promote_and_rank(timer: StageTimer, prep: _Prepared, features: List[Feature], claims: List[Claim]) -> List[Claim]:
+    """CIViC promotion (when enabled) and ranking, after a pack's rules."""
+    case = prep.case
+    evidence = prep.evidence
+    if prep.civic_promotion is not None:
+        mr, lv = prep.civic_promotion
+        with timer.stage("civic_claims") as counts:
+            if prep.civic_columns is None:
+                prep.civic_columns = civic_columns(evidence)  # racing targets compute the same columns
+            promoted = promote_civic_claims(
+                case,
+                columns=prep.civic_columns,
+                features=features,
+                min_rating=mr,
+                allowed_levels_csv=lv,
+            )
+            claims.extend(promoted)
+            counts.update(civic_rows=len(prep.civic_columns), claims=len(promoted))
+
+    with timer.stage("rank") as counts:
+        claims = finalize_claims(claims)
+        claims_ranked = rank_claims(claims)
+        counts["claims"] = len(claims_ranked)
+    return claims_ranked
+
+def _write_shared(config: TTReconConfig, timer: StageTimer, prep: _Prepared, out_dir: Path) -> Dict[str, str]:
+    """Write the target-independent outputs (normalized case, evidence)."""
+    outputs: Dict[str, str] = {}
+    p_case = out_dir / "case_normalized.json"
+    with timer.stage("write.case_normalized"):
+        write_json_model(p_case, prep.case, compact=config.compact_json); outputs["case_normalized"] = str(p_case)
+
+    gz = config.evidence_gzip
+    p_evid = out_dir / ("evidence.jsonl.gz" if gz else "evidence.jsonl")
+    outputs["evidence_jsonl"] = str(p_evid)
+    log = prep.evidence.rows if isinstance(prep.evidence.rows, EvidenceLog) else None
+    if log is not None and log.path == p_evid:
+        # Streamed there during enrichment.
+        if log.nodes_path is not None:
+            outputs["civic_nodes_jsonl"] = str(log.nodes_path)
+        return outputs
+    with timer.stage("write.evidence_jsonl", items=len(prep.evidence)):
+        if log is None:
+            write_jsonl(p_evid, (e.model_dump() for e in prep.evidence), compact=config.compact_json, compress=gz)
+        else:
+            write_lines(p_evid, log.iter_rows(), compress=gz)
+            if log.nodes_path is not None:
+                p_nodes = out_dir / (CIVIC_NODES_FILE + (".gz" if gz else ""))
+                write_lines(p_nodes, log.iter_node_rows(), compress=gz)
+                outputs["civic_nodes_jsonl"] = str(p_nodes)
+    return outputs
+
+def _run_target(
+    config: TTReconConfig,
+    prep: _Prepared,
+    target: str,
+    case_path: Path,
+    out_dir: Path,
+    started: str,
+    shared_outputs: Dict[str, str] | None = None,
+) -> RunManifest:
+    """Apply one target pack to a prepared case and write its claims, report and manifest.
+
+    With `shared_outputs`, the case/evidence files were already written once
+    for several targets and are only referenced from this manifest.
+    """
+    case = prep.case
+    evidence = prep.evidence
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    target_name, target_dir = resolve_target(config.targets_dir, target)
+    timer = prep.timer.child(target=target_name)
+    stage_keys = dict(prep.stage_keys)
+
+    cached = None
+    if prep.stage_cache is not None:
+        # Rules + CIViC promotion + ranking, keyed by their inputs and the pack's files.
+        rules_key = stage_key(
+            "rules", __version__, prep.inputs_digest, target_name, pack_digest(target_dir), prep.civic_promotion,
+        )
+        stage_keys["rules"] = rules_key
+        with timer.stage("stage_cache.rules") as counts:
+            cached = prep.stage_cache.get("rules", rules_key)
+            counts["hit"] = cached is not None
+        # Same inputs, same run_id: incremental runs are reproducible.
+        run_id = stable_id(IDPrefixes.RUN, case.case_id, target_name, rules_key)
+    else:
+        run_id = stable_id(IDPrefixes.RUN, case.case_id, target_name, started)
 
-    claims = finalize_claims(claims)
-    claims_ranked = rank_claims(claims)
+    if cached is not None:
+        features = [Feature.model_validate(f) for f in cached["features"]]
+        claims_ranked = [Claim.model_validate(c) for c in cached["claims"]]
+    else:
+        features, claims_ranked = _apply_rules(timer, prep, target_name)
+        if prep.stage_cache is not None:
+            prep.stage_cache.put("rules", stage_keys["rules"], {
+                "features": [f.model_dump() for f in features],
+                "claims": [c.model_dump() for c in claims_ranked],
+            })
 
+    report = _report(run_id, target_name, case, claims_ranked)
+
+    outputs = {}
+    if shared_outputs is None:
+        outputs.update(_write_shared(config, timer, prep, out_dir))
+    else:
+        outputs.update(shared_outputs)
+
+    p_feat = out_dir / "features.json"
+    with timer.stage("write.features", items=len(features)):
+        write_json_models(p_feat, features, compact=config.compact_json); outputs["features"] = str(p_feat)
+
+    p_claims = out_dir / "claims.json"
+    with timer.stage("write.claims", items=len(claims_ranked)):
+        write_json_models(p_claims, claims_ranked, compact=config.compact_json); outputs["claims"] = str(p_claims)
+
+    from ttrecon.report.render_md import render_report_md
+    p_md = out_dir / "report.md"
+    with timer.stage("write.report_md", items=len(claims_ranked)):
+        render_report_md(report, evidence, features, p_md); outputs["report_md"] = str(p_md)
+
+    return _write_manifest(config, timer, prep, run_id, target_name, case_path, out_dir, started, outputs, stage_keys)
+
+def _report(run_id: str, target_name: str, case: Case, claims_ranked: List[Claim]) -> Report:
     overview = f"TT-RECON v{__version__} run_id={run_id} target={target_name} case={case.case_id}"
-    report = Report(
+    return Report(
         run_id=run_id,
         target=target_name,
         case_id=case.case_id,
@@ -114,39 +475,299 @@ def run_pipeline(
         ]
     )
 
-    outputs = {}
-    p_case = out_dir / "case_normalized.json"
-    write_json_model(p_case, case); outputs["case_normalized"] = str(p_case)
-
-    p_evid = out_dir / "evidence.jsonl"
-    write_jsonl(p_evid, (e.model_dump() for e in evidence)); outputs["evidence_jsonl"] = str(p_evid)
-
-    p_feat = out_dir / "features.json"
-    write_json_models(p_feat, features); outputs["features"] = str(p_feat)
-
-    p_claims = out_dir / "claims.json"
-    write_json_models(p_claims, claims_ranked); outputs["claims"] = str(p_claims)
-
-    from ttrecon.report.render_md import render_report_md
-    p_md = out_dir / "report.md"
-    render_report_md(report, evidence, features, p_md); outputs["report_md"] = str(p_md)
-
+def _write_manifest(
+    config: TTReconConfig,
+    timer: StageTimer,
+    prep: _Prepared,
+    run_id: str,
+    target_name: str,
+    case_path: Path,
+    out_dir: Path,
+    started: str,
+    outputs: Dict[str, str],
+    stage_keys: Dict[str, str],
+) -> RunManifest:
+    p_manifest = out_dir / "run_manifest.json"
+    outputs["run_manifest"] = str(p_manifest)
     finished = utc_now_iso()
     manifest = RunManifest(
         run_id=run_id,
         version=__version__,
         target=target_name,
         case_path=str(case_path),
-        case_sha256=file_sha256(case_path),
+        case_sha256=prep.case_sha256,
         started_utc=started,
         finished_utc=finished,
-        outputs=outputs
+        outputs=outputs,
+        case_id=prep.case.case_id,
+        stage_keys=stage_keys,
+        timings=dict(timer.stages),  # the manifest's own write is only logged
     )
+    with timer.stage("write.run_manifest"):
+        write_json_model(p_manifest, manifest, compact=config.compact_json)
+    return manifest
 
-    p_manifest = out_dir / "run_manifest.json"
-    write_json_model(p_manifest, manifest); outputs["run_manifest"] = str(p_manifest)
+def _stage_cache(config: TTReconConfig, incremental: bool | None) -> StageCache | None:
+    on = config.incremental if incremental is None else incremental
+    return StageCache(config.stage_cache_dir or config.cache_dir / "stages") if on else None
+
+def run_pipeline(
+    config: TTReconConfig,
+    case_path: Path,
+    target: str,
+    out_dir: Path,
+    civic: bool = False,
+    civic_mode: str | None = None,
+    civic_source: str | None = None,
+    civic_snapshot: Path | None = None,
+    civic_claims: bool = False,
+    civic_min_rating: float | None = None,
+    civic_levels: str | None = None,
+    civic_jobs: int | None = None,
+    case: Case | None = None,
+    case_sha256: str | None = None,
+    incremental: bool | None = None,
+) -> RunManifest:
+    """Run one case against one target pack and write its outputs to `out_dir`.
+
+    The case is read from `case_path` unless an already-parsed `case` is
+    given (batch runs); `case_path` is then only recorded as its source, and
+    `case_sha256` should be the digest of the record the case came from.
+    Wall/CPU time and item counts per stage go to the manifest's `timings`
+    and are logged as `run.stage` events.
 
-    manifest.outputs = outputs
-    write_json_model(p_manifest, manifest)
+    With `incremental` (default: `config.incremental`) stage outputs are
+    stored in a content-addressed cache (see `engine.stage_cache`) and reused
+    when their inputs are unchanged, and `run_id` is derived from those
+    inputs instead of the start time. The prepare stage (normalized case,
+    evidence, base features) is only cached without CIViC or with a snapshot
+    source; live and cache-only enrichment always re-runs.
+    """
+    started = utc_now_iso()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prep = _prepare_case(
+        config, case_path,
+        civic=civic, civic_mode=civic_mode, civic_source=civic_source, civic_snapshot=civic_snapshot,
+        civic_claims=civic_claims, civic_min_rating=civic_min_rating, civic_levels=civic_levels,
+        civic_jobs=civic_jobs, case=case, case_sha256=case_sha256,
+        timer=StageTimer(get_logger(), case=str(case_path)),
+        stage_cache=_stage_cache(config, incremental),
+        evidence_path=out_dir / "evidence.jsonl",
+    )
+    try:
+        return _run_target(config, prep, target, case_path, out_dir, started)
+    finally:
+        prep.evidence.close()
 
+async def run_pipeline_async(
+    config: TTReconConfig,
+    case_path: Path,
+    target: str,
+    out_dir: Path,
+    civic: bool = False,
+    civic_mode: str | None = None,
+    civic_source: str | None = None,
+    civic_snapshot: Path | None = None,
+    civic_claims: bool = False,
+    civic_min_rating: float | None = None,
+    civic_levels: str | None = None,
+    civic_jobs: int | None = None,
+    case: Case | None = None,
+    case_sha256: str | None = None,
+    incremental: bool | None = None,
+) -> RunManifest:
+    """Awaitable `run_pipeline`: the same outputs, with I/O overlapped with compute.
+
+    Blocking work runs in worker threads (`asyncio.to_thread`), so an
+    embedding application can await many runs on one event loop:
+    - the case file is read and hashed concurrently;
+    - CIViC queries for different alterations run concurrently
+      (`civic_jobs`, at least 4 unless given; the rate limit is shared and
+      row order is unchanged);
+    - a pack whose rules.py declares `EVIDENCE_SOURCES = ("local_case",)`
+      starts its rules on the case's own evidence while CIViC enrichment is
+      in flight (they are re-run if the base features turn out different);
+    - case_normalized.json, features.json, claims.json and report.md are
+      written concurrently (evidence.jsonl is streamed during enrichment).
+    With `incremental`, the run is `run_pipeline` in a worker thread.
+    """
+    if config.incremental if incremental is None else incremental:
+        return await asyncio.to_thread(
+            run_pipeline, config, case_path, target, out_dir,
+            civic=civic, civic_mode=civic_mode, civic_source=civic_source, civic_snapshot=civic_snapshot,
+            civic_claims=civic_claims, civic_min_rating=civic_min_rating, civic_levels=civic_levels,
+            civic_jobs=civic_jobs, case=case, case_sha256=case_sha256, incremental=True,
+        )
+
+    started = utc_now_iso()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    timer = StageTimer(get_logger(), case=str(case_path))
+    target_name, _ = resolve_target(config.targets_dir, target)
+    case, case_sha256 = await asyncio.gather(
+        asyncio.to_thread(_load_case, timer, case_path, case),
+        asyncio.to_thread(file_sha256, case_path) if case_sha256 is None else asyncio.sleep(0, case_sha256),
+    )
+
+    evidence = _new_evidence(config, out_dir / "evidence.jsonl")
+    early = None
+    try:
+        with timer.stage("local_evidence") as counts:
+            local_rows = _local_evidence(case, case_path)
+            evidence.extend(local_rows)
+            counts["evidence"] = len(evidence)
+
+        civic_enabled = civic or config.civic_enabled
+        sources = rules_evidence_sources(target_name)
+        early_features: List[Feature] = []
+        if civic_enabled and sources is not None and set(sources) <= {"local_case"}:
+            local = EvidenceStore(local_rows)
+            early_features = build_base_features(case, local)
+            early = asyncio.ensure_future(asyncio.to_thread(_run_rules, timer, case, local, early_features, target_name))
+
+        if civic_enabled:
+            await asyncio.to_thread(
+                _enrich_civic, config, timer, case, evidence,
+                civic_mode, civic_source, civic_snapshot, civic_jobs or max(config.civic_jobs, 4),
+            )
+        evidence.seal()
+
+        with timer.stage("base_features") as counts:
+            features = build_base_features(case, evidence)
+            counts["features"] = len(features)
+        prep = _Prepared(
+            case=case,
+            evidence=evidence,
+            features=features,
+            civic_promotion=_civic_promotion(config, civic_claims, civic_min_rating, civic_levels),
+            case_sha256=case_sha256,
+            timer=timer,
+        )
+
+        ruled = None
+        if early is not None:
+            ruled = await early
+            if features != early_features:
+                ruled = None  # the base features read CIViC evidence after all
+        if ruled is None:
+            ruled = await asyncio.to_thread(_run_rules, timer, case, evidence, features, target_name)
+        features, claims = ruled
+        claims_ranked = await asyncio.to_thread(_promote_and_rank, timer, prep, features, claims)
+
+        run_id = stable_id(IDPrefixes.RUN, case.case_id, target_name, started)
+        report = _report(run_id, target_name, case, claims_ranked)
+        outputs = await _write_outputs_async(config, timer, prep, out_dir, report, features, claims_ranked)
+        return await asyncio.to_thread(
+            _write_manifest, config, timer, prep, run_id, target_name, case_path, out_dir, started, outputs, {},
+        )
+    except BaseException:
+        if early is not None:
+            await asyncio.gather(early, return_exceptions=True)  # let early rules finish before the log closes
+        evidence.abort()
+        raise
+    finally:
+        evidence.close()
+
+async def _write_outputs_async(
+    config: TTReconConfig,
+    timer: StageTimer,
+    prep: _Prepared,
+    out_dir: Path,
+    report: Report,
+    features: List[Feature],
+    claims_ranked: List[Claim],
+) -> Dict[str, str]:
+    from ttrecon.report.render_md import render_report_md
+    p_feat, p_claims, p_md = out_dir / "features.json", out_dir / "claims.json", out_dir / "report.md"
+
+    def write_features() -> None:
+        with timer.stage("write.features", items=len(features)):
+            write_json_models(p_feat, features, compact=config.compact_json)
+
+    def write_claims() -> None:
+        with timer.stage("write.claims", items=len(claims_ranked)):
+            write_json_models(p_claims, claims_ranked, compact=config.compact_json)
+
+    def write_report() -> None:
+        with timer.stage("write.report_md", items=len(claims_ranked)):
+            render_report_md(report, prep.evidence, features, p_md)
+
+    shared, *_ = await asyncio.gather(
+        asyncio.to_thread(_write_shared, config, timer, prep, out_dir),
+        asyncio.to_thread(write_features),
+        asyncio.to_thread(write_claims),
+        asyncio.to_thread(write_report),
+    )
+    return {**shared, "features": str(p_feat), "claims": str(p_claims), "report_md": str(p_md)}
+
+def run_targets(
+    config: TTReconConfig,
+    case_path: Path,
+    targets: str | List[str],
+    out_dir: Path,
+    target_jobs: int = 1,
+    case: Case | None = None,
+    case_sha256: str | None = None,
+    incremental: bool | None = None,
+    **civic_options: Any,
+) -> MultiRunManifest:
+    """Run one case against several target packs, sharing ingest and CIViC enrichment.
+
+    `targets` is a list, a comma-separated string or "ALL". The case is
+    loaded, validated and enriched once; `case_normalized.json` and
+    `evidence.jsonl` are written once to `out_dir`, each pack writes its
+    features, claims, report and manifest to `out_dir/<TARGET>/`, and
+    `out_dir/run_manifest.json` combines them. With `target_jobs > 1` packs
+    run concurrently; per-target outputs do not depend on it. `incremental`
+    works as in `run_pipeline`.
+    """
+    started = utc_now_iso()
+    names = resolve_targets(config.targets_dir, targets)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    prep = _prepare_case(config, case_path, case=case, case_sha256=case_sha256,
+                         timer=StageTimer(get_logger(), case=str(case_path)),
+                         stage_cache=_stage_cache(config, incremental),
+                         evidence_path=out_dir / "evidence.jsonl", **civic_options)
+    try:
+        return _run_all_targets(config, prep, names, case_path, out_dir, started, target_jobs)
+    finally:
+        prep.evidence.close()
+
+def _run_all_targets(
+    config: TTReconConfig,
+    prep: _Prepared,
+    names: List[str],
+    case_path: Path,
+    out_dir: Path,
+    started: str,
+    target_jobs: int,
+) -> MultiRunManifest:
+    shared = _write_shared(config, prep.timer, prep, out_dir)
+
+    def one(name: str) -> RunManifest:
+        return _run_target(config, prep, name, case_path, out_dir / name, started, shared_outputs=shared)
+
+    if target_jobs > 1 and len(names) > 1:
+        with ThreadPoolExecutor(max_workers=target_jobs, thread_name_prefix="ttrecon-target") as pool:
+            runs = dict(zip(names, pool.map(one, names)))
+    else:
+        runs = {name: one(name) for name in names}
+
+    if prep.stage_cache is not None:
+        run_id = stable_id(IDPrefixes.RUN, prep.case.case_id, "+".join(names), *(r.run_id for r in runs.values()))
+    else:
+        run_id = stable_id(IDPrefixes.RUN, prep.case.case_id, "+".join(names), started)
+    manifest = MultiRunManifest(
+        run_id=run_id,
+        version=__version__,
+        targets=names,
+        case_id=prep.case.case_id,
+        case_path=str(case_path),
+        case_sha256=prep.case_sha256,
+        started_utc=started,
+        finished_utc=utc_now_iso(),
+        outputs={**shared, "run_manifest": str(out_dir / "run_manifest.json")},
+        runs=runs,
+        timings=prep.timer.stages,
+    )
+    write_json_model(out_dir / "run_manifest.json", manifest, compact=config.compact_json)
     return manifest
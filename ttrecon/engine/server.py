@@ -0,0 +1,253 @@
+import json
+import shutil
+import socketserver
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import ValidationError as PydanticValidationError
+
+from ttrecon.config import TTReconConfig
+from ttrecon.core.errors import TTReconError
+from ttrecon.core.ids import sha256_hex
+from ttrecon.engine.batch import warm_up
+from ttrecon.engine.orchestrator import run_pipeline, run_targets
+from ttrecon.ingest.case_loader import parse_case_json
+from ttrecon.logging import get_logger, log_event
+from ttrecon.targets.registry import PackWatcher, is_multi_target, resolve_targets
+from ttrecon.version import __version__
+
+# `ttrecon serve`: a long-lived process that keeps the config, target packs,
+# report templates and CIViC snapshots loaded and runs cases sent to it.
+#
+#   GET  /health  -> {"status": "ok", "version", "targets", "requests", ...}
+#   POST /run     -> body {"case": {...}} or {"case_path": "..."}, plus optional
+#                    "target", "out" and any RUN_OPTIONS; answers {"manifest": ...}.
+#                    Without "out" the run goes to a temporary directory and the
+#                    response also carries "claims" and "report_md".
+#
+# Paths in a request ("case_path", "out", "civic_snapshot") must resolve inside
+# the server's `roots` (default: its working directory), so a client can neither
+# read nor write elsewhere. The server has no authentication: keep it on
+# 127.0.0.1 or a Unix socket.
+
+RUN_OPTIONS = (
+    "civic", "civic_mode", "civic_source", "civic_snapshot", "civic_claims",
+    "civic_min_rating", "civic_levels", "civic_jobs", "incremental",
+)
+
+class BadRequest(ValueError):
+    pass
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class RunServer:
+    """Threaded HTTP (TCP or Unix socket) front end for `run_pipeline` / `run_targets`.
+
+    Requests run concurrently, at most `jobs` at a time. Before each run the
+    selected packs are checked for edits to `rules.py` / `target.yml` and
+    reloaded if needed. `defaults` are run options applied unless a request
+    overrides them. Request paths are confined to `roots`.
+    """
+
+    def __init__(
+        self,
+        config: TTReconConfig,
+        target: str = "ALL",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        socket_path: Optional[Path] = None,
+        jobs: int = 4,
+        defaults: Optional[Dict[str, Any]] = None,
+        roots: Optional[Sequence[Path]] = None,
+    ) -> None:
+        self.config = config
+        self.roots = [Path(r).resolve() for r in (roots or [Path.cwd()])]
+        self.target = target
+        self.defaults = {k: v for k, v in (defaults or {}).items() if v is not None}
+        self.watcher = PackWatcher(config.targets_dir)
+        self._slots = threading.BoundedSemaphore(max(1, int(jobs)))
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.started = time.monotonic()
+        self.socket_path = socket_path
+
+        warm_up(config, target, self.defaults)
+        self.watcher.refresh(resolve_targets(config.targets_dir, target))
+
+        handler = self._handler()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
+            self._httpd: socketserver.BaseServer = _UnixHTTPServer(str(socket_path), handler)
+        else:
+            self._httpd = ThreadingHTTPServer((host, port), handler)
+            self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        if self.socket_path is not None:
+            return f"unix:{self.socket_path}"
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "status": "ok",
+                "version": __version__,
+                "targets": resolve_targets(self.config.targets_dir, self.target),
+                "requests": self.requests,
+                "failures": self.failures,
+                "reloads": self.watcher.reloads,
+                "uptime_s": round(time.monotonic() - self.started, 3),
+            }
+
+    def _parse(self, req: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Path], Path, Any, Optional[str]]:
+        unknown = set(req) - {"case", "case_path", "target", "out", *RUN_OPTIONS}
+        if unknown:
+            raise BadRequest(f"Unknown fields: {sorted(unknown)}")
+        if ("case" in req) == ("case_path" in req):
+            raise BadRequest("Send exactly one of 'case' or 'case_path'")
+        options = {**self.defaults, **{k: req[k] for k in RUN_OPTIONS if k in req}}
+        if req.get("civic_snapshot") is not None:
+            options["civic_snapshot"] = self._confine("civic_snapshot", req["civic_snapshot"])
+        out = self._confine("out", req["out"]) if req.get("out") else None
+        if "case_path" in req:
+            return options, out, self._confine("case_path", req["case_path"]), None, None
+        text = json.dumps(req["case"], sort_keys=True, ensure_ascii=False)
+        case = parse_case_json(text)
+        return options, out, Path(f"serve:{case.case_id}"), case, sha256_hex(text.encode("utf-8"))
+
+    def _confine(self, field: str, value: Any) -> Path:
+        """`value` as a resolved path (symlinks followed), or BadRequest if it is outside every root."""
+        if not isinstance(value, str) or not value:
+            raise BadRequest(f"'{field}' must be a non-empty path")
+        path = Path(value).resolve()
+        if not any(path.is_relative_to(root) for root in self.roots):
+            raise BadRequest(f"'{field}' is outside the server's roots: {value}")
+        return path
+
+    def run(self, req: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request body; see the module comment for its fields."""
+        options, out, case_path, case, sha = self._parse(req)
+        target = req.get("target") or self.target
+        names = resolve_targets(self.config.targets_dir, target)
+        reloaded = self.watcher.refresh(names)
+        if reloaded:
+            log_event(get_logger(), "serve.reload", targets=reloaded)
+
+        tmp = None
+        if out is None:
+            tmp = Path(tempfile.mkdtemp(prefix="ttrecon-serve-"))
+        out_dir = out or tmp
+        try:
+            with self._slots:
+                if is_multi_target(target):
+                    manifest = run_targets(self.config, case_path=case_path, targets=names, out_dir=out_dir,
+                                           case=case, case_sha256=sha, **options)
+                else:
+                    manifest = run_pipeline(self.config, case_path=case_path, target=names[0], out_dir=out_dir,
+                                            case=case, case_sha256=sha, **options)
+            resp: Dict[str, Any] = {"manifest": manifest.model_dump()}
+            if tmp is not None:
+                if is_multi_target(target):
+                    resp["claims"] = {n: _read_json(tmp / n / "claims.json") for n in names}
+                    resp["report_md"] = {n: (tmp / n / "report.md").read_text(encoding="utf-8") for n in names}
+                else:
+                    resp["claims"] = _read_json(tmp / "claims.json")
+                    resp["report_md"] = (tmp / "report.md").read_text(encoding="utf-8")
+            return resp
+        finally:
+            if tmp is not None:
+                shutil.rmtree(tmp, ignore_errors=True)
+
+    def _count(self, ok: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.failures += 0 if ok else 1
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/") == "/health":
+                    self._send(200, server.health())
+                else:
+                    self._send(404, {"error": f"No such endpoint: {self.path}"})
+
+            def do_POST(self) -> None:
+                if self.path.rstrip("/") != "/run":
+                    self._send(404, {"error": f"No such endpoint: {self.path}"})
+                    return
+                raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                t0 = time.perf_counter()
+                try:
+                    req = json.loads(raw or b"{}")
+                    if not isinstance(req, dict):
+                        raise BadRequest("Body must be a JSON object")
+                    resp = server.run(req)
+                except (BadRequest, PydanticValidationError, TTReconError, ValueError, OSError) as e:
+                    server._count(False)
+                    log_event(get_logger(), "serve.run.failed", error=f"{type(e).__name__}: {e}")
+                    self._send(400, {"error": f"{type(e).__name__}: {e}"})
+                    return
+                except Exception as e:
+                    server._count(False)
+                    log_event(get_logger(), "serve.run.failed", error=f"{type(e).__name__}: {e}")
+                    self._send(500, {"error": f"{type(e).__name__}: {e}"})
+                    return
+                server._count(True)
+                log_event(get_logger(), "serve.run", run_id=resp["manifest"]["run_id"],
+                          elapsed_s=round(time.perf_counter() - t0, 6))
+                self._send(200, resp)
+
+            def address_string(self) -> str:
+                return str(self.client_address[0]) if self.client_address else "unix"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def start(self) -> "RunServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="ttrecon-serve", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+        if self.socket_path is not None:
+            self.socket_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "RunServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+def _read_json(path: Path) -> List[Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
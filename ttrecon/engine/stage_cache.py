@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ttrecon.core.ids import sha256_hex
+from ttrecon.core.provenance import file_sha256
+
+# Content-addressed store for incremental runs: each stage's output is kept
+# at `<root>/<stage>/<key>.json`, where the key hashes everything the stage
+# depends on (case digest, version, pack files, CIViC settings + snapshot
+# digest, upstream output digests). A key that exists is a result that can
+# be reused as is.
+
+_PACK_SUFFIXES = (".py", ".yml", ".yaml", ".json", ".md", ".j2")
+
+def stage_key(*parts: Any) -> str:
+    """Digest of `parts`, JSON-encoded with sorted keys so dict order does not matter."""
+    raw = json.dumps(list(parts), sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return sha256_hex(raw.encode("utf-8"))
+
+def rows_digest(rows: Iterable[Any]) -> str:
+    """Streaming digest of rows: raw JSONL lines (bytes) as they are, other rows JSON-encoded."""
+    h = hashlib.sha256()
+    for row in rows:
+        if not isinstance(row, bytes):
+            row = json.dumps(row, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        h.update(row.rstrip(b"\n"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+# Shared code and vocabularies packs may import (`ttrecon.targets.common`).
+_COMMON_PACK = Path(__file__).resolve().parents[1] / "targets" / "common"
+
+def _pack_files(root: Path) -> List[Path]:
+    return sorted(
+        p for p in root.rglob("*")
+        if p.is_file() and p.suffix in _PACK_SUFFIXES and "__pycache__" not in p.parts
+    )
+
+def pack_digest(pack_dir: Path) -> str:
+    """Digest of a target pack's source files (rules, target.yml, templates), by relative path.
+
+    The shared `common` pack is included too, both the one next to `pack_dir`
+    and the installed `ttrecon.targets.common`, so editing shared rules or
+    vocabularies invalidates every pack's cached results.
+    """
+    parts = [(p.relative_to(pack_dir).as_posix(), file_sha256(p)) for p in _pack_files(pack_dir)]
+    seen = set()
+    for label, common in (("../common", pack_dir.parent / "common"), ("ttrecon.targets.common", _COMMON_PACK)):
+        if not common.is_dir() or common.resolve() in seen:
+            continue
+        seen.add(common.resolve())
+        parts += [(f"{label}/{p.relative_to(common).as_posix()}", file_sha256(p)) for p in _pack_files(common)]
+    return stage_key(*parts)
+
+_file_digests: Dict[Tuple[str, int, int], str] = {}
+_file_lock = threading.Lock()
+
+def cached_file_digest(path: Path) -> str:
+    """`file_sha256`, memoized per (path, size, mtime) so large snapshots are hashed once per process."""
+    st = path.stat()
+    k = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    with _file_lock:
+        d = _file_digests.get(k)
+    if d is None:
+        d = file_sha256(path)
+        with _file_lock:
+            _file_digests[k] = d
+    return d
+
+class StageCache:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.root / stage / f"{key}.json"
+
+    def get(self, stage: str, key: str) -> Optional[Dict[str, Any]]:
+        p = self._path(stage, key)
+        try:
+            return json.loads(p.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            return None  # torn write; recomputed and overwritten
+
+    def file(self, stage: str, key: str, name: str) -> Path:
+        """Location of a file stored alongside an entry (e.g. its evidence JSONL)."""
+        return self.root / stage / f"{key}.{name}"
+
+    def put_file(self, stage: str, key: str, name: str, src: Path) -> None:
+        dest = self.file(stage, key, name)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(f"{dest.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+
+    def put(self, stage: str, key: str, obj: Dict[str, Any]) -> None:
+        p = self._path(stage, key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(obj, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, p)
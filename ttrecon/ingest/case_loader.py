@@ -1,12 +1,125 @@
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator, Optional, Tuple
 import json
 
 from pydantic import TypeAdapter
 
 from ttrecon.core.models import Case
+from ttrecon.ingest.normalize import normalize_case
+from ttrecon.ingest.validators import validate_case
 
 _case_adapter = TypeAdapter(Case)
 
 def load_case_json(path: Path) -> Case:
     data = json.loads(Path(path).read_text(encoding="utf-8"))
     return _case_adapter.validate_python(data)
+
+def parse_case_json(text: str) -> Case:
+    return _case_adapter.validate_python(json.loads(text))
+
+@dataclass(frozen=True)
+class CaseRecord:
+    """One record of a multi-case file: a validated, normalized case, or why it was rejected."""
+    index: int  # 1-based position among the file's records
+    line: int  # 1-based line the record starts on
+    text: str  # the record's JSON source
+    case: Optional[Case] = None
+    error: Optional[str] = None
+
+_CHUNK = 1 << 16
+_decoder = json.JSONDecoder()
+
+def _record(index: int, line: int, text: str, obj=None, parsed: bool = False) -> CaseRecord:
+    try:
+        if not parsed:
+            obj = json.loads(text)
+        case = normalize_case(_case_adapter.validate_python(obj))
+        validate_case(case)
+    except Exception as e:
+        return CaseRecord(index, line, text, error=f"{type(e).__name__}: {e}")
+    return CaseRecord(index, line, text, case=case)
+
+def is_case_array(path: Path) -> bool:
+    """True if the file's first non-blank character opens a JSON array."""
+    with path.open("r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(4096)
+            if not chunk:
+                return False
+            stripped = chunk.lstrip()
+            if stripped:
+                return stripped[0] == "["
+
+def iter_case_records(path: Path, max_record_bytes: int = 64 << 20) -> Iterator[CaseRecord]:
+    """Stream the cases of a JSONL file or of a file holding one top-level JSON array.
+
+    Records are parsed one at a time (JSONL line by line; arrays incrementally
+    with `JSONDecoder.raw_decode` over a sliding buffer), so memory is bounded
+    by the largest record rather than the file. A record that fails to parse or
+    validate is yielded with its `error` and line number and reading goes on;
+    in an array, a syntax error ends the stream, since the next record cannot
+    be located reliably. A record longer than `max_record_bytes` characters also ends it.
+    """
+    if is_case_array(path):
+        yield from _iter_array(path, max_record_bytes)
+        return
+    with path.open("r", encoding="utf-8") as f:
+        index = 0
+        for lineno, line in enumerate(f, start=1):
+            if line.strip():
+                index += 1
+                yield _record(index, lineno, line.strip())
+
+def _iter_array(path: Path, max_record_bytes: int) -> Iterator[CaseRecord]:
+    with path.open("r", encoding="utf-8") as f:
+        buf, pos, line, eof = "", 0, 1, False
+
+        def fill(n: int) -> bool:
+            nonlocal buf, pos
+            chunk = f.read(n)
+            buf = buf[pos:] + chunk  # drop what has been consumed
+            pos = 0
+            return bool(chunk)
+
+        def skip(chars: str) -> None:
+            nonlocal pos, line, eof
+            while True:
+                while pos < len(buf) and buf[pos] in chars:
+                    line += buf[pos] == "\n"
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return
+                eof = not fill(_CHUNK)
+
+        skip(" \t\r\n")
+        pos += 1  # the opening "["
+        index = 0
+        while True:
+            skip(" \t\r\n,")
+            if pos >= len(buf) or buf[pos] == "]":
+                return
+            index += 1
+            start_line = line
+            obj, end, err = _decode_one(buf, pos)
+            # A value ending at the buffer's end may be cut short (e.g. a number); read on to be sure.
+            while (err is not None or end == len(buf)) and not eof:
+                if len(buf) - pos > max_record_bytes:
+                    yield CaseRecord(index, start_line, "", error=f"RecordTooLarge: record at line {start_line} exceeds {max_record_bytes} characters")
+                    return
+                eof = not fill(max(_CHUNK, len(buf) - pos))  # grow geometrically: O(n) re-parsing overall
+                obj, end, err = _decode_one(buf, pos)
+            if err is not None:
+                yield CaseRecord(index, start_line, buf[pos:pos + 200], error=f"JSONDecodeError: {err}")
+                return
+            text = buf[pos:end]
+            yield _record(index, start_line, text, obj, parsed=True)
+            line += text.count("\n")
+            pos = end
+
+def _decode_one(buf: str, pos: int) -> Tuple[object, int, Optional[str]]:
+    try:
+        obj, end = _decoder.raw_decode(buf, pos)
+    except json.JSONDecodeError as e:
+        return None, pos, e.msg
+    return obj, end, None
@@ -1,16 +1,20 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+from ttrecon.core.io import write_text
 from ttrecon.core.models import Report, Evidence, Feature
 
-def render_report_md(report: Report, evidence: List[Evidence], features: List[Feature], out_path: Path) -> None:
+@lru_cache(maxsize=1)
+def jinja_environment() -> Environment:
+    """Process-wide environment; compiled templates are cached and reloaded when their file changes."""
     templates_dir = Path(__file__).parent / "templates"
-    env = Environment(
+    return Environment(
         loader=FileSystemLoader(str(templates_dir)),
         autoescape=select_autoescape(enabled_extensions=())
     )
-    tmpl = env.get_template("dossier.md.j2")
-    text = tmpl.render(report=report, evidence=evidence, features=features)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(text, encoding="utf-8")
+
+def render_report_md(report: Report, evidence: List[Evidence], features: List[Feature], out_path: Path) -> None:
+    tmpl = jinja_environment().get_template("dossier.md.j2")
+    write_text(out_path, tmpl.generate(report=report, evidence=evidence, features=features))
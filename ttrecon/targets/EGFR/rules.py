@@ -1,11 +1,17 @@
-from typing import List
+from typing import List, Sequence
+from ttrecon.core.evidence_store import EvidenceStore
 from ttrecon.core.ids import stable_id, IDPrefixes
 from ttrecon.core.models import Case, Evidence, Feature, Claim
 
-def _alt_evidence_ids(evidence: List[Evidence]) -> List[str]:
+# Rules only read the case's own alteration rows, so they can start before CIViC enrichment ends.
+EVIDENCE_SOURCES = ("local_case",)
+
+def _alt_evidence_ids(evidence: Sequence[Evidence]) -> List[str]:
+    if isinstance(evidence, EvidenceStore):
+        return evidence.ids(kind="alteration")
     return [e.evid_id for e in evidence if e.kind == "alteration"]
 
-def apply_rules(case: Case, evidence: List[Evidence], features: List[Feature]) -> List[Claim]:
+def apply_rules(case: Case, evidence: Sequence[Evidence], features: List[Feature]) -> List[Claim]:
     claims: List[Claim] = []
     alt_eids = _alt_evidence_ids(evidence)
 
@@ -1,6 +1,7 @@
-from importlib import import_module
+import threading
+from importlib import import_module, reload
 from pathlib import Path
-from typing import Callable, Dict, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 import yaml
 from ttrecon.core.errors import TargetNotFoundError
 
@@ -20,9 +21,80 @@ def load_rules_callable(target_name: str) -> Callable:
     mod = import_module(f"ttrecon.targets.{target_name}.rules")
     return getattr(mod, "apply_rules")
 
+def rules_evidence_sources(target_name: str) -> Optional[Tuple[str, ...]]:
+    """The evidence sources a pack's rules read, if declared (`EVIDENCE_SOURCES` in rules.py)."""
+    mod = import_module(f"ttrecon.targets.{target_name}.rules")
+    sources = getattr(mod, "EVIDENCE_SOURCES", None)
+    return None if sources is None else tuple(sources)
+
 def resolve_target(targets_dir: Path, target: str) -> Tuple[str, Path]:
     t = target.upper()
     targets = list_targets(targets_dir)
     if t not in targets:
         raise TargetNotFoundError(f"Target '{t}' not found. Available: {sorted(targets.keys())}")
     return t, targets[t]
+
+def is_multi_target(spec: Union[str, List[str]]) -> bool:
+    """True for a list, a comma-separated string or ALL (these get the multi-target layout)."""
+    if not isinstance(spec, str):
+        return True
+    return "," in spec or spec.strip().upper() == "ALL"
+
+def resolve_targets(targets_dir: Path, spec: Union[str, List[str]]) -> List[str]:
+    """Target names for a list, a comma-separated string or ALL (every installed pack, sorted)."""
+    items = spec.split(",") if isinstance(spec, str) else list(spec)
+    names: List[str] = []
+    for item in (i.strip() for i in items):
+        if not item:
+            continue
+        if item.upper() == "ALL":
+            names.extend(sorted(list_targets(targets_dir)))
+        else:
+            names.append(resolve_target(targets_dir, item)[0])
+    out = list(dict.fromkeys(names))
+    if not out:
+        raise TargetNotFoundError(f"No targets selected by '{spec}'")
+    return out
+
+class PackWatcher:
+    """Reloads target pack rules modules whose `rules.py` or `target.yml` changed (by mtime and size).
+
+    For long-lived processes (`ttrecon serve`): call `refresh()` before a run
+    and `load_rules_callable` then returns the current `apply_rules`.
+    """
+
+    def __init__(self, targets_dir: Path) -> None:
+        self.targets_dir = targets_dir
+        self._lock = threading.Lock()
+        self._stamps: Dict[str, Tuple[Optional[Tuple[int, int]], ...]] = {}
+        self.reloads = 0
+
+    @staticmethod
+    def _stamp(paths: List[Path]) -> Tuple[Optional[Tuple[int, int]], ...]:
+        out: List[Optional[Tuple[int, int]]] = []
+        for p in paths:
+            try:
+                st = p.stat()
+                out.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                out.append(None)
+        return tuple(out)
+
+    def refresh(self, target_names: List[str]) -> List[str]:
+        """Import each pack's rules (first time) or reload them if changed; returns the reloaded names."""
+        reloaded: List[str] = []
+        with self._lock:
+            for name in target_names:
+                target_dir = resolve_target(self.targets_dir, name)[1]
+                mod = import_module(f"ttrecon.targets.{name}.rules")
+                files = [target_dir / "rules.py", target_dir / "target.yml"]
+                if getattr(mod, "__file__", None) and Path(mod.__file__).resolve() != files[0].resolve():
+                    files.append(Path(mod.__file__))
+                stamp = self._stamp(files)
+                prev = self._stamps.get(name)
+                if prev is not None and prev != stamp:
+                    reload(mod)
+                    self.reloads += 1
+                    reloaded.append(name)
+                self._stamps[name] = stamp
+        return reloaded